@@ -0,0 +1,376 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import vending_machine
+
+BRANDS = ['코카콜라', '칠성사이다', '포카리스웨트', '아이시스', '게토레이', '밀키스', '환타', '데미소다',
+          '트레비', '비타500', '박카스', '옥수수수염차', '헛개차', '레쓰비', '조지아', '바나나우유']
+FLAVORS = ['', ' 제로', ' 라이트', ' 플러스', ' 오렌지', ' 포도', ' 레몬', ' 복숭아', ' 사과', ' 딸기']
+SIZES = ['', ' 250ml', ' 350ml', ' 500ml', ' 1.5L']
+
+# 지표 이름 -> 설명. 모든 지표는 초 단위이며 작을수록 좋습니다.
+METRICS: dict[str, str] = {
+    'load': '상품 파일을 읽어 카탈로그에 등록하는 시간',
+    'buy': '금액 투입 후 상품 하나를 구매하는 시간',
+    'cal_refund': '거스름돈 조합 계산 한 번의 시간',
+    'is_sellable': '상품 하나의 판매 가능 여부 확인 시간',
+    'buyable_product': '구매 가능한 물품 목록 화면을 만드는 시간',
+    'save_products': '상품 파일 전체를 저장하는 시간',
+    'issue_report': '이슈 한 번을 발생/해소하고 파일에 기록하는 시간',
+    'session': '세션 하나를 열고 닫는 시간',
+}
+
+# 거스름돈 보관함 상태 이름 -> 보관함
+CHANGE_STATES: dict[str, dict[int, int]] = {
+    'full': {100: 1000, 500: 1000, 1000: 0},
+    'normal': {100: 10, 500: 10, 1000: 0},
+    'no_500': {100: 30, 500: 0, 1000: 0},
+    'few_100': {100: 2, 500: 50, 1000: 0},
+    'empty': {100: 0, 500: 0, 1000: 0},
+}
+
+
+def make_catalog(size: int, seed: int = 0) -> list[dict]:
+    """
+    한국어 이름을 가진 임의의 상품 목록을 만드는 함수. 같은 seed로는 항상 같은 목록을 만듭니다.
+
+    Args:
+        size (int): 상품 개수
+        seed (int, optional): 난수 시드. Defaults to 0.
+
+    Returns:
+        list: 상품 파일과 같은 형식의 딕셔너리 리스트
+    """
+    rng = random.Random(seed)
+    return [{'id': i, 'name': rng.choice(BRANDS) + rng.choice(FLAVORS) + rng.choice(SIZES),
+             'price': rng.randrange(5, 40) * 100, 'count': rng.choice([0, 1, 3, 5, 10, 30])}
+            for i in range(1, size + 1)]
+
+
+def best_of(func, repeat: int, number: int = 1) -> float:
+    """
+    func를 number번 실행하는 시간을 repeat번 측정하여 가장 짧은 1회 평균 시간을 반환하는 함수
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+@contextlib.contextmanager
+def machine_with(catalog: list[dict], directory: str):
+    """
+    작업 디렉터리에 상품 파일을 만들고 자판기를 생성하는 컨텍스트 매니저. 리포트 파일도 같은 디렉터리에 기록됩니다.
+    """
+    cwd = os.getcwd()
+    os.chdir(directory)
+    with open('products.json', 'w', encoding='utf-8') as f:
+        json.dump(catalog, f, ensure_ascii=False)
+    machine = vending_machine.VendingMachine(file='products.json')
+    try:
+        yield machine
+    finally:
+        machine.close()
+        os.chdir(cwd)
+
+
+def bench_size(size: int, repeat: int, directory: str) -> dict[str, dict]:
+    """
+    상품 개수가 size인 카탈로그로 모든 지표를 측정하는 함수
+
+    Returns:
+        dict: 지표 이름(거스름돈 상태별 지표는 '지표/상태')을 key로, {'seconds': 시간}을 value로 가지는 딕셔너리
+    """
+    catalog = make_catalog(size)
+    results = {}
+    with machine_with(catalog, directory) as machine:
+        def load():
+            machine.catalog.clear()
+            machine.products_by_json()
+        results['load'] = best_of(load, repeat)
+
+        cli = vending_machine.CommandLineInterface(machine)
+        machine.insert_money(1000)
+        number = max(1, min(100, 100000 // size))
+        results['buyable_product'] = best_of(lambda: cli.buyable_product, repeat, number)
+
+        targets = [product for product in machine.products if 0 < product.price <= 1000] or machine.products[:1]
+        rng = random.Random(size)
+
+        def cal_refund():
+            try:
+                machine.cal_refund(rng.choice(targets))
+            except ValueError:
+                pass   # 거스름돈이 부족한 경우도 같은 계산을 거침
+
+        for state, box in CHANGE_STATES.items():
+            machine.change_box = box
+            machine.inserted_money = 1000
+            results[f'cal_refund/{state}'] = best_of(cal_refund, repeat, 1000)
+            results[f'is_sellable/{state}'] = best_of(
+                lambda: machine.is_sellable(rng.choice(targets)), repeat, 1000)
+
+        for product in targets[:200]:
+            product.count = 1000   # 반복 측정 중 품절되지 않도록 재고 보충
+
+        def buy():
+            machine.change_box = CHANGE_STATES['full']
+            for product in targets[:200]:
+                machine.user.money_box[1000] = 1   # 사용자에게 투입할 지폐 지급
+                machine.insert_money(1000)
+                machine.buy(product.id)
+        buys = min(len(targets), 200)
+        results['buy'] = best_of(buy, repeat) / buys
+
+        def save_products():
+            machine.storage.mark_dirty()   # 저장할 변경이 없으면 저장을 건너뛰므로 매번 전체 저장이 일어나도록 표시
+            machine.save_products()
+        results['save_products'] = best_of(save_products, repeat)
+
+        product = machine.products[0]
+        machine.reporter.flush()   # 상품을 불러올 때 쌓인 이슈를 먼저 기록
+
+        def issue_report():
+            for _ in range(100):
+                machine.reporter.report('Less_product', product)
+                machine.reporter.resolve('Less_product', product)
+            machine.reporter.flush()
+        results['issue_report'] = best_of(issue_report, repeat) / 100
+
+        def session():
+            for session_id in [machine.open_session().id for _ in range(1000)]:
+                machine.close_session(session_id)
+        results['session'] = best_of(session, repeat) / 1000
+    return {name: {'seconds': seconds} for name, seconds in results.items()}
+
+
+def run(sizes: list[int], repeat: int) -> dict:
+    """
+    카탈로그 크기별로 벤치마크를 실행하는 함수
+
+    Returns:
+        dict: {'meta': 실행 환경, 'results': {'크기': {지표: {'seconds': 시간}}}}
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            results[str(size)] = bench_size(size, repeat, directory)
+            print(f'{size}개 상품 측정 완료', file=sys.stderr)
+    meta = {'python': platform.python_version(), 'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'repeat': repeat, 'metrics': METRICS}
+    return {'meta': meta, 'results': results}
+
+
+def stress(threads: int, ops: int, size: int = 50, seed: int = 0) -> dict:
+    """
+    손님, 관리자 재입고, 원격 거스름돈 관리, 되돌리는 트랜잭션을 여러 스레드에서 동시에 실행한 뒤 자판기 상태의 불변식을 확인하는 함수
+
+    확인하는 불변식:
+        - 상품 재고와 거스름돈 개수는 음수가 되지 않음
+        - 되돌린 트랜잭션 전에 가지고 있던 상품 참조는 되돌린 뒤에도 카탈로그의 상품이며 값도 그대로임
+        - 전체 재고 = 처음 재고 + 재입고 수량 - 판매 수량
+        - 사용자 현금 + 거스름돈 보관함 = 처음 금액 + 지급한 현금 + 추가한 거스름돈 - 인출한 거스름돈
+        - 보관함 증가액 = 판매 금액 + 아직 반환되지 않은 투입 금액 + 추가한 거스름돈 - 인출한 거스름돈
+
+    Args:
+        threads (int): 스레드 개수
+        ops (int): 스레드별 동작 횟수
+        size (int, optional): 카탈로그 크기. Defaults to 50.
+        seed (int, optional): 난수 시드. Defaults to 0.
+
+    Returns:
+        dict: {'threads', 'ops', 'seconds', 'ops_per_second', 'totals', 'violations'}
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def cash(box: dict) -> int:
+        return sum(money * count for money, count in box.items())
+
+    with tempfile.TemporaryDirectory() as directory, machine_with(make_catalog(size, seed), directory) as machine:
+        machine.change_box = {100: 200, 500: 200, 1000: 0}
+        stock = sum(product.count for product in machine.products)
+        box = cash(machine.change_box)
+        money = cash(machine.user.money_box) + box
+
+        def customer(rng: random.Random) -> dict:
+            done = {'given': 0, 'sold': 0, 'revenue': 0}
+            for i in range(ops):
+                product = rng.choice(machine.products)
+                coins = [rng.choice([100, 500, 1000]) for _ in range(rng.randrange(1, 8))]
+                with machine.transaction():   # 현금 지급과 투입은 한 번에
+                    if machine.inserted_money > 10000:   # 거스름돈 부족으로 반환되지 않은 금액이 많으면 투입하지 않음
+                        coins = []
+                    for coin in coins:
+                        machine.user.money_box[coin] += 1
+                        machine.insert_money(coin)
+                    done['given'] += sum(coins)
+                try:
+                    if i % 2:   # 절반은 트랜잭션 없이 메서드 단위 잠금만 사용
+                        machine.buy(product.id)
+                        done['sold'] += 1
+                        done['revenue'] += product.price
+                    else:
+                        with machine.transaction():
+                            if machine.is_sellable(product):
+                                machine.buy(product.id)
+                                done['sold'] += 1
+                                done['revenue'] += product.price
+                except ValueError:
+                    pass
+                try:
+                    with machine.transaction():   # 계산한 거스름돈이 반환 전에 바뀌지 않도록 함
+                        machine.refund(machine.cal_refund())
+                except ValueError:
+                    pass   # 거스름돈이 부족하면 투입 금액으로 남김
+            return done
+
+        def restocker(rng: random.Random) -> dict:
+            done = {'restocked': 0}
+            for _ in range(ops):
+                product = rng.choice(machine.products)
+                amount = rng.randrange(1, 5)
+                with machine.transaction():   # 읽은 재고에 더하므로 트랜잭션 필요
+                    machine.edit_product(product, count=product.count + amount)
+                done['restocked'] += amount
+            return done
+
+        def controller(rng: random.Random) -> dict:
+            done = {'added': 0, 'withdrawn': 0}
+            for _ in range(ops):
+                coin = rng.choice([100, 500])
+                if rng.random() < 0.5:
+                    done['added'] += coin * machine.add_change(money=coin, count=rng.randrange(1, 10))
+                else:
+                    done['withdrawn'] += coin * machine.get_change(money=coin, count=rng.randrange(1, 10))
+            return done
+
+        class Abort(Exception):
+            pass
+
+        def rollbacker(rng: random.Random) -> dict:
+            done = {'rolled_back': 0, 'restocked': 0, 'stale': 0}
+            for _ in range(ops):
+                with machine.transaction():
+                    product, other = rng.sample(machine.products, 2)
+                    before = product.to_dict
+                    try:
+                        with machine.transaction(rollback=True):   # 상품 수정, 삭제, ID 재정렬, 추가를 모두 되돌림
+                            machine.edit_product(product, name='되돌릴 상품', price=product.price + 100, count=0)
+                            machine.delete_product(other)
+                            machine.resort_product()
+                            machine.add_product(name='되돌릴 상품', price=100, count=10)
+                            machine.add_change(money=100, count=10)
+                            raise Abort()
+                    except Abort:
+                        done['rolled_back'] += 1
+                    if machine.get_product(before['id']) is not product or product.to_dict != before or \
+                            machine.get_product(other.id) is not other:
+                        done['stale'] += 1
+                        continue
+                amount = rng.randrange(1, 5)
+                with machine.transaction():   # 되돌리기 전에 잡아 둔 참조로 수정해도 카탈로그에 반영되어야 함
+                    machine.edit_product(product, count=product.count + amount)
+                done['restocked'] += amount
+            return done
+
+        roles = [customer, restocker, controller, rollbacker]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            futures = [pool.submit(roles[i % len(roles)], random.Random(seed + i)) for i in range(threads)]
+            results = [future.result() for future in futures]
+        seconds = time.perf_counter() - start
+
+        totals = {}
+        for result in results:
+            for key, value in result.items():
+                totals[key] = totals.get(key, 0) + value
+        given, sold, revenue = totals.get('given', 0), totals.get('sold', 0), totals.get('revenue', 0)
+        added, withdrawn = totals.get('added', 0), totals.get('withdrawn', 0)
+
+        violations = []
+        if totals.get('stale'):
+            violations.append('되돌린 뒤 상품 참조 불일치')
+        if any(product.count < 0 for product in machine.products):
+            violations.append('음수 재고')
+        if any(count < 0 for count in machine.change_box.values()):
+            violations.append('음수 거스름돈')
+        if sum(product.count for product in machine.products) != stock + totals.get('restocked', 0) - sold:
+            violations.append('재고 합계 불일치')
+        if cash(machine.user.money_box) + cash(machine.change_box) != money + given + added - withdrawn:
+            violations.append('현금 합계 불일치')
+        if cash(machine.change_box) - box != revenue + machine.inserted_money + added - withdrawn:
+            violations.append('판매 금액 불일치')
+    return {'threads': threads, 'ops': ops, 'seconds': seconds, 'ops_per_second': threads * ops / seconds,
+            'totals': totals, 'violations': violations}
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    현재 결과를 기준 결과와 비교하여 tolerance 비율 이상 느려진 지표를 찾는 함수
+
+    Args:
+        current (dict): run의 결과
+        baseline (dict): 저장해 둔 기준 결과
+        tolerance (float): 허용할 증가 비율 (0.2이면 20%)
+
+    Returns:
+        list: 느려진 지표를 설명하는 문자열 리스트
+    """
+    regressions = []
+    for size, metrics in current['results'].items():
+        for name, value in metrics.items():
+            base = baseline.get('results', {}).get(size, {}).get(name)
+            if base is None or base['seconds'] <= 0:
+                continue
+            ratio = value['seconds'] / base['seconds']
+            value['baseline'] = base['seconds']
+            value['ratio'] = ratio
+            if ratio > 1 + tolerance:
+                regressions.append(f'{size}개 {name}: {base["seconds"]:.3g}s -> {value["seconds"]:.3g}s ({ratio:.2f}배)')
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='자판기 성능 측정')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000, 100000],
+                        help='측정할 카탈로그 크기들')
+    parser.add_argument('--repeat', type=int, default=5, help='지표별 반복 측정 횟수 (가장 짧은 시간 사용)')
+    parser.add_argument('--output', metavar='FILE', help='결과를 저장할 JSON 파일 (미지정시 표준 출력)')
+    parser.add_argument('--baseline', metavar='FILE', help='비교할 기준 결과 JSON 파일')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='허용할 성능 저하 비율. 기본값은 0.2')
+    parser.add_argument('--stress', action='store_true', help='여러 스레드에서 동시에 실행하여 상태 불변식을 확인')
+    parser.add_argument('--threads', type=int, default=12, help='--stress에서 사용할 스레드 개수. 기본값은 12')
+    parser.add_argument('--ops', type=int, default=500, help='--stress에서 스레드별 동작 횟수. 기본값은 500')
+    args = parser.parse_args()
+
+    if args.stress:
+        result = stress(args.threads, args.ops)
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        for line in result['violations']:
+            print(f'불변식 위반: {line}', file=sys.stderr)
+        sys.exit(1 if result['violations'] else 0)
+
+    result = run(args.sizes, args.repeat)
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        result['regressions'] = regressions
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    for line in regressions:
+        print(f'성능 저하: {line}', file=sys.stderr)
+    sys.exit(1 if regressions else 0)
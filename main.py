@@ -1,6 +1,52 @@
+import argparse
+import asyncio
+import os
+import shutil
+import sys
 import vending_machine
 
 if __name__ == "__main__":
-    VM = vending_machine.VendingMachine(file='products.json')
+    parser = argparse.ArgumentParser(description='자판기 프로그램')
+    parser.add_argument('--script', metavar='FILE',
+                        help='명령어 파일을 화면 출력 없이 실행하고 결과를 JSON Lines로 출력 ("-"이면 표준 입력)')
+    parser.add_argument('--metrics', metavar='FILE', help='동작 지표를 주기적으로 저장할 JSON 파일')
+    parser.add_argument('--state-dir', metavar='DIR', default='state',
+                        help='상품, 저널, 리포트, 비밀번호 파일을 저장할 디렉터리. 기본값은 state')
+    parser.add_argument('--catalog-snapshot', metavar='FILE',
+                        help='상품 목록을 바이너리 스냅샷으로도 저장하여 다음 시작 때 JSON 대신 불러옴')
+    parser.add_argument('--report-retention', metavar='DAYS', type=float, default=90,
+                        help='리포트 데이터베이스에 해소된 이슈를 보관할 일 수 (0이면 삭제하지 않음). 기본값은 90')
+    parser.add_argument('--serve', metavar='[HOST:]PORT', help='여러 터미널의 명령을 받는 세션 서버를 TCP로 실행')
+    parser.add_argument('--unix', metavar='PATH', help='여러 터미널의 명령을 받는 세션 서버를 Unix 소켓으로 실행')
+    args = parser.parse_args()
+
+    products_file = os.path.join(args.state_dir, 'products.json')
+    if not os.path.exists(products_file):   # 처음 실행할 때는 저장소의 상품 목록으로 시작
+        os.makedirs(args.state_dir, exist_ok=True)
+        shutil.copyfile('products.json', products_file)
+    VM = vending_machine.VendingMachine(file='products.json', journal_file='journal.jsonl', metrics_file=args.metrics,
+                                        state_dir=args.state_dir, catalog_snapshot=args.catalog_snapshot,
+                                        report_retention_days=args.report_retention)
+    if args.script:
+        processor = vending_machine.CommandProcessor(VM)
+        try:
+            if args.script == '-':
+                failed = processor.run(sys.stdin)
+            else:
+                with open(args.script, 'r', encoding='utf-8') as f:
+                    failed = processor.run(f)
+        finally:
+            VM.close()
+        sys.exit(1 if failed else 0)
+    if args.serve or args.unix:
+        host, _, port = (args.serve or '').rpartition(':')
+        server = vending_machine.SessionServer(VM, host=host or '127.0.0.1', port=int(port or 0), path=args.unix)
+        try:
+            asyncio.run(server.serve_forever())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            VM.close()
+        sys.exit(0)
     cli = vending_machine.CommandLineInterface(VM=VM)
     cli.run()
@@ -0,0 +1,225 @@
+import argparse
+import bisect
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import vending_machine
+from vending_machine.storage import iter_json_records
+
+# 시뮬레이션 기본 설정. 명령행 인자로 바꿀 수 있습니다.
+DEFAULTS: dict = {
+    'days': 365,                                  # 시드별 시뮬레이션 일 수
+    'arrivals': 150,                              # 하루 평균 손님 수 (포아송 분포)
+    'card_ratio': 0.3,                            # 카드로 결제하는 손님 비율
+    'coins': {1000: 0.6, 500: 0.3, 100: 0.1},     # 현금 손님이 투입하는 화폐 단위별 비율
+    'zipf': 1.1,                                  # 상품 인기도의 Zipf 지수 (클수록 인기 상품에 몰림)
+    'restock_interval': 3,                        # 재고 보충 간격(일)
+    'capacity': 30,                               # 재고 보충 때 채울 상품별 재고
+    'float': {100: 50, 500: 30},                  # 재고 보충 때 채울 거스름돈 개수
+}
+
+
+def zipf_weights(n: int, s: float) -> list[float]:
+    """
+    n개 순위의 Zipf 분포 누적 가중치를 반환하는 함수 (k번째 순위의 가중치는 1/k^s)
+    """
+    return list(itertools.accumulate(1 / rank ** s for rank in range(1, n + 1)))
+
+
+def poisson(rng: random.Random, mean: float) -> int:
+    """
+    평균이 mean인 포아송 분포의 난수를 반환하는 함수. 하루 손님 간격을 지수 분포로 뽑아 하루 안에 온 손님 수를 셉니다.
+    """
+    count, t = 0, rng.expovariate(mean)
+    while t < 1:
+        count += 1
+        t += rng.expovariate(mean)
+    return count
+
+
+def coins_for(rng: random.Random, price: int, coins: dict[int, float]) -> list[int]:
+    """
+    현금 손님이 상품 가격 이상이 될 때까지 투입할 동전/지폐 리스트를 화폐 단위별 비율에 따라 뽑는 함수
+    """
+    units, weights = list(coins), list(coins.values())
+    inserted = []
+    while sum(inserted) < price:
+        inserted.append(rng.choices(units, weights)[0])
+    return inserted
+
+
+def simulate_seed(catalog: list[dict], seed: int, config: dict) -> dict:
+    """
+    시드 하나로 자판기 한 대의 여러 날을 시뮬레이션하는 함수
+
+    손님마다 자판기 세션을 열어 지갑과 결제 수단을 따로 두고, VendingMachine의 메서드를 직접 호출합니다.
+    재고 보충일에는 restock_many와 refill_change로 재고와 거스름돈을 채우고 1000원 지폐를 회수합니다.
+
+    Args:
+        catalog (list): 상품 목록 (products.json과 같은 형식)
+        seed (int): 난수 시드
+        config (dict): 시뮬레이션 설정 (DEFAULTS와 같은 키)
+
+    Returns:
+        dict: 매출, 판매 수, 사유별 판매 실패 수, 거스름돈 부족 횟수, 품절까지 걸린 시간 등
+    """
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as directory:
+        vending_machine.storage.atomic_write_json(os.path.join(directory, 'products.json'), catalog)
+        machine = vending_machine.VendingMachine(file='products.json', state_dir=directory)
+        try:
+            products = list(machine.products)
+            ranking = products[:]
+            rng.shuffle(ranking)   # 시드마다 다른 상품이 인기 상품이 됨
+            cumulative = zipf_weights(len(ranking), config['zipf'])
+            result = {'seed': seed, 'days': config['days'], 'customers': 0, 'sold': 0, 'revenue': 0,
+                      'lost': {'sold_out': 0, 'no_change': 0}, 'change_shortage': 0,
+                      'sell_outs': 0, 'sell_out_days': [], 'out_of_stock_days': 0.0, 'collected': 0}
+            restocked_at, sold_out_at = 0.0, {}   # 마지막 보충 시각, 품절된 상품 -> 품절 시각
+
+            for day in range(config['days']):
+                if day % config['restock_interval'] == 0:
+                    for product, at in sold_out_at.items():
+                        result['out_of_stock_days'] += day - at
+                    sold_out_at.clear()
+                    machine.restock_many(level=config['capacity'])
+                    machine.refill_change(config['float'])
+                    if machine.change_box[1000]:   # 거스름돈으로 쓰지 않는 1000원 지폐 회수
+                        result['collected'] += 1000 * machine.get_change(1000, machine.change_box[1000])
+                    restocked_at = day
+
+                arrivals = sorted(rng.random() for _ in range(poisson(rng, config['arrivals'])))
+                for t in arrivals:
+                    now = day + t
+                    result['customers'] += 1
+                    product = ranking[bisect.bisect(cumulative, rng.random() * cumulative[-1])]
+                    if product.is_empty:
+                        result['lost']['sold_out'] += 1
+                        continue
+                    session = machine.open_session()
+                    with machine.use_session(session.id):
+                        if rng.random() < config['card_ratio']:
+                            machine.set_pay_method(True)
+                        else:
+                            inserted = coins_for(rng, product.price, config['coins'])
+                            for money in inserted:
+                                session.money_box[money] = session.money_box.get(money, 0) + 1
+                                machine.insert_money(money)
+                            try:
+                                machine.cal_refund(product)
+                            except ValueError:   # 거스름돈이 부족하면 투입한 돈을 그대로 돌려받고 떠남
+                                result['change_shortage'] += 1
+                                result['lost']['no_change'] += 1
+                                refund = {}
+                                for money in inserted:
+                                    refund[money] = refund.get(money, 0) + 1
+                                machine.refund(refund)
+                                machine.close_session(session.id)
+                                continue
+                        machine.buy(product.id)
+                    machine.close_session(session.id)
+                    result['sold'] += 1
+                    result['revenue'] += product.price
+                    if product.is_empty:
+                        result['sell_outs'] += 1
+                        result['sell_out_days'].append(now - restocked_at)
+                        sold_out_at[product] = now
+        finally:
+            machine.close()
+    for at in sold_out_at.values():
+        result['out_of_stock_days'] += config['days'] - at
+    return result
+
+
+def _simulate(args: tuple) -> dict:
+    return simulate_seed(*args)
+
+
+def summarize(results: list[dict]) -> dict:
+    """
+    시드별 결과를 하루 평균과 분포로 요약하는 함수
+
+    Returns:
+        dict: 지표 이름 -> {'mean', 'p5', 'p95'} (하루 기준), 품절까지 걸린 시간(일)의 분포
+    """
+    def spread(values: list[float]) -> dict:
+        values = sorted(values)
+        pick = lambda q: values[min(len(values) - 1, int(q * len(values)))]
+        return {'mean': statistics.fmean(values), 'p5': pick(0.05), 'p95': pick(0.95)}
+
+    per_day = lambda key: [key(r) / r['days'] for r in results]
+    summary = {
+        'revenue_per_day': spread(per_day(lambda r: r['revenue'])),
+        'sold_per_day': spread(per_day(lambda r: r['sold'])),
+        'lost_sold_out_per_day': spread(per_day(lambda r: r['lost']['sold_out'])),
+        'lost_no_change_per_day': spread(per_day(lambda r: r['lost']['no_change'])),
+        'change_shortage_per_day': spread(per_day(lambda r: r['change_shortage'])),
+        'lost_sales_ratio': spread([sum(r['lost'].values()) / max(r['customers'], 1) for r in results]),
+        'out_of_stock_product_days_per_day': spread(per_day(lambda r: r['out_of_stock_days'])),
+    }
+    sell_out_days = [d for r in results for d in r['sell_out_days']]
+    if sell_out_days:
+        summary['days_to_sell_out'] = spread(sell_out_days)
+    return summary
+
+
+def run(catalog: list[dict], seeds: int, config: dict, processes: int = None) -> dict:
+    """
+    여러 시드를 프로세스 풀에서 나누어 시뮬레이션하고 결과를 요약하는 함수
+
+    Returns:
+        dict: {'config', 'seeds', 'seconds', 'summary', 'results'}
+    """
+    start = time.perf_counter()
+    tasks = [(catalog, seed, config) for seed in range(seeds)]
+    if processes == 1:
+        results = list(map(_simulate, tasks))
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            results = pool.map(_simulate, tasks)
+    summary = summarize(results)
+    for r in results:
+        del r['sell_out_days']   # 품절까지 걸린 시간은 요약의 분포로만 남김
+    return {'config': config, 'seeds': seeds,
+            'seconds': time.perf_counter() - start, 'summary': summary, 'results': results}
+
+
+def parse_vector(text: str, cast=float) -> dict[int, float]:
+    """
+    "1000=0.6,500=0.3" 형식의 문자열을 딕셔너리로 바꾸는 함수
+    """
+    return {int(key): cast(value) for key, value in (item.split('=', 1) for item in text.split(','))}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='자판기 손님 수요 시뮬레이터')
+    parser.add_argument('--catalog', default='products.json', help='상품 목록 파일. 기본값은 products.json')
+    parser.add_argument('--seeds', type=int, default=8, help='시뮬레이션할 시드 개수. 기본값은 8')
+    parser.add_argument('--processes', type=int, default=None, help='사용할 프로세스 개수. 기본값은 CPU 개수')
+    parser.add_argument('--days', type=int, default=DEFAULTS['days'], help='시드별 일 수. 기본값은 365')
+    parser.add_argument('--arrivals', type=float, default=DEFAULTS['arrivals'], help='하루 평균 손님 수. 기본값은 150')
+    parser.add_argument('--card-ratio', type=float, default=DEFAULTS['card_ratio'], help='카드 결제 비율. 기본값은 0.3')
+    parser.add_argument('--coins', default='1000=0.6,500=0.3,100=0.1', help='현금 투입 화폐 단위별 비율')
+    parser.add_argument('--zipf', type=float, default=DEFAULTS['zipf'], help='상품 인기도 Zipf 지수. 기본값은 1.1')
+    parser.add_argument('--restock-interval', type=int, default=DEFAULTS['restock_interval'], help='재고 보충 간격(일). 기본값은 3')
+    parser.add_argument('--capacity', type=int, default=DEFAULTS['capacity'], help='상품별로 채울 재고. 기본값은 30')
+    parser.add_argument('--float', default='100=50,500=30', help='재고 보충 때 채울 거스름돈 개수')
+    parser.add_argument('--output', metavar='FILE', help='결과를 저장할 JSON 파일 (미지정시 요약만 표준 출력)')
+    args = parser.parse_args()
+
+    config = dict(DEFAULTS, days=args.days, arrivals=args.arrivals, card_ratio=args.card_ratio,
+                  coins=parse_vector(args.coins), zipf=args.zipf, restock_interval=args.restock_interval,
+                  capacity=args.capacity, float=parse_vector(args.float, int))
+    result = run(list(iter_json_records(args.catalog)), args.seeds, config, args.processes)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(result, ensure_ascii=False, indent=2) + '\n')
+    print(json.dumps({'seeds': result['seeds'], 'days': config['days'], 'seconds': result['seconds'],
+                      'summary': result['summary']}, ensure_ascii=False, indent=2))
+    print(f'{args.seeds * config["days"]}일을 {result["seconds"]:.1f}초 동안 시뮬레이션했습니다.', file=sys.stderr)
@@ -2,5 +2,20 @@ from vending_machine.cli import *
 from vending_machine.product import *
 from vending_machine.textformatter import *
 from vending_machine.vendingmachine import *
+from vending_machine.catalog import *
+from vending_machine.storage import *
+from vending_machine.journal import *
+from vending_machine.change import *
+from vending_machine.reporter import *
+from vending_machine.reportstore import *
+from vending_machine.monitor import *
+from vending_machine.renderer import *
+from vending_machine.commands import *
+from vending_machine.metrics import *
+from vending_machine.fleet import *
+from vending_machine.server import *
+from vending_machine.stats import *
+from vending_machine.snapshot import *
 
-__all__ = ['CommandLineInterface', 'Product', 'TextFormatter', 'VendingMachine', 'VendingMachineUser']
\ No newline at end of file
+__all__ = ['CommandLineInterface', 'Product', 'TextFormatter', 'VendingMachine', 'VendingMachineUser', 'Session',
+           'Catalog', 'ProductStorage', 'Journal', 'ChangeMaker', 'IssueReporter', 'ReportStore', 'ThresholdMonitor', 'ScreenRenderer', 'CommandProcessor', 'Metrics', 'Fleet', 'SessionServer', 'CatalogStats', 'CatalogSnapshot']
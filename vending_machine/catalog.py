@@ -0,0 +1,304 @@
+import bisect
+from collections.abc import Sequence
+from operator import attrgetter, itemgetter
+from .product import Product
+
+__all__ = ['Catalog', 'ProductView']
+
+
+class ProductView(Sequence):
+    def __init__(self, catalog: 'Catalog', field: str) -> None:
+        """
+        카탈로그의 상품 목록에서 속성 하나(예: 'id', 'name')만 ID 순으로 보여주는 읽기 전용 뷰 클래스
+
+        값을 복사하지 않고 읽을 때마다 상품 목록에서 꺼내므로, 상품이 바뀌면 뷰에도 바로 반영됩니다.
+
+        Args:
+            catalog (Catalog): 상품 목록을 가진 카탈로그
+            field (str): 보여줄 상품 속성 이름
+        """
+        self.catalog: Catalog = catalog
+        self.field: str = field
+        self._get = attrgetter(field)
+
+    def __len__(self) -> int:
+        return len(self.catalog.products)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._get(product) for product in self.catalog.products[index]]
+        return self._get(self.catalog.products[index])
+
+    def __iter__(self):
+        return map(self._get, self.catalog.products)
+
+    def __contains__(self, value) -> bool:
+        if self.field == 'id':
+            return value in self.catalog.by_id   # ID는 인덱스로 바로 확인
+        if self.field == 'name':
+            return value in self.catalog.by_name
+        return any(self._get(product) == value for product in self.catalog.products)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (ProductView, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class Catalog():
+    def __init__(self) -> None:
+        """
+        자판기에 등록된 상품 목록을 정렬된 상태로 유지하고, ID, 이름, 가격, 재고 인덱스를 함께 관리하는 클래스
+
+        상품의 가격, 재고, 이름이 바뀌면 Product가 product_changed를 호출하여 인덱스가 자동으로 갱신됩니다.
+
+        Attributes:
+            listeners (list): 상품의 추가/삭제/변경을 통지받을 객체 리스트 (예: ThresholdMonitor)
+            products (list): ID 순으로 정렬된 상품 리스트
+            by_id (dict): 상품 ID를 key로, 상품 객체를 value로 가지는 딕셔너리
+            by_name (dict): 상품 이름을 key로, 같은 이름의 상품 리스트를 value로 가지는 딕셔너리
+            in_stock_by_price (list): 재고가 있는 상품들의 (가격, ID, 상품) 튜플을 가격 순으로 정렬한 리스트
+            by_stock (list): 모든 상품의 (재고, ID, 상품) 튜플을 재고 순으로 정렬한 리스트
+        """
+        self.listeners: list = []
+        self.products: list[Product] = []
+        self.by_id: dict[int, Product] = {}
+        self.by_name: dict[str, list[Product]] = {}
+        self.in_stock_by_price: list[tuple[int, int, Product]] = []
+        self.by_stock: list[tuple[int, int, Product]] = []
+
+    def __iter__(self):
+        return iter(self.products)
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def __contains__(self, product_id: int) -> bool:
+        """
+        상품 ID가 등록되어 있는지 확인하는 메서드입니다.
+        """
+        return product_id in self.by_id
+
+    @property
+    def next_id(self) -> int:
+        """
+        새 상품에 부여할 ID를 반환하는 프로퍼티
+
+        Returns:
+            int: 등록된 상품 ID 중 가장 큰 값에 1을 더한 값
+        """
+        return self.products[-1].id + 1 if self.products else 1
+
+    def view(self, field: str) -> ProductView:
+        """
+        상품 목록의 속성 하나를 보여주는 뷰를 반환하는 메서드
+
+        Args:
+            field (str): 상품 속성 이름 (예: 'id', 'name')
+
+        Returns:
+            ProductView: 상품 목록을 복사하지 않는 읽기 전용 뷰
+        """
+        return ProductView(self, field)
+
+    def get(self, product_id: int) -> Product:
+        """
+        상품 ID로 상품을 찾는 메서드
+
+        Args:
+            product_id (int): 찾을 상품의 ID
+
+        Returns:
+            Product: 찾은 상품 객체. 없는 경우 None
+        """
+        return self.by_id.get(product_id)
+
+    def find(self, name: str) -> list[Product]:
+        """
+        상품 이름으로 상품들을 찾는 메서드
+
+        Args:
+            name (str): 찾을 상품의 이름
+
+        Returns:
+            list: 이름이 같은 상품 리스트. 없는 경우 빈 리스트
+        """
+        return list(self.by_name.get(name, ()))
+
+    def cheapest_in_stock(self) -> Product:
+        """
+        재고가 있는 상품 중 가장 싼 상품을 반환하는 메서드
+
+        Returns:
+            Product: 가장 싼 상품. 재고가 있는 상품이 없는 경우 None
+        """
+        return self.in_stock_by_price[0][2] if self.in_stock_by_price else None
+
+    def in_stock_up_to(self, price: int) -> list[tuple[int, int, Product]]:
+        """
+        재고가 있고 가격이 price 이하인 상품들을 이진 탐색으로 찾는 메서드
+
+        Args:
+            price (int): 최대 가격
+
+        Returns:
+            list: 가격 순으로 정렬된 (가격, ID, 상품) 튜플 리스트
+        """
+        end = bisect.bisect_right(self.in_stock_by_price, price, key=itemgetter(0))
+        return self.in_stock_by_price[:end]
+
+    def lowest_stock(self) -> Product:
+        """
+        재고가 가장 적은 상품을 반환하는 메서드
+
+        Returns:
+            Product: 재고가 가장 적은 상품. 상품이 없는 경우 None
+        """
+        return self.by_stock[0][2] if self.by_stock else None
+
+    def add(self, product: Product) -> Product:
+        """
+        상품을 ID 순서에 맞는 위치에 추가하고 인덱스를 갱신하는 메서드
+
+        Args:
+            product (Product): 추가할 상품 객체
+
+        Returns:
+            Product: 추가된 상품 객체
+
+        Raises:
+            ValueError: 같은 ID의 상품이 이미 등록되어 있는 경우
+        """
+        if product.id in self.by_id:
+            raise ValueError('Duplicate product id')
+        bisect.insort(self.products, product, key=attrgetter('id'))
+        self._link(product)
+        bisect.insort(self.by_stock, (product.count, product.id, product))
+        if product.count > 0:
+            bisect.insort(self.in_stock_by_price, (product.price, product.id, product))
+        for listener in self.listeners:
+            listener.product_added(product)
+        return product
+
+    def bulk_load(self, products: list[Product]) -> list[Product]:
+        """
+        여러 상품을 한 번에 추가하는 메서드. 상품 리스트와 인덱스를 한 번씩만 정렬합니다.
+
+        Args:
+            products (list): 추가할 상품 리스트
+
+        Returns:
+            list: ID 순으로 정렬된 상품 리스트
+
+        Raises:
+            ValueError: 같은 ID의 상품이 이미 등록되어 있는 경우
+        """
+        ids = {product.id for product in products}
+        if len(ids) != len(products) or not ids.isdisjoint(self.by_id):
+            raise ValueError('Duplicate product id')
+        for product in products:
+            self._link(product)
+        self.products.extend(products)
+        self._rebuild()
+        for listener in self.listeners:
+            for product in products:
+                listener.product_added(product)
+        return self.products
+
+    def remove(self, product: Product) -> Product:
+        """
+        상품을 목록과 인덱스에서 삭제하는 메서드
+
+        Args:
+            product (Product): 삭제할 상품 객체
+
+        Returns:
+            Product: 삭제된 상품 객체
+        """
+        del self.products[self._position(self.products, product.id, key_func=attrgetter('id'))]
+        del self.by_stock[self._position(self.by_stock, (product.count, product.id))]
+        if product.count > 0:
+            del self.in_stock_by_price[self._position(self.in_stock_by_price, (product.price, product.id))]
+        del self.by_id[product.id]
+        self._unlink_name(product, product.name)
+        product.observer = None
+        for listener in self.listeners:
+            listener.product_removed(product)
+        return product
+
+    def product_changed(self, product: Product, field: str, old, new) -> None:
+        """
+        상품의 속성이 바뀌었을 때 Product가 호출하는 메서드. 바뀐 속성과 관련된 인덱스만 갱신합니다.
+
+        Args:
+            product (Product): 속성이 바뀐 상품
+            field (str): 바뀐 속성 이름 ('name', 'price', 'count')
+            old: 바뀌기 전의 값
+            new: 바뀐 후의 값
+        """
+        if field == 'name':
+            self._unlink_name(product, old)
+            self.by_name.setdefault(new, []).append(product)
+        elif field == 'price':
+            if product.count > 0:
+                del self.in_stock_by_price[self._position(self.in_stock_by_price, (old, product.id))]
+                bisect.insort(self.in_stock_by_price, (new, product.id, product))
+        elif field == 'count':
+            del self.by_stock[self._position(self.by_stock, (old, product.id))]
+            bisect.insort(self.by_stock, (new, product.id, product))
+            if old > 0 and new <= 0:   # 품절된 경우 가격 인덱스에서 제외
+                del self.in_stock_by_price[self._position(self.in_stock_by_price, (product.price, product.id))]
+            elif old <= 0 and new > 0:   # 재입고된 경우 가격 인덱스에 추가
+                bisect.insort(self.in_stock_by_price, (product.price, product.id, product))
+        for listener in self.listeners:
+            listener.product_changed(product, field, old, new)
+
+    def reindex(self) -> None:
+        """
+        상품 리스트를 기준으로 모든 인덱스를 다시 만드는 메서드. 상품 ID가 바뀐 경우에 사용합니다.
+        """
+        self.by_id = {}
+        self.by_name = {}
+        for product in self.products:
+            self._link(product)
+        self._rebuild()
+
+    def clear(self) -> None:
+        """
+        모든 상품을 삭제하는 메서드
+        """
+        for product in self.products:
+            product.observer = None
+            for listener in self.listeners:
+                listener.product_removed(product)
+        self.products.clear()
+        self.by_id.clear()
+        self.by_name.clear()
+        self.in_stock_by_price.clear()
+        self.by_stock.clear()
+
+    def _link(self, product: Product) -> None:
+        self.by_id[product.id] = product
+        self.by_name.setdefault(product.name, []).append(product)
+        product.observer = self
+
+    def _rebuild(self) -> None:
+        self.products.sort(key=attrgetter('id'))
+        self.by_stock = sorted((p.count, p.id, p) for p in self.products)
+        self.in_stock_by_price = sorted((p.price, p.id, p) for p in self.products if p.count > 0)
+
+    def _unlink_name(self, product: Product, name: str) -> None:
+        same_name = self.by_name[name]
+        same_name.remove(product)
+        if not same_name:
+            del self.by_name[name]
+
+    @staticmethod
+    def _position(items: list, key, key_func=None) -> int:
+        """
+        정렬된 리스트에서 key와 일치하는 항목의 위치를 이진 탐색으로 찾는 메서드입니다.
+        """
+        return bisect.bisect_left(items, key, key=key_func)
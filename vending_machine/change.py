@@ -0,0 +1,156 @@
+import math
+from collections import deque
+
+__all__ = ['ChangeMaker', 'ChangeBox']
+
+
+class ChangeMaker():
+    def __init__(self, denominations: tuple = (500, 100), max_amount: int = 10000) -> None:
+        """
+        거스름돈 보관함의 동전 개수로 만들 수 있는 금액과 최소 동전 조합을 표로 미리 계산하는 클래스
+
+        표는 동전 개수 제한이 있는 동적 계획법으로 한 번에 계산되며, 이후 금액별 조회는 화폐 종류 수만큼의 연산으로 끝납니다.
+        max_amount를 넘는 금액에 필요한 동전 수는 결과에 영향을 주지 않으므로,
+        동전 개수가 그 이상인 화폐의 개수가 바뀌어도 표를 다시 계산하지 않습니다.
+
+        Args:
+            denominations (tuple, optional): 거스름돈으로 줄 수 있는 화폐 단위. Defaults to (500, 100).
+            max_amount (int, optional): 표로 계산해 둘 최대 거스름돈 금액. 더 큰 금액을 조회하면 표가 늘어납니다. Defaults to 10000.
+        """
+        self.denominations: tuple = tuple(sorted(set(denominations), reverse=True))
+        self.unit: int = math.gcd(*self.denominations)   # 모든 화폐 단위의 최대공약수
+        self.max_amount: int = max_amount
+        self._key: tuple = None          # 표를 계산할 때 사용한 (상한이 적용된) 동전 개수
+        self._coins: list[float] = []    # 금액별 최소 동전 개수 (만들 수 없으면 inf)
+        self._take: list[list[int]] = []  # 화폐 단위별, 금액별 사용한 동전 개수
+        self._plans: dict[int, dict[int, int]] = {}   # 조회한 금액별 동전 조합
+
+    def _table_key(self, change_box: dict) -> tuple:
+        return tuple(min(change_box.get(d, 0), self.max_amount // d) for d in self.denominations)
+
+    def _build(self, key: tuple) -> None:
+        """
+        동전 개수 제한이 있는 최소 동전 문제를 화폐 단위마다 슬라이딩 윈도우 최솟값으로 계산하는 메서드입니다.
+        """
+        size = self.max_amount // self.unit + 1
+        coins = [0.0] + [math.inf] * (size - 1)
+        take_all = []
+        for d, limit in zip(self.denominations, key):
+            step = d // self.unit
+            new = [math.inf] * size
+            take = [0] * size
+            for r in range(step):
+                window = deque()   # (j, coins[r + j*step] - j) 값이 증가하는 순서로 유지
+                for j, a in enumerate(range(r, size, step)):
+                    value = coins[a] - j
+                    while window and window[-1][1] >= value:
+                        window.pop()
+                    window.append((j, value))
+                    if window[0][0] < j - limit:
+                        window.popleft()
+                    best_j, best = window[0]
+                    new[a] = best + j
+                    take[a] = j - best_j
+            coins = new
+            take_all.append(take)
+        self._coins = coins
+        self._take = take_all
+        self._plans = {}
+        self._key = key
+
+    def _ensure(self, amount: int, change_box: dict) -> None:
+        while amount > self.max_amount:
+            self.max_amount *= 2
+            self._key = None
+        key = self._table_key(change_box)
+        if key != self._key:   # 필요한 범위의 동전 개수가 바뀐 경우에만 다시 계산
+            self._build(key)
+
+    def can_make(self, amount: int, change_box: dict) -> bool:
+        """
+        보관함의 동전으로 금액을 정확히 만들 수 있는지 확인하는 메서드
+
+        Args:
+            amount (int): 거스름돈 금액
+            change_box (dict): 화폐 단위를 key로, 개수를 value로 가지는 거스름돈 보관함
+
+        Returns:
+            bool: 금액을 만들 수 있는지 여부
+        """
+        if amount <= 0:
+            return amount == 0
+        if amount % self.unit:
+            return False
+        self._ensure(amount, change_box)
+        return self._coins[amount // self.unit] != math.inf
+
+    def plan(self, amount: int, change_box: dict) -> dict[int, int]:
+        """
+        금액을 가장 적은 개수의 동전으로 만드는 조합을 반환하는 메서드
+
+        Args:
+            amount (int): 거스름돈 금액
+            change_box (dict): 화폐 단위를 key로, 개수를 value로 가지는 거스름돈 보관함
+
+        Returns:
+            Dict[int, int]: 화폐 단위를 key로, 개수를 value로 가지는 딕셔너리
+
+        Raises:
+            ValueError: 금액을 만들 수 없는 경우 부족한 화폐 단위를 메시지로 발생
+        """
+        if amount <= 0:
+            return {d: 0 for d in self.denominations}
+        if not self.can_make(amount, change_box):
+            raise ValueError(str(self.short_denomination(amount, change_box)))
+        plan = self._plans.get(amount)
+        if plan is None:
+            plan = {}
+            a = amount // self.unit
+            for i in range(len(self.denominations) - 1, -1, -1):   # 마지막으로 계산한 화폐 단위부터 역추적
+                d = self.denominations[i]
+                plan[d] = self._take[i][a]
+                a -= plan[d] * (d // self.unit)
+            plan = {d: plan[d] for d in self.denominations}
+            self._plans[amount] = plan
+        return dict(plan)
+
+    def short_denomination(self, amount: int, change_box: dict) -> int:
+        """
+        금액을 만들 수 없을 때 부족한 화폐 단위를 추정하는 메서드
+
+        큰 단위부터 가능한 만큼 사용한 뒤, 남은 금액 이하인 가장 작은 화폐 단위를 부족한 단위로 봅니다.
+
+        Args:
+            amount (int): 거스름돈 금액
+            change_box (dict): 거스름돈 보관함
+
+        Returns:
+            int: 부족한 화폐 단위
+        """
+        remain = amount
+        for d in self.denominations:
+            remain -= min(change_box.get(d, 0), remain // d) * d
+        usable = [d for d in self.denominations if d <= remain]
+        return min(usable) if usable else self.denominations[-1]
+
+
+class ChangeBox(dict):
+    def __init__(self, *args, **kwargs) -> None:
+        """
+        화폐 단위별 개수가 바뀔 때 observer에게 통지하는 거스름돈 보관함 딕셔너리
+
+        observer는 change_changed(money, old, new) 메서드를 가진 객체입니다 (예: ThresholdMonitor).
+        """
+        super().__init__(*args, **kwargs)
+        self.observer = None
+
+    def __setitem__(self, money: int, count: int) -> None:
+        old = self.get(money, 0)
+        super().__setitem__(money, count)
+        if self.observer is not None and old != count:
+            self.observer.change_changed(money, old, count)
+
+    def setdefault(self, money: int, count: int = 0) -> int:
+        if money not in self:
+            self[money] = count
+        return self[money]
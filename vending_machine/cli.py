@@ -1,22 +1,27 @@
-import platform
 import sys
 import os
 import hashlib
+import time
 from .vendingmachine import VendingMachine, Product
 from .textformatter import TextFormatter
+from .renderer import ScreenRenderer
+from .commands import CommandProcessor, parse_command
 
 __all__ = ['CommandLineInterface']
 
 class CommandLineInterface(BaseException):
-    def __init__(self, VM: VendingMachine) -> None:
+    def __init__(self, VM: VendingMachine, password_file: str = None) -> None:
         """
         커맨드 라인 인터페이스(Command Line Interface)를 나타내는 클래스
 
         Args:
             VM (VendingMachine): 자판기(VendingMachine) 객체
+            password_file (str, optional): 관리자 비밀번호 파일명. Defaults to 자판기 디렉터리의 'passwd.txt'.
         """
         self.machine = VM
-        self.password_file = 'passwd.txt'
+        self.password_file = password_file or VM.path('passwd.txt')
+        self.renderer = ScreenRenderer()   # 달라진 줄만 다시 그리는 화면 출력기
+        self.renderer.metrics = VM.metrics
 
     @property
     def is_credit(self) -> bool:
@@ -44,10 +49,7 @@ class CommandLineInterface(BaseException):
         """
         화면을 지우는 메서드
         """
-        if platform.platform().startswith('Windows'): # Windows 운영체제인 경우
-            os.system('cls')  
-        else: # 그 외의 운영체제인 경우
-            os.system('clear')
+        self.renderer.clear()  # 외부 명령 없이 ANSI 코드로 화면을 지움
 
     def pay_method(self, Input) -> str:
         """
@@ -61,7 +63,7 @@ class CommandLineInterface(BaseException):
         """
         output = ''
         if Input in ['카드', 'card']:
-            self.machine.user.is_credit = True  # 사용자의 결제 수단을 카드로 변경
+            self.machine.set_pay_method(is_credit=True)  # 사용자의 결제 수단을 카드로 변경
             output += '결제수단을 카드로 변경했습니다.\n'  # 변경된 결제 수단에 대한 메시지 추가
         elif Input in ['현금', 'cash']:
             output += '결제수단을 현금으로 변경했습니다.\n'  # 변경된 결제 수단에 대한 메시지 추가
@@ -100,15 +102,13 @@ class CommandLineInterface(BaseException):
         Returns:
             str: 구매 가능한 물품 목록과 관련된 메시지를 반환
         """
-        products: list = self.machine.products  # 자판기의 상품 목록 가져오기
+        products: list = self.machine.sellable_products()  # 자판기에서 판매 가능한 상품 목록 가져오기
         t_output = '구매 가능한 물품 목록\n'  # 출력할 메시지의 시작 부분
         output = ''  # 출력할 메시지
 
-        # 상품 목록을 순회하며 구매 가능한 상품인 경우 출력할 메시지에 추가
+        # 구매 가능한 상품들의 정보를 출력할 메시지에 추가 (이미 판매 가능 여부를 확인했으므로 다시 확인하지 않음)
         for product in products:
-            assert type(product) is Product  # 상품 객체인지 확인
-            if self.machine.is_sellable(product):  # 자판기에서 판매 가능한 상품인지 확인
-                output = output + '\n' + product.product_info(self.machine)  # 상품 정보를 메시지에 추가
+            output = output + '\n' + product.product_info(self.machine, check_money=False)  # 상품 정보를 메시지에 추가
 
         if len(output) == 0:
             output = '구매 가능한 물품이 없습니다. 금액을 투입하거나, 재고를 확인해주세요'
@@ -157,7 +157,8 @@ class CommandLineInterface(BaseException):
         """
         refund_dict: dict[int, int]
         refunded: int
-        refund_dict, refunded = self.machine.refund(self.machine.cal_refund())  # 환불할 금액 계산 후 자판기에 환불 요청
+        with self.machine.transaction():   # 계산한 금액이 환불 전에 다른 스레드에 의해 바뀌지 않도록 함
+            refund_dict, refunded = self.machine.refund(self.machine.cal_refund())  # 환불할 금액 계산 후 자판기에 환불 요청
         return ''.join(f'{k}원 {v}개 ' for k,v in refund_dict.items())+'\n'+f"{refunded}원 환불되었습니다.\n"  # 환불된 금액에 대한 메시지 반환
 
     def buy(self, Input: str) -> tuple:
@@ -222,32 +223,36 @@ class CommandLineInterface(BaseException):
 
     def chk_cmd(self, Input: str) -> str:
         """
-        사용자 입력을 검사하고 해당하는 명령을 실행하는 메서드입니다.
+        사용자 입력을 검사하고 해당하는 명령을 실행한 뒤, 다음에 보여줄 화면을 반환하는 메서드입니다.
+
+        화면을 직접 다시 그리지 않으므로 명령을 처리해도 호출 스택이 깊어지지 않습니다.
 
         Args:
             Input (str): 사용자 입력 문자열
 
         Returns:
-            str: 출력 메시지 문자열
+            str | tuple: 다음 화면에 출력할 메시지 문자열 혹은 (output, end_output) 튜플
         
         Raises:
             SystemExit: 사용자 입력이 "exit" 또는 "나가기"인 경우
         """
-        if "도움" in Input or "help" in Input.lower():
-            return self.reload(self.help)  # help 명령어 처리
-        elif Input in ["list", "목록"]:
-            return self.reload(self.show_product())  # list 명령어 처리
-        elif Input in ["buyable", "구매가능목록"]:
-            return self.reload(self.buyable_product)  # buyable 명령어 처리
-        elif Input in ["refund", "환불"]:
-            return self.reload(self.refund())  # refund 명령어 처리
-        elif Input.startswith(('buy ','구매 ')) and (Input[3:].isdigit() or Input[4:].isdigit()):
-            return self.reload(self.buy(Input))  # buy 명령어 처리
-        elif Input.strip().isdigit() and not self.is_credit:
-            return self.reload(self.insert(money=int(Input)))  # 숫자로 시작하는 입력에 대한 처리
-        elif Input in ['management','관리자']: # 관리자 모드 진입
-            return self.reload(self.management())
-        elif Input in ['exit', '나가기']:
+        command, _ = parse_command(Input)  # 배치 모드와 같은 명령어 체계로 해석
+        if command == 'help':
+            return self.help  # help 명령어 처리
+        elif command == 'list':
+            return self.show_product()  # list 명령어 처리
+        elif command == 'buyable':
+            return self.buyable_product  # buyable 명령어 처리
+        elif command == 'refund':
+            return self.refund()  # refund 명령어 처리
+        elif command == 'buy':
+            return self.buy(Input)  # buy 명령어 처리
+        elif command == 'insert' and Input.strip().isdigit() and not self.is_credit:
+            return self.insert(money=int(Input))  # 숫자로 시작하는 입력에 대한 처리
+        elif command == 'management': # 관리자 모드 진입
+            return self.management()
+        elif command == 'exit':
+            self.machine.close()  # 저장되지 않은 변경 사항과 리포트 기록
             raise SystemExit  # exit 명령어 처리
         
         return Input  # 그 외의 입력은 그대로 반환
@@ -278,7 +283,7 @@ class CommandLineInterface(BaseException):
         """
         self.clear()
         passwd = input('새로운 비밀번호를 입력하세요:')
-        with open('passwd.txt', 'w') as f:
+        with open(self.password_file, 'w') as f:
             m = hashlib.sha256()
             m.update(passwd.encode('utf-8'))
             f.write(m.hexdigest())
@@ -292,12 +297,13 @@ class CommandLineInterface(BaseException):
             str: 상품 추가 완료 메시지를 반환
         """
         name = input('추가할 상품의 이름을 입력하세요: ')
-        try:
-            price = int(input('추가할 상품의 가격을 입력하세요: '))
-        except ValueError:
-            print('잘못된 입력입니다. 다시 입력해주세요.')
-            return self.add_product()
-            
+        while True:
+            try:
+                price = int(input('추가할 상품의 가격을 입력하세요: '))
+                break
+            except ValueError:
+                print('잘못된 입력입니다. 다시 입력해주세요.')
+
         try :
             count = int(input('추가할 상품의 개수를 입력하세요(미입력시 30): '))
         except ValueError:
@@ -318,10 +324,10 @@ class CommandLineInterface(BaseException):
         """
         sys.stdout.write(self.show_product(manage=True)[0]+'\n')
         while True:
-            id = int(input(f'{action}할 상품의 번호를 입력하세요: '))
-            for product in self.machine.products:
-                if product.id == id:
-                    return product
+            id = input(f'{action}할 상품의 번호를 입력하세요: ').strip()
+            product = self.machine.get_product(int(id)) if id.isdigit() else None
+            if product is not None:
+                return product
             self.clear()
             print('잘못된 상품 번호입니다. 다시 입력해주세요.')
 
@@ -356,12 +362,19 @@ class CommandLineInterface(BaseException):
             return None
         target_product = self.select_product('수정')
         
-        name = input('수정할 상품의 이름을 입력하세요(미입력시 미수정): ').strip() or None
-        price = input('수정할 상품의 가격을 입력하세요(미입력시 미수정): ').strip() or None
-        count = input('수정할 상품의 개수를 입력하세요(미입력시 미수정): ').strip() or None
-
-        self.machine.edit_product(name=name,price=price,count=int(count),product=target_product)
-        return '상품수정 완료'
+        while True:
+            name = input('수정할 상품의 이름을 입력하세요(미입력시 미수정): ').strip() or None
+            price = input('수정할 상품의 가격을 입력하세요(미입력시 미수정): ').strip() or None
+            count = input('수정할 상품의 개수를 입력하세요(미입력시 미수정): ').strip() or None
+            try:
+                price = int(price) if price is not None else None
+                count = int(count) if count is not None else None
+                self.machine.edit_product(name=name,price=price,count=count,product=target_product)
+                return '상품수정 완료'
+            except (ValueError, AssertionError):   # 숫자가 아닌 값, 음수 재고, 그 사이 삭제된 상품
+                print('잘못된 입력입니다. 다시 입력해주세요.')
+                if self.machine.get_product(target_product.id) is not target_product:
+                    return '나가기'
     
     def edit_products(self):
         """
@@ -370,15 +383,32 @@ class CommandLineInterface(BaseException):
         Returns:   
             str: 상품 수정 완료 메시지를 반환
         """
-        functions = [self.add_product, self.delete_product, self.edit_product, lambda: '나가기']
+        functions = [self.add_product, self.delete_product, self.edit_product, self.restock_products, lambda: '나가기']
         self.clear()
-        try:
-            Input = int(input('1. 상품 추가\n2. 상품 삭제\n3. 상품 수정\n4. 나가기\n'))
-            return functions[Input-1]()
-        except:
+        while True:
+            Input = input('1. 상품 추가\n2. 상품 삭제\n3. 상품 수정\n4. 재고 일괄 보충\n5. 나가기\n').strip()
+            if Input.isdigit() and 1 <= int(Input) <= len(functions):
+                try:
+                    return functions[int(Input)-1]()
+                except (ValueError, AssertionError):   # 선택한 동작이 실패해도 자판기를 종료하지 않음
+                    pass
             print('잘못된 입력입니다.')
-            return self.edit_products()
     
+    def restock_products(self):
+        """
+        모든 상품의 재고를 입력한 개수까지 한 번에 채우는 메서드입니다.
+
+        Returns:
+            str: 재고 보충 완료 메시지를 반환
+        """
+        while True:
+            level = input('채울 재고 개수를 입력하세요(미입력시 30): ').strip() or '30'
+            if level.isdigit():
+                break
+            print('잘못된 입력입니다.')
+        changed = self.machine.restock_many(level=int(level))
+        return f'상품 {len(changed)}개 재고보충 완료'
+
     def edit_change(self):
         """
         잔돈을 수정하는 메서드입니다.
@@ -386,15 +416,17 @@ class CommandLineInterface(BaseException):
         Returns:
             str: 잔돈 수정 완료 메시지를 반환
         """
+        functions = [self.add_change, self.get_change, self.refill_change, lambda: '나가기']
         self.clear()
-        sys.stdout.write(self.machine.change_box_info)
-        try :
-            Input = int(input('1. 잔돈 추가\n2. 잔돈 인출\n3. 나가기\n'))
-            functions = [self.add_change, self.get_change, lambda: '나가기']
-            return functions[Input-1]()
-        except:
+        while True:
+            sys.stdout.write(self.machine.change_box_info)
+            Input = input('1. 잔돈 추가\n2. 잔돈 인출\n3. 잔돈 일괄 보충\n4. 나가기\n').strip()
+            if Input.isdigit() and 1 <= int(Input) <= len(functions):
+                try:
+                    return functions[int(Input)-1]()
+                except (ValueError, AssertionError):   # 선택한 동작이 실패해도 자판기를 종료하지 않음
+                    pass
             print('잘못된 입력입니다.')
-            return self.edit_change()
     
     def add_change(self):
         """
@@ -404,15 +436,33 @@ class CommandLineInterface(BaseException):
             str: 잔돈 추가 완료 메시지를 반환
         """
         self.clear()
-        try:
-            money = int(input('추가할 잔돈의 종류를 입력하세요: '))
-            count = int(input('추가할 잔돈의 개수를 입력하세요: '))
-            count = self.machine.add_change(money=money, count=count)
-            return f'{money}원 {count}개 추가 완료'
-        except:
-            print('잘못된 입력입니다.')
-            return self.add_change()
+        while True:
+            try:
+                money = int(input('추가할 잔돈의 종류를 입력하세요: '))
+                count = int(input('추가할 잔돈의 개수를 입력하세요: '))
+                count = self.machine.add_change(money=money, count=count)
+                return f'{money}원 {count}개 추가 완료'
+            except (ValueError, AssertionError):
+                print('잘못된 입력입니다.')
     
+    def refill_change(self):
+        """
+        여러 화폐 단위의 거스름돈을 입력한 개수까지 한 번에 채우는 메서드입니다.
+
+        Returns:
+            str: 잔돈 보충 완료 메시지를 반환
+        """
+        self.clear()
+        while True:
+            sys.stdout.write(self.machine.change_box_info)
+            Input = input('채울 개수를 "화폐=개수" 형식으로 입력하세요 (예: 100=50 500=50): ').split()
+            try:
+                counts = dict(map(int, item.split('=', 1)) for item in Input)
+                added = self.machine.refill_change(counts)
+                return f'잔돈 {sum(added.values())}개 보충 완료'
+            except ValueError:
+                print('잘못된 입력입니다.')
+
     def get_change(self):
         """
         잔돈을 인출하는 메서드입니다.
@@ -423,20 +473,78 @@ class CommandLineInterface(BaseException):
         Raises:
             Exception: 잔돈이 부족하거나 입력이 잘못된 경우
         """
-        try:
-            money = int(input('인출할 잔돈의 종류을 입력하세요: '))
-            count = int(input('인출할 잔돈의 개수를 입력하세요: '))
-            real_count =  self.machine.get_change(money=money,count=count)
-            return f'{money}원 {real_count}개 인출 완료'
-        except Exception as e:
-            self.clear()
-            if str(e) == 'Not enough change':
-                print('잔돈이 부족합니다.')
-            else:
-                print('잘못된 입력입니다.')
-            return self.get_change()
+        while True:
+            try:
+                money = int(input('인출할 잔돈의 종류을 입력하세요: '))
+                count = int(input('인출할 잔돈의 개수를 입력하세요: '))
+                real_count =  self.machine.get_change(money=money,count=count)
+                return f'{money}원 {real_count}개 인출 완료'
+            except Exception as e:
+                self.clear()
+                if str(e) == 'Not enough change':
+                    print('잔돈이 부족합니다.')
+                else:
+                    print('잘못된 입력입니다.')
     
     
+    def show_report(self):
+        """
+        최근 리포트 통계를 보여주는 메서드입니다.
+
+        Returns:
+            str: 빈 문자열 (관리자 모드를 계속 진행)
+        """
+        self.clear()
+        sys.stdout.write(self.machine.report_summary())
+        sys.stdout.write('\n' + self.machine.metrics.summary())
+        input('\n계속하시려면 엔터를 누르세요')
+        self.clear()
+        return ''
+
+    def profile(self):
+        """
+        프로파일링(cProfile, tracemalloc)을 시작하거나, 진행 중이면 종료하고 결과를 보여주는 메서드입니다.
+
+        결과는 자판기 디렉터리의 profile-[시각].prof 파일에도 저장되며, python -m pstats로 열어볼 수 있습니다.
+
+        Returns:
+            str: 빈 문자열 (관리자 모드를 계속 진행)
+        """
+        self.clear()
+        metrics = self.machine.metrics
+        if not metrics.profiling:
+            metrics.start_profile()
+            print('프로파일링을 시작했습니다. 다시 선택하면 종료하고 결과를 보여줍니다.')
+            return ''
+        file = self.machine.path(time.strftime('profile-%Y%m%d-%H%M%S.prof'))
+        sys.stdout.write(metrics.stop_profile(file))
+        input(f'\n{file}에 저장했습니다. 계속하시려면 엔터를 누르세요')
+        self.clear()
+        return ''
+
+    def run_file(self):
+        """
+        명령 파일(한 줄에 명령 하나, 예: "restock 30", "planogram new.json", "refill 100=50")을 실행하는 메서드입니다.
+
+        Returns:
+            str: 빈 문자열 (관리자 모드를 계속 진행)
+        """
+        self.clear()
+        file = input('실행할 명령 파일명을 입력하세요: ').strip()
+        try:
+            with open(file, 'r', encoding='utf-8') as f:
+                lines = [line.strip() for line in f]
+        except OSError:
+            print('파일을 열 수 없습니다.')
+            return ''
+        processor = CommandProcessor(self.machine)
+        results = [processor.execute(line) for line in lines if line and not line.startswith('#')]
+        for result in results:
+            print(('성공 ' if result['ok'] else '실패 ') + result['input'] + ('' if result['ok'] else f' ({result["error"]})'))
+        input('\n계속하시려면 엔터를 누르세요')
+        self.clear()
+        return ''
+
     def management(self):
         """
         관리자 모드를 실행하는 메서드입니다.
@@ -444,33 +552,37 @@ class CommandLineInterface(BaseException):
         Returns:
             str: 관리자 모드 종료 메시지를 반환
         """
+        self.renderer.invalidate()  # 관리자 모드는 화면에 직접 출력하므로 이후 화면은 전부 다시 그림
         if self.check_passwd():
             options = {
                 '1': self.edit_products,
                 '2': self.edit_change,
                 '3': self.change_passwd,
-                '4': lambda: '나가기',
+                '4': self.show_report,
+                '5': self.profile,
+                '6': self.run_file,
+                '7': lambda: '나가기',
             }
             report = self.machine.report()
             while True:
-                print(f'관리자 모드입니다.')
+                print('관리자 모드입니다.')
                 print(TextFormatter.textColor(report, 'yellow'))
-                input_text = input('실행하고 싶은 기능의 숫자를 입력하세요.\n1. 상품 수정\n2. 잔돈 수정\n3. 비밀번호 변경\n4. 나가기\n')
+                input_text = input('실행하고 싶은 기능의 숫자를 입력하세요.\n1. 상품 수정\n2. 잔돈 수정\n3. 비밀번호 변경\n4. 리포트 통계\n5. 프로파일링 시작/종료\n6. 명령 파일 실행\n7. 나가기\n')
                 if input_text in options:
-                    result = options[input_text]()
+                    result = options[input_text]() or ''
                     if any(word in result for word in  ['나가기', '완료']) :
                         break
                 else:
                     self.clear()
                     print('잘못된 입력입니다.')
         else:
-            print("비밀번호가 일치하지 않습니다.")
+            result = "비밀번호가 일치하지 않습니다."
         return f'\n{result}\n관리자 모드 종료'
 
 
     def reload(self, output='', end_output='', product_list=True):
         """
-        화면을 리로드하고 출력할 내용을 출력하고 사용자 입력을 받아 해당 명령을 실행하는 메서드입니다.
+        화면을 리로드하고 출력할 내용을 출력한 뒤 사용자 입력을 받아 반환하는 메서드입니다.
 
         Args:
             output (str, optional): 출력할 내용의 시작 부분. 기본값은 빈 문자열입니다.
@@ -479,32 +591,34 @@ class CommandLineInterface(BaseException):
                 기본값은 True로 상품 목록을 출력합니다.
 
         Returns:
-            str: 출력 메시지 문자열
+            str: 사용자 입력 문자열
         """
         self.machine.chk_everytime()
         # output이 튜플인 경우 output과 end_output으로 분리
         if type(output) == tuple:
             output, end_output = output
         
-        self.clear()  # 화면 리로드
-        
+        frame = []  # 한 번에 출력할 화면
         if output is not None:
-            sys.stdout.write(output)  # 출력할 내용의 시작 부분 출력
+            frame.append(output)  # 출력할 내용의 시작 부분
         if (self.is_credit or self.machine.inserted_money > 0) and product_list:
-            sys.stdout.write(self.buyable_product+'\n')  # 상품 목록 출력
-        sys.stdout.write('\n'+self.status)  # 현재 상태 출력
+            frame.append(self.buyable_product+'\n')  # 상품 목록
+        frame.append('\n'+self.status)  # 현재 상태
         if end_output is not None:
-            sys.stdout.write(end_output+'\n')  # 출력할 내용의 끝 부분 출력
-        Input = input('>>>')  # 사용자 입력 받기
-        return self.chk_cmd(Input)  # 입력된 명령어 처리
+            frame.append(end_output+'\n')  # 출력할 내용의 끝 부분
+        self.renderer.render(''.join(frame))  # 이전 화면과 달라진 줄만 다시 그림
+        return input('>>>')  # 사용자 입력 받기
 
 
     def run(self) -> None:
         """
         자판기를 실행하는 메서드입니다. 초기 화면을 로드하고 사용자 입력을 받아 명령을 처리하며, 무한 루프에서 실행됩니다.
+
+        화면 출력(reload)과 명령 처리(chk_cmd)를 한 루프에서 번갈아 호출하므로, 실행 시간과 관계없이 호출 스택의 깊이가 일정합니다.
         """
         self.reload(self.help)  # 초기 화면 로드
         Input = self.reload(self.show_product(first=True))  # 상품 목록 및 결제 방법 출력
-        Input = self.reload(self.pay_method(Input=Input))  # 결제 방법 선택
+        screen = self.pay_method(Input=Input)  # 결제 방법 선택
         while True:
-            self.reload(self.chk_cmd(Input))  # 사용자 입력에 따른 명령어 처리
+            Input = self.reload(screen)  # 화면 출력 후 사용자 입력 받기
+            screen = self.chk_cmd(Input)  # 사용자 입력에 따른 명령어 처리
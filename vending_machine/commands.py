@@ -0,0 +1,315 @@
+import json
+import shlex
+import sys
+from .vendingmachine import VendingMachine
+from .storage import iter_json_records
+
+__all__ = ['CommandProcessor', 'parse_command']
+
+# 명령어 별칭 -> 명령어 이름
+ALIASES: dict[str, str] = {
+    'list': 'list', '목록': 'list',
+    'buyable': 'buyable', '구매가능목록': 'buyable',
+    'refund': 'refund', '환불': 'refund',
+    'buy': 'buy', '구매': 'buy',
+    'insert': 'insert', '투입': 'insert',
+    'card': 'card', '카드': 'card',
+    'cash': 'cash', '현금': 'cash',
+    'status': 'status', '상태': 'status',
+    'management': 'management', '관리자': 'management',
+    'exit': 'exit', '나가기': 'exit',
+    'add': 'add', '추가': 'add',
+    'delete': 'delete', '삭제': 'delete',
+    'edit': 'edit', '수정': 'edit',
+    'resort': 'resort', '재정렬': 'resort',
+    'add_change': 'add_change', '잔돈추가': 'add_change',
+    'get_change': 'get_change', '잔돈인출': 'get_change',
+    'report': 'report', '리포트': 'report',
+    'save': 'save', '저장': 'save',
+    'restock': 'restock', '재고보충': 'restock',
+    'reprice': 'reprice', '가격변경': 'reprice',
+    'planogram': 'planogram', '상품배치': 'planogram',
+    'refill': 'refill', '잔돈보충': 'refill',
+}
+
+# 명령어 이름 -> (최소 인자 개수, 최대 인자 개수)
+ARITY: dict[str, tuple[int, int]] = {
+    'help': (0, 0), 'list': (0, 0), 'buyable': (0, 0), 'refund': (0, 0), 'buy': (1, 1), 'insert': (1, 1),
+    'card': (0, 0), 'cash': (0, 0), 'status': (0, 0), 'management': (0, 0), 'exit': (0, 0),
+    'add': (2, 3), 'delete': (1, 1), 'edit': (2, 4), 'resort': (0, 0),
+    'add_change': (2, 2), 'get_change': (2, 2), 'report': (0, 1), 'save': (0, 0),
+    'restock': (1, 10000), 'reprice': (1, 10000), 'planogram': (1, 1), 'refill': (1, 10),
+}
+
+# 관리자 권한이 필요한 명령어
+MANAGE_COMMANDS: set[str] = {'add', 'delete', 'edit', 'resort', 'add_change', 'get_change', 'report', 'save',
+                             'restock', 'reprice', 'planogram', 'refill'}
+
+
+def split_command(line: str) -> list[str]:
+    """
+    입력 한 줄을 공백으로 나누는 함수. 따옴표로 감싼 부분은 공백이 있어도 하나의 인자가 됩니다.
+
+    Windows 경로를 그대로 쓸 수 있도록 역슬래시는 이스케이프 문자로 취급하지 않습니다.
+
+    Args:
+        line (str): 입력 문자열 (예: 'add "칠성사이다 플러스" 2200', 'edit 3 name="칠성사이다 플러스"')
+
+    Returns:
+        list: 인자 리스트
+
+    Raises:
+        ValueError: 따옴표가 닫히지 않은 경우
+    """
+    lexer = shlex.shlex(line, posix=True)
+    lexer.whitespace_split = True
+    lexer.commenters = ''
+    lexer.escape = ''
+    return list(lexer)
+
+
+def parse_command(line: str) -> tuple[str, list[str]]:
+    """
+    입력 한 줄을 명령어 이름과 인자 리스트로 나누는 함수. CLI와 배치 모드가 같은 명령어 체계를 사용합니다.
+
+    숫자만 입력하면 금액 투입(insert), "도움" 혹은 "help"가 포함되면 도움말(help)로 처리합니다.
+    공백이 있는 상품 이름은 따옴표로 감쌉니다.
+
+    Args:
+        line (str): 입력 문자열 (예: "buy 3", "구매 3", "100", "edit 2 price=1500", 'add "펩시 제로" 900')
+
+    Returns:
+        tuple: (명령어 이름, 인자 리스트). 알 수 없는 명령이거나 인자가 맞지 않거나 따옴표가 닫히지 않으면 명령어 이름은 None
+    """
+    if '도움' in line or 'help' in line.lower():
+        return 'help', []
+    try:
+        tokens = split_command(line)
+    except ValueError:   # 닫히지 않은 따옴표
+        return None, []
+    if not tokens:
+        return None, []
+    if len(tokens) == 1 and tokens[0].isdigit():
+        return 'insert', tokens
+    name, args = ALIASES.get(tokens[0]), tokens[1:]
+    if name is None:
+        return None, tokens
+    low, high = ARITY[name]
+    if not low <= len(args) <= high:
+        return None, tokens
+    if name in ('buy', 'insert', 'delete') and not args[0].isdigit():
+        return None, tokens
+    return name, args
+
+
+class CommandProcessor():
+    def __init__(self, machine: VendingMachine, allow_manage: bool = True) -> None:
+        """
+        화면 출력과 사용자 입력 없이 명령어를 실행하고 결과를 딕셔너리로 반환하는 클래스
+
+        배치 파일이나 상위 제어기에서 받은 명령을 사람이 입력하는 속도와 관계없이 처리하는 데 사용합니다.
+
+        Args:
+            machine (VendingMachine): 명령을 실행할 자판기 객체
+            allow_manage (bool, optional): 상품/잔돈 수정 등 관리자 명령 허용 여부. Defaults to True.
+        """
+        self.machine: VendingMachine = machine
+        self.allow_manage: bool = allow_manage
+        self.handlers: dict = {
+            'help': self.cmd_help, 'list': self.cmd_list, 'buyable': self.cmd_buyable,
+            'refund': self.cmd_refund, 'buy': self.cmd_buy, 'insert': self.cmd_insert,
+            'card': self.cmd_card, 'cash': self.cmd_cash, 'status': self.cmd_status,
+            'management': self.cmd_status, 'add': self.cmd_add, 'delete': self.cmd_delete,
+            'edit': self.cmd_edit, 'resort': self.cmd_resort, 'add_change': self.cmd_add_change,
+            'get_change': self.cmd_get_change, 'report': self.cmd_report, 'save': self.cmd_save,
+            'restock': self.cmd_restock, 'reprice': self.cmd_reprice, 'planogram': self.cmd_planogram,
+            'refill': self.cmd_refill,
+        }
+
+    def execute(self, line: str) -> dict:
+        """
+        명령어 한 줄을 실행하는 메서드
+
+        Args:
+            line (str): 명령어 문자열
+
+        Returns:
+            dict: {'input', 'command', 'ok'}와 명령별 결과. 실패한 경우 'error'에 이유가 담깁니다.
+        """
+        name, args = parse_command(line)
+        result = {'input': line, 'command': name, 'ok': False}
+        if name is None:
+            result['error'] = 'Unknown command'
+        elif name == 'exit':
+            result['ok'] = True
+        elif name in MANAGE_COMMANDS and not self.allow_manage:
+            result['error'] = 'Management disabled'
+        else:
+            try:
+                result.update(self.handlers[name](*args))
+                result['ok'] = True
+            except (ValueError, AssertionError, KeyError, OSError) as e:
+                result['error'] = str(e)
+        self.machine.chk_everytime()
+        return result
+
+    def run(self, lines, out=None) -> int:
+        """
+        명령어들을 순서대로 실행하고 결과를 JSON Lines 형식으로 출력하는 메서드. exit 명령을 만나면 중단합니다.
+
+        Args:
+            lines (iterable): 명령어 문자열들 (예: 파일 객체). 빈 줄과 '#'으로 시작하는 줄은 무시합니다.
+            out (file, optional): 결과를 출력할 스트림. Defaults to sys.stdout.
+
+        Returns:
+            int: 실패한 명령 개수
+        """
+        out = out or sys.stdout
+        failed = 0
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            result = self.execute(line)
+            failed += not result['ok']
+            out.write(json.dumps(result, ensure_ascii=False) + '\n')
+            if result['command'] == 'exit':
+                break
+        out.flush()
+        return failed
+
+    @staticmethod
+    def _pairs(args) -> dict[int, int]:
+        """
+        "키=값" 형식의 인자들을 정수 딕셔너리로 바꾸는 메서드입니다. (예: ["1=30", "2=20"] -> {1: 30, 2: 20})
+        """
+        pairs = {}
+        for arg in args:
+            key, sep, value = arg.partition('=')
+            if not sep:
+                raise ValueError('Wrong field')
+            pairs[int(key)] = int(value)
+        return pairs
+
+    def _product(self, product_id: str):
+        product = self.machine.get_product(int(product_id))
+        if product is None:
+            raise ValueError('구매 불가능한 상품 ID')
+        return product
+
+    def cmd_help(self) -> dict:
+        return {'commands': sorted(ARITY)}
+
+    def cmd_list(self) -> dict:
+        return {'products': self.machine.to_dict}
+
+    def cmd_buyable(self) -> dict:
+        return {'products': [product.id for product in self.machine.sellable_products()]}
+
+    def cmd_status(self) -> dict:
+        user = self.machine.user
+        status = {'inserted_money': self.machine.inserted_money, 'is_credit': user.is_credit,
+                  'credit_money': user.credit_money, 'money_box': user.money_box,
+                  'change_box': dict(self.machine.change_box)}
+        if self.allow_manage:
+            status['stats'] = self.machine.stats.to_dict   # 재고 집계는 관리자에게만 표시
+        return status
+
+    def cmd_card(self) -> dict:
+        return {'is_credit': self.machine.set_pay_method(is_credit=True)}
+
+    def cmd_cash(self) -> dict:
+        return {'is_credit': self.machine.set_pay_method(is_credit=False)}
+
+    def cmd_insert(self, money: str) -> dict:
+        if self.machine.user.is_credit:
+            raise ValueError('Credit mode')
+        return {'inserted_money': self.machine.insert_money(money=int(money))}
+
+    def cmd_refund(self) -> dict:
+        with self.machine.transaction():
+            refund_dict, refunded = self.machine.refund(self.machine.cal_refund())
+        return {'refund': refund_dict, 'refunded': refunded}
+
+    def cmd_buy(self, product_id: str) -> dict:
+        name, refund_dict = self.machine.buy(product_id=int(product_id))
+        return {'product': name, 'refund': refund_dict}
+
+    def cmd_add(self, name: str, price: str, count: str = '30') -> dict:
+        self.machine.add_product(name=name, price=int(price), count=int(count))
+        return {'product': self.machine.products[-1].to_dict}
+
+    def cmd_delete(self, product_id: str) -> dict:
+        self.machine.delete_product(self._product(product_id))
+        return {'deleted': int(product_id)}
+
+    def cmd_edit(self, product_id: str, *fields: str) -> dict:
+        """
+        "edit ID name=이름 price=가격 count=개수" 형식으로 상품을 수정합니다. 지정하지 않은 속성은 수정하지 않습니다.
+        """
+        values = dict(field.split('=', 1) for field in fields if '=' in field)
+        if len(values) != len(fields) or not set(values) <= {'name', 'price', 'count'}:
+            raise ValueError('Wrong field')
+        for key in ('price', 'count'):
+            if key in values:
+                values[key] = int(values[key])
+        product = self.machine.edit_product(product=self._product(product_id), **values)
+        return {'product': product.to_dict}
+
+    def cmd_resort(self) -> dict:
+        self.machine.resort_product()
+        return {'products': list(self.machine.products_id)}
+
+    def cmd_add_change(self, money: str, count: str) -> dict:
+        return {'money': int(money), 'count': self.machine.add_change(money=int(money), count=int(count))}
+
+    def cmd_get_change(self, money: str, count: str) -> dict:
+        return {'money': int(money), 'count': self.machine.get_change(money=int(money), count=int(count))}
+
+    def cmd_report(self, days: str = '7') -> dict:
+        return {'report': self.machine.report(), 'summary': self.machine.report_summary(days=int(days))}
+
+    def cmd_save(self) -> dict:
+        self.machine.save_products()
+        return {}
+
+    def cmd_restock(self, *args: str) -> dict:
+        """
+        "restock [채울 재고] [ID=재고 ...]" 형식으로 여러 상품의 재고를 한 번에 바꿉니다.
+        숫자만 있는 첫 인자는 모든 상품을 그 재고까지 채우는 기준입니다.
+        """
+        level = int(args[0]) if args[0].isdigit() else None
+        counts = self._pairs(args[1:] if level is not None else args)
+        return {'restocked': self.machine.restock_many(counts, level=level)}
+
+    def cmd_reprice(self, *args: str) -> dict:
+        """
+        "reprice ID=가격 ...", 혹은 "reprice percent=비율 delta=금액 round=단위 [ID ...]" 형식으로 여러 상품의 가격을 한 번에 바꿉니다.
+        """
+        rule = {}
+        prices, product_ids = {}, []
+        for arg in args:
+            key, sep, value = arg.partition('=')
+            if key in ('percent', 'delta', 'round') and sep:
+                rule[key] = float(value) if key == 'percent' else int(value)
+            elif sep:
+                prices.update(self._pairs([arg]))
+            else:
+                product_ids.append(int(arg))
+        if product_ids and not {'percent', 'delta'} & set(rule):
+            raise ValueError('Wrong field')
+        changed = self.machine.reprice_many(prices, percent=rule.get('percent'), delta=rule.get('delta'),
+                                            round_to=rule.get('round', 100), product_ids=product_ids or None)
+        return {'repriced': changed}
+
+    def cmd_planogram(self, file: str) -> dict:
+        """
+        "planogram 파일명" 형식으로 상품 배치 파일(products.json과 같은 JSON 혹은 JSON Lines)과의 차이만 적용합니다.
+        """
+        return self.machine.apply_planogram(list(iter_json_records(file)))
+
+    def cmd_refill(self, *args: str) -> dict:
+        """
+        "refill 화폐=개수 ..." 형식으로 여러 화폐 단위의 거스름돈을 지정한 개수까지 채웁니다.
+        """
+        return {'added': self.machine.refill_change(self._pairs(args))}
@@ -0,0 +1,207 @@
+import os
+from .vendingmachine import VendingMachine
+from .storage import atomic_write_json, iter_json_records
+
+__all__ = ['Fleet']
+
+
+class Fleet():
+    def __init__(self, root_dir: str, catalog_file: str = 'products.json', encoding: str = None,
+                 journal: bool = True, **machine_options) -> None:
+        """
+        한 프로세스에서 여러 자판기를 실행하고 함께 관리하는 클래스
+
+        자판기마다 root_dir 아래에 별도의 디렉터리를 사용하므로 상품, 저널, 리포트, 비밀번호 파일이 겹치지 않습니다.
+        공용 상품 목록(catalog_file)은 한 번만 읽어서, 상품 파일이 없는 새 자판기의 초기 재고로 사용합니다.
+        이후 재고와 거스름돈은 자판기마다 따로 관리됩니다.
+
+        Args:
+            root_dir (str): 자판기 디렉터리들을 만들 디렉터리
+            catalog_file (str, optional): 공용 상품 목록 파일명. Defaults to 'products.json'.
+            encoding (str, optional): 공용 상품 목록 파일의 인코딩. Defaults to None (UTF-8/CP949 자동 확인).
+            journal (bool, optional): 자판기마다 저널을 사용할지 여부. Defaults to True.
+            **machine_options: VendingMachine에 전달할 추가 인자 (예: change_denominations)
+        """
+        self.root_dir: str = root_dir
+        self.catalog_file: str = catalog_file
+        self.encoding: str = encoding
+        self.journal: bool = journal
+        self.machine_options: dict = machine_options
+        self.machines: dict[str, VendingMachine] = {}   # 자판기 이름 -> 자판기
+        self._catalog: list[dict] = None                # 공용 상품 목록 (처음 필요할 때 읽음)
+        os.makedirs(root_dir, exist_ok=True)
+
+    def __getitem__(self, name: str) -> VendingMachine:
+        return self.machines[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.machines
+
+    def __iter__(self):
+        return iter(self.machines.values())
+
+    def __len__(self) -> int:
+        return len(self.machines)
+
+    @property
+    def catalog(self) -> list[dict]:
+        """
+        공용 상품 목록을 반환하는 프로퍼티. 파일은 처음 한 번만 읽습니다.
+        """
+        if self._catalog is None:
+            self._catalog = list(iter_json_records(self.catalog_file, self.encoding))
+        return self._catalog
+
+    def add_machine(self, name: str) -> VendingMachine:
+        """
+        자판기를 추가하는 메서드. 자판기 디렉터리에 상품 파일이 없으면 공용 상품 목록으로 만듭니다.
+
+        Args:
+            name (str): 자판기 이름 (디렉터리 이름으로 사용)
+
+        Returns:
+            VendingMachine: 추가된 자판기
+
+        Raises:
+            ValueError: 같은 이름의 자판기가 이미 있는 경우
+        """
+        if name in self.machines:
+            raise ValueError('Duplicate machine name')
+        state_dir = os.path.join(self.root_dir, name)
+        os.makedirs(state_dir, exist_ok=True)
+        products_file = os.path.join(state_dir, 'products.json')
+        if not os.path.exists(products_file):
+            atomic_write_json(products_file, self.catalog, indent=4)   # 자판기의 상품 파일은 UTF-8로 저장
+        machine = VendingMachine(file='products.json', journal_file='journal.jsonl' if self.journal else None,
+                                 state_dir=state_dir, **self.machine_options)
+        self.machines[name] = machine
+        return machine
+
+    def load(self) -> list[str]:
+        """
+        root_dir에 이미 있는 자판기 디렉터리들을 모두 불러오는 메서드
+
+        Returns:
+            list: 새로 불러온 자판기 이름 리스트
+        """
+        names = sorted(entry.name for entry in os.scandir(self.root_dir)
+                       if entry.is_dir() and os.path.exists(os.path.join(entry.path, 'products.json')))
+        loaded = [name for name in names if name not in self.machines]
+        for name in loaded:
+            self.add_machine(name)
+        return loaded
+
+    def remove_machine(self, name: str) -> VendingMachine:
+        """
+        자판기를 저장하고 닫은 뒤 관리 대상에서 제외하는 메서드. 디렉터리는 삭제하지 않습니다.
+        """
+        machine = self.machines.pop(name)
+        machine.close()
+        return machine
+
+    def restock_all(self, count: int, product_ids: list[int] = None) -> int:
+        """
+        모든 자판기의 상품 재고를 count개까지 채우는 메서드. 자판기마다 restock_many로 한 번에 적용합니다.
+
+        Args:
+            count (int): 채울 재고 수량. 이미 더 많은 상품은 그대로 둡니다.
+            product_ids (list, optional): 채울 상품 ID 리스트. Defaults to None (모든 상품).
+
+        Returns:
+            int: 재고를 채운 상품 개수 (자판기별 합계)
+        """
+        restocked = 0
+        for machine in self:
+            with machine.transaction():   # 판매 중인 자판기에서도 재고 확인과 수정 사이에 판매되지 않도록 함
+                if product_ids is None:
+                    changed = machine.restock_many(level=count)
+                else:
+                    products = [p for p in map(machine.get_product, product_ids) if p is not None]
+                    changed = machine.restock_many({p.id: count for p in products if p.count < count})
+            restocked += len(changed)
+        return restocked
+
+    def refill_change_all(self, change_box: dict[int, int]) -> int:
+        """
+        모든 자판기의 거스름돈을 화폐 단위별로 지정한 개수까지 채우는 메서드
+
+        Args:
+            change_box (dict): 화폐 단위를 key로, 채울 개수를 value로 가지는 딕셔너리
+
+        Returns:
+            int: 추가한 동전/지폐 개수 (자판기별 합계)
+        """
+        added = 0
+        for machine in self:
+            added += sum(machine.refill_change(change_box).values())
+        return added
+
+    def open_issues(self) -> dict[str, dict[tuple, str]]:
+        """
+        자판기별로 아직 해소되지 않은 이슈들을 반환하는 메서드
+
+        Returns:
+            dict: 자판기 이름을 key로, {(이슈 타입, key): 표시 문자열}을 value로 가지는 딕셔너리
+        """
+        return {name: dict(machine.reporter.active) for name, machine in self.machines.items()}
+
+    def out_of_stock_time(self, since: float = None) -> list[tuple[str, int, str, float]]:
+        """
+        모든 자판기의 상품별 품절 시간을 모아 긴 순서로 정렬하는 메서드
+
+        Args:
+            since (float, optional): 집계 시작 시각 (유닉스 시간). Defaults to None (처음부터).
+
+        Returns:
+            list: (자판기 이름, 상품 ID, 표시 문자열, 품절 시간(초)) 리스트
+        """
+        rows = []
+        for name, machine in self.machines.items():
+            machine.reporter.flush()
+            rows.extend((name,) + tuple(row) for row in machine.report_store.out_of_stock_time(since=since))
+        return sorted(rows, key=lambda row: row[3], reverse=True)
+
+    def report(self) -> str:
+        """
+        모든 자판기의 경고를 모아 문자열로 반환하는 메서드
+
+        Returns:
+            str: 자판기별 경고 문자열. 경고가 없는 자판기는 제외합니다.
+        """
+        output = ''
+        for name, machine in self.machines.items():
+            warnings = machine.report()
+            if warnings:
+                output += f'[{name}]\n{warnings}\n'
+        return output
+
+    def report_summary(self, days: int = 7) -> str:
+        """
+        모든 자판기의 재고 부족 상품 수와 최근 기간의 통계를 문자열로 반환하는 메서드
+
+        Args:
+            days (int, optional): 집계할 최근 일 수. Defaults to 7.
+
+        Returns:
+            str: 자판기별 집계 결과 문자열
+        """
+        output = f'자판기 {len(self)}대\n\n'
+        for name, machine in self.machines.items():
+            output += (f'[{name}] 재고 부족 상품 {len(machine.monitor.warn_products)}개, '
+                       f'거스름돈 부족 {sorted(machine.monitor.warn_change)}\n')
+            output += machine.report_summary(days=days) + '\n'
+        return output
+
+    def save_all(self) -> None:
+        """
+        모든 자판기의 저장되지 않은 상품 정보를 저장하는 메서드
+        """
+        for machine in self:
+            machine.save_products()
+
+    def close(self) -> None:
+        """
+        모든 자판기를 저장하고 닫는 메서드
+        """
+        for name in list(self.machines):
+            self.remove_machine(name)
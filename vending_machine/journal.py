@@ -0,0 +1,230 @@
+import functools
+import json
+import os
+from .product import Product
+from .storage import atomic_write_json
+
+__all__ = ['Journal', 'journaled']
+
+
+def journaled(method):
+    """
+    자판기의 상태를 바꾸는 메서드를 실행하기 전에 저널에 기록하는 데코레이터
+
+    다른 저널 대상 메서드 안에서 호출된 경우(예: buy 안의 refund)와 복구 중인 경우에는 기록하지 않습니다.
+
+    Args:
+        method (function): 저널에 기록할 VendingMachine 메서드
+
+    Returns:
+        function: 저널 기록이 추가된 메서드
+    """
+    @functools.wraps(method)
+    def wrapper(machine, *args, **kwargs):
+        journal: Journal = getattr(machine, 'journal', None)
+        if journal is None or journal.busy:
+            return method(machine, *args, **kwargs)
+        session = getattr(machine, 'session', None)
+        journal.append(method.__name__, args, kwargs, session=session.id if session is not None else 0)   # 상태를 바꾸기 전에 먼저 기록
+        journal.busy = True
+        try:
+            result = method(machine, *args, **kwargs)
+        finally:
+            journal.busy = False
+        journal.maybe_snapshot(machine)
+        return result
+    return wrapper
+
+
+class Journal():
+    def __init__(self, file: str, snapshot_file: str = None, snapshot_every: int = 100, sync: bool = True) -> None:
+        """
+        자판기의 상태 변화를 추가 전용 파일에 기록하고, 스냅샷과 재실행으로 상태를 복구하는 클래스
+
+        Args:
+            file (str): 저널 파일명 (JSON Lines 형식)
+            snapshot_file (str, optional): 스냅샷 파일명. 기본값은 저널 파일명에 '.snapshot.json'을 붙인 이름.
+            snapshot_every (int, optional): 스냅샷을 새로 만들 저널 기록 개수. Defaults to 100.
+            sync (bool, optional): 기록할 때마다 디스크에 동기화할지 여부. Defaults to True.
+        """
+        self.file: str = file
+        self.snapshot_file: str = snapshot_file or os.path.splitext(file)[0] + '.snapshot.json'
+        self.snapshot_every: int = snapshot_every
+        self.sync: bool = sync
+        self.seq: int = 0            # 마지막으로 기록한 저널 번호
+        self.pending: int = 0        # 마지막 스냅샷 이후 기록된 개수
+        self.busy: bool = False      # 저널 대상 메서드를 실행 중이거나 복구 중인지 여부
+        self._fp = None
+        self.metrics = None          # 기록한 바이트 수를 더할 Metrics 객체
+
+    @staticmethod
+    def encode(value):
+        """
+        메서드 인자를 JSON으로 저장할 수 있는 값으로 변환하는 메서드
+
+        Args:
+            value: 변환할 값
+
+        Returns:
+            JSON으로 저장할 수 있는 값
+        """
+        if isinstance(value, Product):
+            if value.observer is None:   # 카탈로그에서 빠진 상품은 재실행할 때도 같은 객체로 바꾸지 않음
+                return {'__product__': value.to_dict, 'detached': True}
+            return {'__product__': value.to_dict}
+        if isinstance(value, dict):   # 화폐 단위처럼 정수 key를 유지하기 위해 쌍의 리스트로 저장
+            return {'__dict__': [[k, Journal.encode(v)] for k, v in value.items()]}
+        if isinstance(value, (list, tuple)):
+            return [Journal.encode(v) for v in value]
+        return value
+
+    @staticmethod
+    def decode(value, machine):
+        """
+        encode로 변환된 값을 원래의 값으로 되돌리는 메서드
+
+        Args:
+            value: 변환된 값
+            machine (VendingMachine): 상품을 찾을 자판기 객체
+
+        Returns:
+            원래의 값
+        """
+        if isinstance(value, dict):
+            if '__product__' in value:
+                data = value['__product__']
+                product = None if value.get('detached') else machine.get_product(data['id'])   # 이미 등록된 상품이면 해당 객체를 사용
+                if product is not None:
+                    return product
+                return Product(ID=data['id'], name=data['name'], price=data['price'], count=data['count'])
+            if '__dict__' in value:
+                return {k: Journal.decode(v, machine) for k, v in value['__dict__']}
+            return value
+        if isinstance(value, list):
+            return [Journal.decode(v, machine) for v in value]
+        return value
+
+    def append(self, op: str, args: tuple = (), kwargs: dict = None, session: int = 0) -> int:
+        """
+        상태 변화를 저널 파일 끝에 한 줄로 기록하는 메서드
+
+        Args:
+            op (str): 실행한 VendingMachine 메서드 이름
+            args (tuple, optional): 메서드의 위치 인자. Defaults to ().
+            kwargs (dict, optional): 메서드의 키워드 인자. Defaults to None.
+            session (int, optional): 메서드를 실행한 세션 번호. 기본 세션(0)이면 기록하지 않습니다. Defaults to 0.
+
+        Returns:
+            int: 기록된 저널 번호
+        """
+        if self._fp is None:
+            self._fp = open(self.file, 'a', encoding='utf-8')
+        self.seq += 1
+        record = {'seq': self.seq, 'op': op, 'args': self.encode(list(args)),
+                  'kwargs': {k: self.encode(v) for k, v in (kwargs or {}).items()}}
+        if session:
+            record['session'] = session
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        self._fp.write(line)
+        self._fp.flush()
+        if self.metrics is not None:
+            self.metrics.add_bytes('journal', len(line.encode('utf-8')))
+        if self.sync:
+            os.fsync(self._fp.fileno())
+        self.pending += 1
+        return self.seq
+
+    def maybe_snapshot(self, machine) -> bool:
+        """
+        기록이 충분히 쌓인 경우 스냅샷을 만드는 메서드
+
+        Args:
+            machine (VendingMachine): 스냅샷을 만들 자판기 객체
+
+        Returns:
+            bool: 스냅샷을 만들었는지 여부
+        """
+        if self.pending < self.snapshot_every:
+            return False
+        self.snapshot(machine)
+        return True
+
+    def snapshot(self, machine) -> None:
+        """
+        자판기의 현재 상태를 스냅샷 파일에 저장하고 저널 파일을 비우는 메서드
+
+        스냅샷에는 마지막 저널 번호가 함께 저장되므로, 저널을 비우기 전에 종료되어도 중복 재실행되지 않습니다.
+
+        Args:
+            machine (VendingMachine): 스냅샷을 만들 자판기 객체
+        """
+        state = machine.state
+        state['seq'] = self.seq
+        atomic_write_json(self.snapshot_file, state)
+        if self.metrics is not None:
+            self.metrics.add_bytes('snapshot', os.path.getsize(self.snapshot_file))
+        if self._fp is not None:
+            self._fp.close()
+        self._fp = open(self.file, 'w', encoding='utf-8')   # 스냅샷에 반영된 저널 삭제
+        self.pending = 0
+
+    def records(self):
+        """
+        저널 파일의 기록을 순서대로 반환하는 제너레이터
+
+        기록 도중 종료되어 마지막 줄이 잘린 경우 해당 줄은 무시합니다.
+
+        Yields:
+            dict: 저널 기록
+        """
+        if not os.path.exists(self.file):
+            return
+        with open(self.file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    break
+
+    def recover(self, machine) -> int:
+        """
+        스냅샷을 불러온 뒤 이후의 저널 기록을 재실행하여 자판기의 상태를 복구하는 메서드
+
+        Args:
+            machine (VendingMachine): 복구할 자판기 객체
+
+        Returns:
+            int: 재실행한 저널 기록 개수
+        """
+        replayed = 0
+        self.busy = True
+        try:
+            if os.path.exists(self.snapshot_file):
+                with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+                machine.load_state(state)
+                self.seq = state.get('seq', 0)
+            for record in self.records():
+                if record['seq'] <= self.seq:   # 이미 스냅샷에 반영된 기록
+                    continue
+                args = self.decode(record['args'], machine)
+                kwargs = {k: self.decode(v, machine) for k, v in record['kwargs'].items()}
+                try:
+                    with machine.use_session(record.get('session', 0)):   # 기록한 세션에서 재실행
+                        getattr(machine, record['op'])(*args, **kwargs)
+                except (ValueError, AssertionError):
+                    pass   # 처음 실행할 때도 실패했던 기록
+                self.seq = record['seq']
+                replayed += 1
+        finally:
+            self.busy = False
+        self.snapshot(machine)   # 복구한 상태로 저널을 정리
+        return replayed
+
+    def close(self) -> None:
+        """
+        저널 파일을 닫는 메서드
+        """
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
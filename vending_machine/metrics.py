@@ -0,0 +1,231 @@
+import cProfile
+import functools
+import io
+import pstats
+import threading
+import time
+import tracemalloc
+from .storage import atomic_write_json
+
+__all__ = ['Metrics', 'timed']
+
+
+def timed(method):
+    """
+    메서드의 실행 횟수와 소요 시간을 객체의 metrics에 기록하는 데코레이터
+
+    metrics 속성이 없거나 None인 객체에서는 아무것도 기록하지 않습니다.
+
+    Args:
+        method (function): 시간을 측정할 메서드
+
+    Returns:
+        function: 시간 측정이 추가된 메서드
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(obj, *args, **kwargs):
+        metrics: Metrics = getattr(obj, 'metrics', None)
+        if metrics is None:
+            return method(obj, *args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return method(obj, *args, **kwargs)
+        except BaseException:
+            metrics.count(name + '.error')
+            raise
+        finally:
+            metrics.observe(name, time.perf_counter() - start)
+    return wrapper
+
+
+class Metrics():
+    BUCKETS = 32   # 지연 시간 히스토그램 구간 개수 (마이크로초 단위 2의 거듭제곱 구간)
+
+    def __init__(self, dump_file: str = None, dump_interval: float = 60.0) -> None:
+        """
+        자판기 동작의 횟수, 지연 시간 히스토그램, 기록한 바이트 수를 모으는 클래스
+
+        리포트 스레드에서도 기록하므로 모든 갱신은 잠금 안에서 이루어집니다.
+
+        Args:
+            dump_file (str, optional): 주기적으로 지표를 저장할 JSON 파일명. Defaults to None (저장하지 않음).
+            dump_interval (float, optional): 지표를 저장할 최소 시간 간격(초). Defaults to 60.0.
+        """
+        self.dump_file: str = dump_file
+        self.dump_interval: float = dump_interval
+        self.counters: dict[str, int] = {}                   # 이름별 횟수
+        self.histograms: dict[str, list[int]] = {}           # 이름별 구간별 횟수 (i번째 구간: 2^(i-1) ~ 2^i 마이크로초)
+        self.totals: dict[str, float] = {}                   # 이름별 전체 소요 시간(초)
+        self.maxima: dict[str, float] = {}                   # 이름별 최대 소요 시간(초)
+        self.bytes_written: dict[str, int] = {}              # 대상별 기록한 바이트 수
+        self.started: float = time.time()
+        self.last_dump: float = time.monotonic()
+        self._lock = threading.Lock()
+        self._profiler: cProfile.Profile = None
+
+    def count(self, name: str, n: int = 1) -> None:
+        """
+        이름별 횟수를 n만큼 증가시키는 메서드
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name: str, seconds: float) -> None:
+        """
+        소요 시간을 히스토그램에 기록하는 메서드
+
+        Args:
+            name (str): 동작 이름
+            seconds (float): 소요 시간(초)
+        """
+        bucket = min(int(seconds * 1e6).bit_length(), self.BUCKETS - 1)
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = [0] * self.BUCKETS
+            histogram[bucket] += 1
+            self.totals[name] = self.totals.get(name, 0.0) + seconds
+            if seconds > self.maxima.get(name, 0.0):
+                self.maxima[name] = seconds
+
+    def add_bytes(self, target: str, n: int) -> None:
+        """
+        대상(예: 'products', 'report')에 기록한 바이트 수를 더하는 메서드
+        """
+        with self._lock:
+            self.bytes_written[target] = self.bytes_written.get(target, 0) + n
+
+    @staticmethod
+    def percentile(histogram: list[int], q: float) -> float:
+        """
+        히스토그램에서 백분위 값을 구간의 상한으로 추정하는 메서드
+
+        Args:
+            histogram (list): 구간별 횟수
+            q (float): 백분위 (0 ~ 1)
+
+        Returns:
+            float: 추정한 소요 시간(초)
+        """
+        target = q * sum(histogram)
+        seen = 0
+        for i, n in enumerate(histogram):
+            seen += n
+            if n and seen >= target:
+                return (1 << i) / 1e6
+        return 0.0
+
+    def snapshot(self) -> dict:
+        """
+        현재까지 모은 지표를 JSON으로 저장할 수 있는 딕셔너리로 반환하는 메서드
+
+        Returns:
+            dict: {'started', 'uptime', 'counters', 'latency', 'bytes_written'}
+        """
+        with self._lock:
+            latency = {}
+            for name, histogram in self.histograms.items():
+                calls = sum(histogram)
+                latency[name] = {
+                    'count': calls,
+                    'mean': self.totals[name] / calls,
+                    'p50': self.percentile(histogram, 0.5),
+                    'p99': self.percentile(histogram, 0.99),
+                    'max': self.maxima[name],
+                    'histogram': {f'<{1 << i}us': n for i, n in enumerate(histogram) if n},
+                }
+            return {'started': self.started, 'uptime': time.time() - self.started,
+                    'counters': dict(self.counters), 'latency': latency, 'bytes_written': dict(self.bytes_written)}
+
+    def summary(self) -> str:
+        """
+        지표를 관리자 모드에 표시할 문자열로 반환하는 메서드
+        """
+        data = self.snapshot()
+        output = f'동작 지표 (가동 {data["uptime"] / 60:.1f}분)\n\n'
+        for name, stat in sorted(data['latency'].items()):
+            output += (f'    {name} : {stat["count"]}회, 평균 {stat["mean"] * 1e3:.3f}ms, '
+                       f'p99 {stat["p99"] * 1e3:.3f}ms, 최대 {stat["max"] * 1e3:.3f}ms\n')
+        for name, n in sorted(data['counters'].items()):
+            output += f'    {name} : {n}회\n'
+        for target, n in sorted(data['bytes_written'].items()):
+            output += f'    {target} 기록 : {n}바이트\n'
+        return output
+
+    def reset(self) -> None:
+        """
+        모은 지표를 모두 지우는 메서드
+        """
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.totals.clear()
+            self.maxima.clear()
+            self.bytes_written.clear()
+            self.started = time.time()
+
+    def dump(self, file: str = None) -> None:
+        """
+        지표를 JSON 파일에 저장하는 메서드
+
+        Args:
+            file (str, optional): 저장할 파일명. Defaults to dump_file.
+        """
+        atomic_write_json(file or self.dump_file, self.snapshot(), indent=2)
+        self.last_dump = time.monotonic()
+
+    def maybe_dump(self) -> bool:
+        """
+        저장할 파일이 지정되어 있고 저장 간격이 지난 경우 지표를 저장하는 메서드
+
+        Returns:
+            bool: 저장했는지 여부
+        """
+        if self.dump_file is None or time.monotonic() - self.last_dump < self.dump_interval:
+            return False
+        self.dump()
+        return True
+
+    @property
+    def profiling(self) -> bool:
+        """
+        프로파일링 중인지 여부를 반환하는 프로퍼티
+        """
+        return self._profiler is not None
+
+    def start_profile(self) -> None:
+        """
+        현재 스레드의 함수 호출(cProfile)과 메모리 할당(tracemalloc) 기록을 시작하는 메서드
+        """
+        if self._profiler is not None:
+            return
+        tracemalloc.start()
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+
+    def stop_profile(self, file: str = None, limit: int = 20) -> str:
+        """
+        프로파일링을 종료하고 결과를 반환하는 메서드
+
+        Args:
+            file (str, optional): cProfile 결과를 저장할 파일명 (pstats 형식). Defaults to None (저장하지 않음).
+            limit (int, optional): 결과에 표시할 함수와 메모리 할당 위치 개수. Defaults to 20.
+
+        Returns:
+            str: 누적 시간 순 함수 목록과 메모리 할당이 많은 위치
+        """
+        if self._profiler is None:
+            return ''
+        profiler, self._profiler = self._profiler, None
+        profiler.disable()
+        memory = tracemalloc.take_snapshot().statistics('lineno')
+        tracemalloc.stop()
+        if file:
+            profiler.dump_stats(file)
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(limit)
+        output = stream.getvalue()
+        output += '\n메모리 할당 위치\n' + ''.join(f'    {stat}\n' for stat in memory[:limit])
+        return output
@@ -0,0 +1,124 @@
+from .product import Product
+
+__all__ = ['ThresholdMonitor']
+
+
+class ThresholdMonitor():
+    def __init__(self, reporter: 'IssueReporter', product_threshold: int = 5, change_threshold: int = 5,
+                 warning_threshold: int = 7, watched_money: tuple = (100, 500)) -> None:
+        """
+        상품 재고와 거스름돈 개수가 바뀔 때마다 기준을 넘나드는지 확인하여 이슈를 알리는 클래스
+
+        전체 상품을 주기적으로 확인하는 대신, 값이 바뀐 상품이나 화폐 단위만 확인합니다.
+
+        Args:
+            reporter (IssueReporter): 이슈를 기록할 객체
+            product_threshold (int, optional): 재고 부족으로 기록할 기본 재고 기준 (미만). Defaults to 5.
+            change_threshold (int, optional): 거스름돈 부족으로 기록할 기본 개수 기준 (미만). Defaults to 5.
+            warning_threshold (int, optional): 관리자 모드에서 경고로 표시할 기준 (미만). Defaults to 7.
+            watched_money (tuple, optional): 부족 여부를 확인할 화폐 단위. Defaults to (100, 500).
+        """
+        self.reporter: 'IssueReporter' = reporter
+        self.product_threshold: int = product_threshold
+        self.change_threshold: int = change_threshold
+        self.warning_threshold: int = warning_threshold
+        self.watched_money: tuple = watched_money
+        self.product_thresholds: dict[int, int] = {}   # 상품 ID별 재고 기준
+        self.change_thresholds: dict[int, int] = {}    # 화폐 단위별 개수 기준
+        self.warn_products: set[Product] = set()       # 경고 기준 미만인 상품들
+        self.warn_change: set[int] = set()             # 경고 기준 미만인 화폐 단위들
+
+    def threshold_of(self, product: Product) -> int:
+        """
+        상품의 재고 부족 기준을 반환하는 메서드
+        """
+        return self.product_thresholds.get(product.id, self.product_threshold)
+
+    def set_product_threshold(self, product: Product, threshold: int) -> None:
+        """
+        상품별 재고 부족 기준을 설정하고 해당 상품만 다시 확인하는 메서드
+
+        Args:
+            product (Product): 기준을 설정할 상품
+            threshold (int): 재고 부족 기준 (미만)
+        """
+        self.product_thresholds[product.id] = threshold
+        self.product_added(product)
+
+    def set_change_threshold(self, money: int, threshold: int, count: int) -> None:
+        """
+        화폐 단위별 거스름돈 부족 기준을 설정하고 해당 화폐 단위만 다시 확인하는 메서드
+
+        Args:
+            money (int): 화폐 단위
+            threshold (int): 거스름돈 부족 기준 (미만)
+            count (int): 현재 보관함에 있는 개수
+        """
+        self.change_thresholds[money] = threshold
+        self.change_changed(money, None, count)
+
+    def product_added(self, product: Product) -> None:
+        """
+        상품이 등록되었을 때 현재 재고로 이슈를 확인하는 메서드
+        """
+        self.product_changed(product, 'count', None, product.count)
+
+    def product_removed(self, product: Product) -> None:
+        """
+        상품이 삭제되었을 때 관련 이슈를 해소 처리하는 메서드
+        """
+        self.warn_products.discard(product)
+        self.reporter.resolve('Less_product', product)
+        self.reporter.resolve('No_product', product)
+
+    def product_changed(self, product: Product, field: str, old, new) -> None:
+        """
+        상품의 재고가 바뀌었을 때 기준을 넘나들었는지 확인하는 메서드
+
+        Args:
+            product (Product): 재고가 바뀐 상품
+            field (str): 바뀐 속성 이름. 'count'가 아니면 무시합니다.
+            old (int): 바뀌기 전의 재고 (처음 확인하는 경우 None)
+            new (int): 바뀐 후의 재고
+        """
+        if field != 'count':
+            return
+        threshold = self.threshold_of(product)
+        if old is None or (old < threshold) != (new < threshold):
+            if new < threshold:
+                self.reporter.report('Less_product', product)
+            else:
+                self.reporter.resolve('Less_product', product)
+        if old is None or (old < 1) != (new < 1):
+            if new < 1:
+                self.reporter.report('No_product', product)
+            else:
+                self.reporter.resolve('No_product', product)
+        if new < self.warning_threshold:
+            self.warn_products.add(product)
+        else:
+            self.warn_products.discard(product)
+
+    def change_changed(self, money: int, old, new: int) -> None:
+        """
+        거스름돈 개수가 바뀌었을 때 기준을 넘나들었는지 확인하는 메서드
+
+        거스름돈이 늘어나 기준 이상이 되면, 거스름돈 계산 실패로 기록된 이슈도 함께 해소합니다.
+
+        Args:
+            money (int): 화폐 단위
+            old (int): 바뀌기 전의 개수 (처음 확인하는 경우 None)
+            new (int): 바뀐 후의 개수
+        """
+        if money not in self.watched_money:
+            return
+        threshold = self.change_thresholds.get(money, self.change_threshold)
+        if new < threshold:
+            if old is None or old >= threshold:
+                self.reporter.report('No_change', money)
+        elif old is None or new > old:
+            self.reporter.resolve('No_change', money)
+        if new < self.warning_threshold:
+            self.warn_change.add(money)
+        else:
+            self.warn_change.discard(money)
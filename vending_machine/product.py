@@ -4,6 +4,9 @@ from .textformatter import TextFormatter
 __all__ = ['Product']
 
 class Product():
+    # 상품이 많은 카탈로그에서 상품마다 __dict__를 만들지 않도록 속성을 고정
+    __slots__ = ('observer', '_padded_name', '_rows', 'id', '_name', '_price', '_count', 'product_type')
+
     def __init__(self, ID: int, name: str, price: int, count: int = 0, product_type: str = None) -> None:
         """
         상품 객체를 초기화하는 메서드입니다.
@@ -15,12 +18,65 @@ class Product():
             count (int, optional): 상품 수량. 기본값은 0.
             product_type (str, optional): 상품 종류. 기본값은 None.
         """
+        self.observer = None            # 상품의 변경을 통지받을 객체 (예: Catalog)
+        self._padded_name: str = None   # 화면 폭에 맞춰 공백을 채운 이름 (이름이 바뀌면 다시 계산)
+        self._rows: dict[str, tuple] = None   # 표시 상태별 (ID, 가격, 재고, 출력 문자열). 처음 출력할 때 생성
         self.id: int = ID
-        self.name: str = name
-        self.price: int = price
-        self.count: int = count
+        self._name: str = name
+        self._price: int = price
+        self._count: int = count
         self.product_type: str = product_type
 
+    def _notify(self, field: str, old, new) -> None:
+        """
+        상품의 속성이 바뀐 것을 observer에게 통지하는 메서드입니다.
+
+        Args:
+            field (str): 바뀐 속성 이름
+            old: 바뀌기 전의 값
+            new: 바뀐 후의 값
+        """
+        if self.observer is not None and old != new:
+            self.observer.product_changed(self, field, old, new)
+
+    @property
+    def name(self) -> str:
+        """
+        상품 이름을 반환하는 프로퍼티
+        """
+        return self._name
+
+    @name.setter
+    def name(self, value: str) -> None:
+        old, self._name = self._name, value
+        self._padded_name = None   # 캐시된 이름과 출력 문자열 무효화
+        self._rows = None
+        self._notify('name', old, value)
+
+    @property
+    def price(self) -> int:
+        """
+        상품 가격을 반환하는 프로퍼티
+        """
+        return self._price
+
+    @price.setter
+    def price(self, value: int) -> None:
+        old, self._price = self._price, value
+        self._notify('price', old, value)
+
+    @property
+    def count(self) -> int:
+        """
+        상품 수량을 반환하는 프로퍼티
+        """
+        return self._count
+
+    @count.setter
+    def count(self, value: int) -> None:
+        old, self._count = self._count, value
+        self._notify('count', old, value)
+
     
     def __int__(self) -> int:
         """
@@ -53,9 +109,20 @@ class Product():
             'count': self.count,
         }
     
+    @property
+    def padded_name(self) -> str:
+        """
+        화면 폭에 맞춰 공백을 채운 상품 이름을 반환하는 프로퍼티. 이름이 바뀌기 전까지 다시 계산하지 않습니다.
+        """
+        if self._padded_name is None:
+            self._padded_name = TextFormatter.fill_str_with_space(self.name)
+        return self._padded_name
+
     def product_info(self, VM : 'VendingMachine' = None, check_money: bool = True, manage_mod: bool = False) -> str:
         """
         상품의 정보를 문자열로 반환하는 메서드입니다.
+
+        같은 상태(ID, 가격, 재고, 표시 상태)로 다시 호출되면 이전에 만든 문자열을 그대로 반환합니다.
         
         args:
             VM (VendingMachine): 자판기 객체
@@ -65,11 +132,28 @@ class Product():
         returns:
             str: 상품의 정보
         """
-        prod_name = TextFormatter.fill_str_with_space(self.name)
         if manage_mod: # 관리자 모드인 경우
-            return f'{self.id:>2d}. {prod_name} : {self.price:>5}원, {self.count:>3d}개'
+            state = 'manage'
         elif self.is_empty: # 상품이 품절된 경우
-            return TextFormatter.textColor(f'{self.id:>2d}. {prod_name} : {"품절":>5}', 'red') # 품절 표시를 빨간색으로 표시
-        elif not VM.is_sellable(self) and check_money: # 잔돈 부족인 경우
-            return TextFormatter.textColor(f'{self.id:>2d}. {prod_name} : {"잔돈 부족":>5}', 'red') # 잔돈 부족 표시를 빨간색으로 표시
-        return f'{self.id:>2d}. {prod_name} : {self.price:>5}원' 
+            state = 'empty'
+        elif check_money and not VM.is_sellable(self): # 잔돈 부족인 경우
+            state = 'no_change'
+        else:
+            state = 'normal'
+        if self._rows is None:
+            self._rows = {}
+        cached = self._rows.get(state)
+        if cached is not None and cached[:3] == (self.id, self.price, self.count):
+            return cached[3]   # 상태가 같으면 캐시된 문자열 사용
+
+        prod_name = self.padded_name
+        if state == 'manage':
+            row = f'{self.id:>2d}. {prod_name} : {self.price:>5}원, {self.count:>3d}개'
+        elif state == 'empty':
+            row = TextFormatter.textColor(f'{self.id:>2d}. {prod_name} : {"품절":>5}', 'red') # 품절 표시를 빨간색으로 표시
+        elif state == 'no_change':
+            row = TextFormatter.textColor(f'{self.id:>2d}. {prod_name} : {"잔돈 부족":>5}', 'red') # 잔돈 부족 표시를 빨간색으로 표시
+        else:
+            row = f'{self.id:>2d}. {prod_name} : {self.price:>5}원'
+        self._rows[state] = (self.id, self.price, self.count, row)
+        return row
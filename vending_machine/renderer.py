@@ -0,0 +1,99 @@
+import os
+import re
+import shutil
+import sys
+from .textformatter import TextFormatter
+from .metrics import timed
+
+__all__ = ['ScreenRenderer']
+
+
+class ScreenRenderer():
+    CLEAR = '\033[2J\033[H'                           # 화면 전체를 지우고 커서를 맨 위로 이동
+    ANSI_PATTERN = re.compile(r'\033\[[0-9;]*[A-Za-z]')  # 화면 폭 계산에서 제외할 ANSI 코드
+
+    def __init__(self, stream=None) -> None:
+        """
+        ANSI 코드로 화면을 그리는 클래스. 이전 화면과 달라진 줄만 다시 씁니다.
+
+        화면을 지우기 위해 외부 명령(clear, cls)을 실행하지 않으며, 한 화면은 한 번의 write로 출력됩니다.
+
+        Args:
+            stream (file, optional): 출력할 스트림. Defaults to sys.stdout.
+        """
+        self.stream = stream or sys.stdout
+        self.previous: list[str] = None   # 이전 화면의 줄들 (None이면 다음 화면을 전부 다시 그림)
+        self.metrics = None               # 화면 출력 시간과 바이트 수를 기록할 Metrics 객체
+        if os.name == 'nt':
+            os.system('')   # Windows 콘솔에서 ANSI 코드 처리를 켜기 위해 시작할 때 한 번만 실행
+
+    def invalidate(self) -> None:
+        """
+        화면이 다른 출력으로 바뀌었음을 알리는 메서드. 다음 화면은 전부 다시 그립니다.
+        """
+        self.previous = None
+
+    def clear(self) -> None:
+        """
+        화면을 지우는 메서드
+        """
+        self.stream.write(self.CLEAR)
+        self.stream.flush()
+        self.previous = None
+
+    def fits(self, lines: list[str]) -> bool:
+        """
+        화면이 터미널 크기 안에 들어가는지 확인하는 메서드
+
+        넘치는 경우 터미널이 스크롤되어 줄 위치로 이동할 수 없으므로 화면 전체를 다시 그려야 합니다.
+
+        Args:
+            lines (list): 화면의 줄들
+
+        Returns:
+            bool: 터미널 크기 안에 들어가는지 여부
+        """
+        columns, rows = shutil.get_terminal_size()
+        if len(lines) >= rows:
+            return False
+        for line in lines:
+            if len(line) * 2 > columns:   # 폭이 넓은 글자만으로도 넘치지 않는 줄은 계산하지 않음
+                if TextFormatter.display_width(self.ANSI_PATTERN.sub('', line)) > columns:
+                    return False
+        return True
+
+    @timed
+    def render(self, text: str) -> int:
+        """
+        화면을 그리는 메서드. 이전 화면과 달라진 줄만 다시 쓰고, 커서를 마지막 줄 끝에 둡니다.
+
+        마지막 줄은 입력 프롬프트가 출력되는 줄이므로 항상 다시 쓰며, 그 아래에 남은 이전 화면과 입력 내용은 지웁니다.
+
+        Args:
+            text (str): 화면에 출력할 문자열
+
+        Returns:
+            int: 다시 쓴 줄의 개수
+        """
+        lines = text.split('\n')
+        body, last = lines[:-1], lines[-1]
+        buffer = []
+        if self.previous is None or not self.fits(lines):
+            buffer.append(self.CLEAR)
+            buffer.append('\n'.join(lines))
+            written = len(lines)
+        else:
+            written = 1
+            for i, line in enumerate(body):
+                if i >= len(self.previous) or self.previous[i] != line:
+                    buffer.append(f'\033[{i + 1};1H{line}\033[K')   # i+1번째 줄로 이동하여 다시 쓰고 줄 끝까지 지움
+                    written += 1
+            buffer.append(f'\033[{len(lines)};1H{last}')
+        buffer.append('\033[J')   # 커서 아래의 이전 내용 지우기
+        data = ''.join(buffer)
+        self.stream.write(data)
+        self.stream.flush()
+        if self.metrics is not None:
+            self.metrics.add_bytes('screen', len(data.encode('utf-8', 'replace')))
+        self.previous = body
+        return written
@@ -0,0 +1,207 @@
+import atexit
+import datetime
+import os
+import queue
+import threading
+
+__all__ = ['IssueReporter']
+
+
+class IssueReporter():
+    # 이슈 타입별 (발생, 해소) 메시지. {on}은 상품이면 "ID. 이름", 화폐면 금액으로 채워집니다.
+    messages: dict[str, tuple[str, str]] = {
+        'No_product': ('{on} 상품의 재고가 없습니다.', '{on} 상품이 재입고되었습니다.'),
+        'Less_product': ('{on} 상품의 재고가 부족합니다.', '{on} 상품의 재고 부족이 해소되었습니다.'),
+        'No_change': ('{on}원이 부족합니다.', '{on}원 부족이 해소되었습니다.'),
+    }
+
+    def __init__(self, file: str, store: 'ReportStore' = None, flush_interval: float = 1.0, batch_size: int = 256,
+                 max_bytes: int = 1024 * 1024, backup_count: int = 3) -> None:
+        """
+        자판기 이슈를 메모리 큐에 모아 백그라운드 스레드에서 리포트 파일에 기록하는 클래스
+
+        같은 이슈는 발생했을 때와 해소되었을 때 한 번씩만 기록되며, 호출한 스레드는 파일에 접근하지 않습니다.
+
+        Args:
+            file (str): 리포트 파일명
+            store (ReportStore, optional): 이슈를 구조화하여 함께 저장할 저장소. Defaults to None.
+            flush_interval (float, optional): 큐에 쌓인 이슈를 파일에 기록하는 최대 간격(초). Defaults to 1.0.
+            batch_size (int, optional): 한 번에 기록할 최대 이슈 개수. Defaults to 256.
+            max_bytes (int, optional): 리포트 파일을 교체할 크기(바이트). Defaults to 1MB.
+            backup_count (int, optional): 보관할 이전 리포트 파일 개수 (report.txt.1, report.txt.2, ...). Defaults to 3.
+        """
+        self.file: str = file
+        self.store: 'ReportStore' = store
+        self.flush_interval: float = flush_interval
+        self.batch_size: int = batch_size
+        self.max_bytes: int = max_bytes
+        self.backup_count: int = backup_count
+        self.active: dict[tuple, str] = store.open_issues() if store else {}   # 현재 발생 중인 이슈 (이슈 타입, key) -> 표시 문자열
+        self.queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread = None
+        self._lock = threading.Lock()
+        self.metrics = None   # 기록한 이슈 개수와 바이트 수를 더할 Metrics 객체
+
+    @staticmethod
+    def issue_key(issue_type: str, issue_on) -> tuple[tuple, str]:
+        """
+        이슈를 구분하는 key와 리포트에 표시할 문자열을 반환하는 메서드
+
+        Args:
+            issue_type (str): 이슈 타입
+            issue_on (Product or int): 이슈가 발생한 상품 혹은 금액
+
+        Returns:
+            tuple: ((이슈 타입, 상품 ID 혹은 금액), 표시 문자열)
+        """
+        if hasattr(issue_on, 'id'):   # 상품인 경우
+            return (issue_type, issue_on.id), f'{issue_on.id}. {issue_on.name}'
+        return (issue_type, int(issue_on)), str(issue_on)
+
+    def report(self, issue_type: str, issue_on) -> bool:
+        """
+        이슈가 새로 발생한 경우에만 기록을 예약하는 메서드
+
+        Args:
+            issue_type (str): 이슈 타입
+            issue_on (Product or int): 이슈가 발생한 상품 혹은 금액
+
+        Returns:
+            bool: 새로 발생한 이슈인지 여부
+        """
+        key, label = self.issue_key(issue_type, issue_on)
+        if key in self.active:
+            return False
+        self.active[key] = label
+        self._put(('start', issue_type, key[1], label))
+        return True
+
+    def resolve(self, issue_type: str, issue_on) -> bool:
+        """
+        발생 중이던 이슈가 해소된 경우에만 기록을 예약하는 메서드
+
+        Args:
+            issue_type (str): 이슈 타입
+            issue_on (Product or int): 이슈가 해소된 상품 혹은 금액
+
+        Returns:
+            bool: 발생 중이던 이슈였는지 여부
+        """
+        key, label = self.issue_key(issue_type, issue_on)
+        if key not in self.active:
+            return False
+        del self.active[key]
+        self._put(('end', issue_type, key[1], label))
+        return True
+
+    def is_active(self, issue_type: str, issue_on) -> bool:
+        """
+        이슈가 발생 중인지 확인하는 메서드
+        """
+        return self.issue_key(issue_type, issue_on)[0] in self.active
+
+    def _put(self, event: tuple) -> None:
+        if self._thread is None:
+            self._start()
+        self.queue.put((datetime.datetime.now(),) + event)
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='IssueReporter', daemon=True)
+                self._thread.start()
+                atexit.register(self.close)   # 종료할 때 남은 이슈를 기록
+
+    def _run(self) -> None:
+        """
+        큐에서 이슈를 모아 파일에 기록하는 백그라운드 스레드 함수입니다.
+        """
+        running = True
+        while running:
+            batch = []
+            try:
+                batch.append(self.queue.get(timeout=self.flush_interval))
+                while len(batch) < self.batch_size:
+                    batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                pass
+            if None in batch:   # 종료 신호
+                running = False
+            events = [event for event in batch if event is not None]
+            if events:
+                self.write(events)
+            for _ in batch:
+                self.queue.task_done()
+
+    def format(self, event: tuple) -> str:
+        """
+        이슈 이벤트를 리포트 파일의 한 줄로 변환하는 메서드
+
+        Args:
+            event (tuple): (시간, 'start' 혹은 'end', 이슈 타입, key, 표시 문자열)
+
+        Returns:
+            str: 리포트 한 줄
+        """
+        time, kind, issue_type, _, label = event
+        start_msg, end_msg = self.messages[issue_type]
+        msg = (start_msg if kind == 'start' else end_msg).format(on=label)
+        return f"[{time.strftime('%Y/%m/%d-%H:%M:%S')}] {msg}\n"
+
+    def write(self, events: list[tuple]) -> None:
+        """
+        이슈 이벤트들을 리포트 파일과 저장소에 한 번에 기록하는 메서드
+
+        Args:
+            events (list): 기록할 이슈 이벤트 리스트
+        """
+        data = ''.join(self.format(event) for event in events).encode('utf-8')
+        self.rotate(len(data))
+        with open(self.file, 'ab') as f:
+            f.write(data)
+        if self.metrics is not None:
+            self.metrics.count('report.events', len(events))
+            self.metrics.add_bytes('report', len(data))
+        if self.store is not None:
+            self.store.record(events)
+
+    def rotate(self, incoming: int = 0) -> bool:
+        """
+        리포트 파일이 최대 크기를 넘게 되는 경우 이전 파일로 옮기는 메서드
+
+        Args:
+            incoming (int, optional): 새로 기록할 바이트 수. Defaults to 0.
+
+        Returns:
+            bool: 파일을 교체했는지 여부
+        """
+        if not self.max_bytes or not os.path.exists(self.file):
+            return False
+        if os.path.getsize(self.file) + incoming <= self.max_bytes:
+            return False
+        for i in range(self.backup_count - 1, 0, -1):   # report.txt.1 -> report.txt.2 ...
+            src = f'{self.file}.{i}'
+            if os.path.exists(src):
+                os.replace(src, f'{self.file}.{i + 1}')
+        if self.backup_count > 0:
+            os.replace(self.file, f'{self.file}.1')
+        else:
+            os.remove(self.file)
+        return True
+
+    def flush(self) -> None:
+        """
+        큐에 쌓인 이슈가 모두 파일에 기록될 때까지 기다리는 메서드
+        """
+        if self._thread is not None:
+            self.queue.join()
+
+    def close(self) -> None:
+        """
+        남은 이슈를 모두 기록하고 백그라운드 스레드를 종료하는 메서드
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self.queue.put(None)
+            thread.join()
@@ -0,0 +1,171 @@
+import sqlite3
+import threading
+import time
+
+__all__ = ['ReportStore']
+
+
+class ReportStore():
+    schema = """
+        CREATE TABLE IF NOT EXISTS issues (
+            id INTEGER PRIMARY KEY,
+            issue_type TEXT NOT NULL,
+            issue_key INTEGER NOT NULL,
+            label TEXT,
+            started REAL NOT NULL,
+            ended REAL
+        );
+        CREATE INDEX IF NOT EXISTS issues_started ON issues (started);
+        CREATE INDEX IF NOT EXISTS issues_type_started ON issues (issue_type, started);
+        CREATE INDEX IF NOT EXISTS issues_type_key ON issues (issue_type, issue_key, ended);
+    """
+
+    prune_interval: float = 86400   # 오래된 이슈를 정리하는 간격(초)
+
+    def __init__(self, file: str = ':memory:', retention_days: float = 90) -> None:
+        """
+        자판기 이슈를 발생/해소 시각과 함께 SQLite 데이터베이스에 저장하고 집계하는 클래스
+
+        issue_key는 상품 이슈이면 상품 ID, 거스름돈 이슈이면 화폐 단위입니다.
+        열 때와 이후 기록할 때 하루에 한 번씩, 해소된 지 보관 기간이 지난 이슈를 삭제합니다.
+
+        Args:
+            file (str, optional): 데이터베이스 파일명. Defaults to ':memory:'.
+            retention_days (float, optional): 해소된 이슈를 보관할 일 수. 0이나 None이면 삭제하지 않습니다. Defaults to 90.
+        """
+        self.file: str = file
+        self.retention_days: float = retention_days
+        self._pruned: float = 0.0   # 마지막으로 오래된 이슈를 정리한 시각
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(file, check_same_thread=False)   # 리포트 스레드와 관리자 모드에서 함께 사용
+        self._conn.executescript(self.schema)
+        self.maybe_prune()
+
+    def record(self, events: list[tuple]) -> None:
+        """
+        IssueReporter의 이슈 이벤트들을 한 트랜잭션으로 저장하는 메서드
+
+        Args:
+            events (list): (시간, 'start' 혹은 'end', 이슈 타입, key, 표시 문자열) 튜플 리스트
+        """
+        with self._lock, self._conn:
+            for when, kind, issue_type, key, label in events:
+                ts = when.timestamp()
+                open_row = self._conn.execute(
+                    'SELECT id FROM issues WHERE issue_type = ? AND issue_key = ? AND ended IS NULL',
+                    (issue_type, key)).fetchone()
+                if kind == 'start' and open_row is None:
+                    self._conn.execute(
+                        'INSERT INTO issues (issue_type, issue_key, label, started) VALUES (?, ?, ?, ?)',
+                        (issue_type, key, label, ts))
+                elif kind == 'end' and open_row is not None:
+                    self._conn.execute('UPDATE issues SET ended = ? WHERE id = ?', (ts, open_row[0]))
+        self.maybe_prune()   # 리포트 스레드에서 주기적으로 정리
+
+    def open_issues(self) -> dict[tuple, str]:
+        """
+        아직 해소되지 않은 이슈들을 반환하는 메서드
+
+        Returns:
+            dict: (이슈 타입, key)를 key로, 표시 문자열을 value로 가지는 딕셔너리
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT issue_type, issue_key, label FROM issues WHERE ended IS NULL').fetchall()
+        return {(issue_type, key): label for issue_type, key, label in rows}
+
+    def out_of_stock_time(self, since: float = None, until: float = None) -> list[tuple[int, str, float]]:
+        """
+        기간 동안 상품별로 품절 상태였던 시간을 집계하는 메서드
+
+        Args:
+            since (float, optional): 집계 시작 시각 (유닉스 시간). Defaults to None (처음부터).
+            until (float, optional): 집계 종료 시각 (유닉스 시간). Defaults to None (현재).
+
+        Returns:
+            list: 품절 시간이 긴 순서로 정렬된 (상품 ID, 표시 문자열, 품절 시간(초)) 리스트
+        """
+        since = since if since is not None else 0.0
+        until = until if until is not None else time.time()
+        with self._lock:
+            return self._conn.execute(
+                """SELECT issue_key, MAX(label),
+                          SUM(MIN(COALESCE(ended, :until), :until) - MAX(started, :since)) AS seconds
+                   FROM issues
+                   WHERE issue_type = 'No_product' AND started < :until AND COALESCE(ended, :until) > :since
+                   GROUP BY issue_key ORDER BY seconds DESC""",
+                {'since': since, 'until': until}).fetchall()
+
+    def change_shortage_by_day(self, since: float = None) -> list[tuple[str, int, int, float]]:
+        """
+        날짜별, 화폐 단위별로 거스름돈 부족 횟수와 시간을 집계하는 메서드
+
+        Args:
+            since (float, optional): 집계 시작 시각 (유닉스 시간). Defaults to None (처음부터).
+
+        Returns:
+            list: (날짜 'YYYY-MM-DD', 화폐 단위, 부족 발생 횟수, 부족 시간(초)) 리스트
+        """
+        now = time.time()
+        with self._lock:
+            return self._conn.execute(
+                """SELECT date(started, 'unixepoch', 'localtime') AS day, issue_key, COUNT(*),
+                          SUM(COALESCE(ended, :now) - started)
+                   FROM issues
+                   WHERE issue_type = 'No_change' AND started >= :since
+                   GROUP BY day, issue_key ORDER BY day, issue_key""",
+                {'since': since or 0.0, 'now': now}).fetchall()
+
+    def summary(self, days: int = 7) -> str:
+        """
+        최근 기간의 품절 시간과 거스름돈 부족 현황을 관리자 모드에 표시할 문자열로 반환하는 메서드
+
+        Args:
+            days (int, optional): 집계할 최근 일 수. Defaults to 7.
+
+        Returns:
+            str: 집계 결과 문자열
+        """
+        since = time.time() - days * 86400
+        output = f'최근 {days}일 리포트\n\n상품별 품절 시간\n'
+        stock_rows = self.out_of_stock_time(since=since)
+        output += ''.join(f'    {label} : {seconds / 60:.1f}분\n' for _, label, seconds in stock_rows) or '    없음\n'
+        output += '\n날짜별 거스름돈 부족\n'
+        change_rows = self.change_shortage_by_day(since=since)
+        output += ''.join(f'    {day} {money}원 : {count}회, {seconds / 60:.1f}분\n'
+                          for day, money, count, seconds in change_rows) or '    없음\n'
+        return output
+
+    def prune(self, days: float = None) -> int:
+        """
+        해소된 지 오래된 이슈를 삭제하는 메서드
+
+        Args:
+            days (float, optional): 보관할 일 수. Defaults to None (retention_days).
+
+        Returns:
+            int: 삭제된 이슈 개수
+        """
+        days = days if days is not None else self.retention_days
+        with self._lock, self._conn:
+            self._pruned = time.time()
+            return self._conn.execute('DELETE FROM issues WHERE ended < ?',
+                                      (self._pruned - days * 86400,)).rowcount
+
+    def maybe_prune(self) -> int:
+        """
+        보관 기간이 정해져 있고 마지막 정리 후 prune_interval이 지난 경우에만 오래된 이슈를 삭제하는 메서드
+
+        Returns:
+            int: 삭제된 이슈 개수
+        """
+        if not self.retention_days or time.time() - self._pruned < self.prune_interval:
+            return 0
+        return self.prune()
+
+    def close(self) -> None:
+        """
+        데이터베이스 연결을 닫는 메서드
+        """
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,149 @@
+import asyncio
+import hashlib
+import json
+import os
+from .vendingmachine import VendingMachine, Session
+from .commands import CommandProcessor
+
+__all__ = ['SessionServer']
+
+
+class ServerSession():
+    def __init__(self, machine: VendingMachine) -> None:
+        """
+        서버에 접속한 터미널 하나에 해당하는 자판기 세션과 명령 처리기를 담는 클래스
+
+        Args:
+            machine (VendingMachine): 명령을 실행할 자판기. 접속할 때 자판기에 새 세션을 엽니다.
+        """
+        self.session: Session = machine.open_session()   # 세션별 사용자 (지갑, 결제 수단, 투입 금액)
+        self.id: int = self.session.id
+        self.processor: CommandProcessor = CommandProcessor(machine, allow_manage=False)
+
+    def execute(self, line: str) -> dict:
+        """
+        자판기의 현재 세션을 이 세션으로 바꾼 상태에서 명령을 실행하는 메서드
+
+        다른 세션의 명령과 섞이지 않도록 자판기의 잠금을 잡은 채로 실행합니다.
+        """
+        with self.processor.machine.use_session(self.id):
+            return self.processor.execute(line)
+
+    def close(self) -> None:
+        """
+        자판기에서 세션을 닫는 메서드. 남은 투입 금액은 환불을 시도합니다.
+        """
+        self.processor.machine.close_session(self.id)
+
+
+class SessionServer():
+    def __init__(self, machine: VendingMachine, host: str = '127.0.0.1', port: int = 8765, path: str = None,
+                 password_file: str = None) -> None:
+        """
+        asyncio 스트림으로 여러 터미널의 명령을 받아 하나의 자판기에서 실행하는 서버 클래스
+
+        한 줄에 명령 하나를 받고(CommandProcessor와 같은 명령어), 결과를 JSON 한 줄로 돌려줍니다.
+        세션마다 사용자와 투입 금액을 따로 가지며, "login [비밀번호]"로 인증한 세션만 관리자 명령을 실행할 수 있습니다.
+        명령은 저널 동기화(fsync)나 상품 파일 저장으로 디스크를 기다릴 수 있으므로 asyncio.to_thread로 실행하여
+        다른 세션의 입출력을 막지 않습니다. 자판기 상태는 자판기의 잠금으로 한 번에 한 명령씩만 바뀝니다.
+
+        Args:
+            machine (VendingMachine): 명령을 실행할 자판기
+            host (str, optional): TCP 주소. Defaults to '127.0.0.1'.
+            port (int, optional): TCP 포트. 0이면 빈 포트를 사용합니다. Defaults to 8765.
+            path (str, optional): 지정하면 TCP 대신 이 경로의 Unix 소켓을 사용합니다. Defaults to None.
+            password_file (str, optional): 관리자 비밀번호 파일명. Defaults to 자판기 디렉터리의 'passwd.txt'.
+        """
+        self.machine: VendingMachine = machine
+        self.host: str = host
+        self.port: int = port
+        self.path: str = path
+        self.password_file: str = password_file or machine.path('passwd.txt')
+        self.sessions: dict[int, ServerSession] = {}   # 접속 중인 세션 번호 -> 세션
+        self._server: asyncio.AbstractServer = None
+
+    @property
+    def address(self):
+        """
+        서버가 실제로 사용 중인 주소 (TCP이면 (host, port), Unix 소켓이면 경로)
+        """
+        if self._server is None or not self._server.sockets:
+            return None
+        return self._server.sockets[0].getsockname()
+
+    def check_passwd(self, password: str) -> bool:
+        """
+        관리자 비밀번호를 확인하는 메서드. 비밀번호 파일이 없으면 관리자 로그인을 허용하지 않습니다.
+        """
+        if not os.path.exists(self.password_file):
+            return False
+        with open(self.password_file, 'r') as f:
+            return hashlib.sha256(password.encode('utf-8')).hexdigest() == f.read()
+
+    async def start(self) -> None:
+        """
+        서버를 시작하는 메서드
+        """
+        if self.path is not None:
+            self._server = await asyncio.start_unix_server(self.handle, path=self.path)
+        else:
+            self._server = await asyncio.start_server(self.handle, host=self.host, port=self.port)
+
+    async def serve_forever(self) -> None:
+        """
+        서버를 시작하고 종료될 때까지 접속을 받는 메서드
+        """
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """
+        새 접속을 받지 않고 서버를 닫는 메서드
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def execute(self, session: ServerSession, line: str) -> dict:
+        """
+        세션의 명령 한 줄을 실행하는 메서드. login/logout은 서버가 직접 처리합니다.
+        """
+        words = line.split(maxsplit=1)
+        if words and words[0] == 'login':
+            ok = len(words) == 2 and self.check_passwd(words[1])
+            session.processor.allow_manage = ok
+            return {'input': 'login', 'command': 'login', 'ok': ok}
+        if words and words[0] == 'logout':
+            session.processor.allow_manage = False
+            return {'input': line, 'command': 'logout', 'ok': True}
+        return session.execute(line)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        접속한 터미널 하나를 처리하는 코루틴. 연결이 끊기면 남은 투입 금액을 세션 사용자에게 돌려줍니다.
+        """
+        session = await asyncio.to_thread(ServerSession, self.machine)   # 세션을 여는 것도 저널에 기록됨
+        self.sessions[session.id] = session
+        try:
+            writer.write(json.dumps({'session': session.id}).encode('utf-8') + b'\n')
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                line = raw.decode('utf-8', 'replace').strip()
+                if not line:
+                    continue
+                result = await asyncio.to_thread(self.execute, session, line)
+                writer.write(json.dumps(result, ensure_ascii=False).encode('utf-8') + b'\n')
+                await writer.drain()
+                if result['command'] == 'exit':
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            del self.sessions[session.id]
+            await asyncio.to_thread(session.close)   # 거스름돈이 부족하면 투입 금액은 자판기에 남음
+            writer.close()
@@ -0,0 +1,224 @@
+import bisect
+import mmap
+import os
+import struct
+from .product import Product
+from .storage import atomic_write
+
+__all__ = ['CatalogSnapshot']
+
+
+class CatalogSnapshot():
+    MAGIC = b'VMCS'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHHIQQ')   # 매직, 버전, 플래그, 상품 수, 이름 표 위치, 이름 표 크기
+    RECORD = struct.Struct('<qqqII')     # ID, 가격, 재고, 이름 위치, 이름 길이 (바이트)
+    COUNT_OFFSET = 16                    # 레코드 안에서 재고의 위치
+    FLAGS_OFFSET = 6                     # 헤더 안에서 플래그의 위치
+    FLAG_PENDING = 1                     # 상품 파일에 아직 저장되지 않은 재고 변경이 있음
+
+    def __init__(self, file: str) -> None:
+        """
+        상품 목록을 고정 길이 레코드와 이름 표로 저장하는 바이너리 스냅샷 클래스
+
+        파일은 헤더, ID 순으로 정렬된 상품 레코드(32바이트), UTF-8 이름 표로 구성됩니다.
+        mmap으로 열어서 읽으므로 JSON을 해석하지 않고 상품을 만들 수 있고,
+        재고가 바뀌면 파일 전체를 다시 쓰지 않고 해당 레코드의 재고만 고쳐 쓰며, 상품 파일에 저장될 때까지
+        헤더에 FLAG_PENDING을 표시하여 비정상 종료 후에도 상품 파일을 다시 저장해야 함을 알 수 있게 합니다.
+        Catalog의 listener로 등록하면 상품의 재고 변경을 바로 반영하고, 나머지 변경은 stale로 표시합니다.
+
+        Args:
+            file (str): 스냅샷 파일명
+        """
+        self.file: str = file
+        self.stale: bool = True    # 파일을 다시 써야 하는 변경(추가, 삭제, 이름, 가격)이 있었는지 여부
+        self.size: int = 0         # 파일에 기록된 상품 수
+        self.pending: bool = False # 상품 파일에 아직 저장되지 않은 재고 변경이 파일에 있는지 여부
+        self._fp = None
+        self._map: mmap.mmap = None
+
+    @property
+    def is_open(self) -> bool:
+        """
+        스냅샷 파일이 열려 있는지 여부를 반환하는 프로퍼티
+        """
+        return self._map is not None
+
+    def is_fresh(self, source: str) -> bool:
+        """
+        스냅샷 파일이 있고 원본 상품 파일(source)보다 나중에 기록되었는지 확인하는 메서드
+        """
+        if not os.path.exists(self.file):
+            return False
+        return not os.path.exists(source) or os.path.getmtime(self.file) >= os.path.getmtime(source)
+
+    def open(self) -> int:
+        """
+        스냅샷 파일을 mmap으로 여는 메서드
+
+        Returns:
+            int: 파일에 기록된 상품 수
+
+        Raises:
+            ValueError: 스냅샷 형식이 아니거나 파일이 잘린 경우
+        """
+        self.close()
+        fp = open(self.file, 'r+b')
+        try:
+            data = mmap.mmap(fp.fileno(), 0)
+        except ValueError:   # 빈 파일
+            fp.close()
+            raise ValueError('Wrong snapshot')
+        if len(data) < self.HEADER.size:
+            data.close()
+            fp.close()
+            raise ValueError('Wrong snapshot')
+        magic, version, flags, size, names_offset, names_size = self.HEADER.unpack_from(data, 0)
+        if magic != self.MAGIC or version != self.VERSION or \
+                names_offset != self.HEADER.size + size * self.RECORD.size or names_offset + names_size > len(data):
+            data.close()
+            fp.close()
+            raise ValueError('Wrong snapshot')
+        self._fp, self._map, self.size = fp, data, size
+        self.pending = bool(flags & self.FLAG_PENDING)
+        self.stale = False
+        return size
+
+    def close(self) -> None:
+        """
+        스냅샷 파일을 닫는 메서드
+        """
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+            self._fp.close()
+            self._map, self._fp = None, None
+
+    def records(self):
+        """
+        파일에 기록된 상품 레코드를 ID 순으로 반환하는 제너레이터
+
+        Yields:
+            tuple: (ID, 이름, 가격, 재고)
+        """
+        names_offset = self.HEADER.size + self.size * self.RECORD.size
+        view = memoryview(self._map)
+        try:
+            names: dict[int, str] = {}   # 이름 위치 -> 이름 (같은 이름은 하나의 문자열을 공유)
+            for product_id, price, count, offset, length in self.RECORD.iter_unpack(view[self.HEADER.size:names_offset]):
+                name = names.get(offset)
+                if name is None:
+                    start = names_offset + offset
+                    name = names[offset] = str(view[start:start + length], 'utf-8')
+                yield product_id, name, price, count
+        finally:
+            view.release()
+
+    def products(self) -> list[Product]:
+        """
+        파일에 기록된 상품들로 상품 객체 리스트를 만드는 메서드
+
+        Returns:
+            list: ID 순으로 정렬된 상품 리스트
+        """
+        return [Product(ID=product_id, name=name, price=price, count=count)
+                for product_id, name, price, count in self.records()]
+
+    def write(self, products) -> None:
+        """
+        상품 목록으로 스냅샷 파일을 새로 쓰고 다시 여는 메서드
+
+        Args:
+            products (iterable): ID 순으로 정렬된 상품 객체들
+        """
+        products = list(products)
+        names: dict[str, tuple[int, int]] = {}   # 이름 -> (이름 표의 위치, 길이)
+        table = bytearray()
+        records = bytearray()
+        for product in products:
+            entry = names.get(product.name)
+            if entry is None:
+                encoded = product.name.encode('utf-8')
+                entry = names[product.name] = (len(table), len(encoded))
+                table += encoded
+            records += self.RECORD.pack(product.id, product.price, product.count, *entry)
+        header = self.HEADER.pack(self.MAGIC, self.VERSION, 0, len(products),
+                                  self.HEADER.size + len(records), len(table))
+        self.close()
+        with atomic_write(self.file, encoding=None, mode='wb') as f:
+            f.write(header)
+            f.write(records)
+            f.write(table)
+        self.open()
+
+    def touch(self) -> None:
+        """
+        상품 파일을 저장한 뒤 호출하여 재고 변경이 모두 저장되었음을 표시하고,
+        파일의 수정 시각을 현재 시각으로 바꾸어 원본 상품 파일보다 최신임을 표시하는 메서드
+        """
+        if self._map is not None:
+            self._set_pending(False)
+            self._map.flush()
+        os.utime(self.file)
+
+    def _set_pending(self, pending: bool) -> None:
+        if self.pending != pending:
+            struct.pack_into('<H', self._map, self.FLAGS_OFFSET, self.FLAG_PENDING if pending else 0)
+            self.pending = pending
+
+    def _index(self, product_id: int) -> int:
+        """
+        상품 ID의 레코드 번호를 이진 탐색으로 찾는 메서드입니다. 없으면 -1을 반환합니다.
+        """
+        ids = _RecordIds(self)
+        i = bisect.bisect_left(ids, product_id)
+        return i if i < self.size and ids[i] == product_id else -1
+
+    def set_count(self, product_id: int, count: int) -> bool:
+        """
+        파일에 기록된 상품의 재고를 그 자리에서 고쳐 쓰는 메서드
+
+        Args:
+            product_id (int): 상품 ID
+            count (int): 새 재고
+
+        Returns:
+            bool: 고쳐 썼는지 여부. 파일에 없는 상품이면 False
+        """
+        if self._map is None:
+            return False
+        i = self._index(product_id)
+        if i < 0:
+            return False
+        self._set_pending(True)   # 재고보다 먼저 표시하여, 표시 없이 재고만 바뀐 상태가 남지 않게 함
+        struct.pack_into('<q', self._map, self.HEADER.size + i * self.RECORD.size + self.COUNT_OFFSET, count)
+        return True
+
+    def product_added(self, product: Product) -> None:
+        self.stale = True
+
+    def product_removed(self, product: Product) -> None:
+        self.stale = True
+
+    def product_changed(self, product: Product, field: str, old, new) -> None:
+        """
+        상품이 바뀌었을 때 재고는 파일에 바로 반영하고, 그 밖의 변경은 다시 써야 함을 표시하는 메서드
+        """
+        if field != 'count' or self.stale or not self.set_count(product.id, new):
+            self.stale = True
+
+
+class _RecordIds():
+    """
+    스냅샷 파일의 상품 ID들을 이진 탐색할 수 있도록 시퀀스처럼 보여주는 클래스입니다.
+    """
+    __slots__ = ('snapshot',)
+
+    def __init__(self, snapshot: CatalogSnapshot) -> None:
+        self.snapshot = snapshot
+
+    def __len__(self) -> int:
+        return self.snapshot.size
+
+    def __getitem__(self, i: int) -> int:
+        return struct.unpack_from('<q', self.snapshot._map, CatalogSnapshot.HEADER.size + i * CatalogSnapshot.RECORD.size)[0]
@@ -0,0 +1,93 @@
+from .product import Product
+
+__all__ = ['CatalogStats']
+
+
+class CatalogStats():
+    def __init__(self, catalog: 'Catalog') -> None:
+        """
+        상품이 추가/삭제/변경될 때마다 카탈로그 전체의 집계 값을 갱신하는 클래스
+
+        Catalog의 listener로 등록되어 바뀐 상품만큼만 값을 더하고 빼므로, 집계 값을 읽는 비용은 상품 수와 관계없습니다.
+        재고가 있는 상품의 최저/최고 가격은 Catalog가 유지하는 가격 인덱스의 양 끝에서 읽습니다.
+
+        Args:
+            catalog (Catalog): 집계할 카탈로그
+
+        Attributes:
+            products (int): 등록된 상품 수
+            total_units (int): 전체 재고 수량
+            inventory_value (int): 재고 금액 (가격 x 재고의 합)
+            sold_out (int): 품절된 상품 수
+        """
+        self.catalog: 'Catalog' = catalog
+        self.products: int = 0
+        self.total_units: int = 0
+        self.inventory_value: int = 0
+        self.sold_out: int = 0
+
+    @property
+    def min_price(self) -> int:
+        """
+        재고가 있는 상품 중 가장 낮은 가격. 재고가 있는 상품이 없으면 None
+        """
+        in_stock = self.catalog.in_stock_by_price
+        return in_stock[0][0] if in_stock else None
+
+    @property
+    def max_price(self) -> int:
+        """
+        재고가 있는 상품 중 가장 높은 가격. 재고가 있는 상품이 없으면 None
+        """
+        in_stock = self.catalog.in_stock_by_price
+        return in_stock[-1][0] if in_stock else None
+
+    @property
+    def to_dict(self) -> dict:
+        """
+        집계 값을 딕셔너리로 반환하는 프로퍼티
+        """
+        return {
+            'products': self.products,
+            'total_units': self.total_units,
+            'inventory_value': self.inventory_value,
+            'sold_out': self.sold_out,
+            'min_price': self.min_price,
+            'max_price': self.max_price,
+        }
+
+    def _apply(self, price: int, count: int, sign: int) -> None:
+        units = max(count, 0)
+        self.products += sign
+        self.total_units += sign * units
+        self.inventory_value += sign * price * units
+        self.sold_out += sign * (count < 1)
+
+    def product_added(self, product: Product) -> None:
+        """
+        상품이 등록되었을 때 집계에 더하는 메서드
+        """
+        self._apply(product.price, product.count, 1)
+
+    def product_removed(self, product: Product) -> None:
+        """
+        상품이 삭제되었을 때 집계에서 빼는 메서드
+        """
+        self._apply(product.price, product.count, -1)
+
+    def product_changed(self, product: Product, field: str, old, new) -> None:
+        """
+        상품의 가격이나 재고가 바뀌었을 때 이전 값을 빼고 새 값을 더하는 메서드
+
+        Args:
+            product (Product): 속성이 바뀐 상품
+            field (str): 바뀐 속성 이름. 'price', 'count'가 아니면 무시합니다.
+            old: 바뀌기 전의 값
+            new: 바뀐 후의 값
+        """
+        if field == 'price':
+            self._apply(old, product.count, -1)
+            self._apply(new, product.count, 1)
+        elif field == 'count':
+            self._apply(product.price, old, -1)
+            self._apply(product.price, new, 1)
@@ -0,0 +1,285 @@
+import codecs
+import contextlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from json.encoder import encode_basestring
+
+__all__ = ['ProductStorage', 'atomic_write', 'atomic_write_json', 'write_products_json', 'write_products_jsonl',
+           'detect_encoding', 'iter_json_records']
+
+
+@contextlib.contextmanager
+def atomic_write(file: str, encoding: str = 'utf-8', mode: str = 'w'):
+    """
+    임시 파일에 기록한 뒤 with 블록이 끝나면 원래 파일과 교체하는 컨텍스트 매니저
+
+    저장 도중 프로그램이 종료되어도 기존 파일이 손상되지 않습니다.
+
+    Args:
+        file (str): 저장할 파일명
+        encoding (str, optional): 파일 인코딩. 바이너리 모드에서는 None. Defaults to 'utf-8'.
+        mode (str, optional): 파일 열기 모드 ('w' 혹은 'wb'). Defaults to 'w'.
+
+    Yields:
+        file object: 기록할 임시 파일
+    """
+    directory = os.path.dirname(os.path.abspath(file))
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(file) + '-', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(file):
+            shutil.copymode(file, tmp_path)   # 기존 파일의 권한을 유지
+        os.replace(tmp_path, file)   # 원자적으로 파일을 교체
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write_json(file: str, data, encoding: str = 'utf-8', indent: int = None) -> None:
+    """
+    데이터를 임시 파일에 JSON으로 기록한 뒤 원래 파일과 교체하는 함수
+
+    Args:
+        file (str): 저장할 파일명
+        data: JSON으로 저장할 데이터
+        encoding (str, optional): 파일 인코딩. Defaults to 'utf-8'.
+        indent (int, optional): JSON 들여쓰기 칸 수. Defaults to None.
+    """
+    with atomic_write(file, encoding=encoding) as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+
+
+# json.dump(indent=4)와 같은 모양의 상품 한 개
+PRODUCT_ROW = '    {\n        "id": %d,\n        "name": %s,\n        "price": %d,\n        "count": %d\n    }'
+
+
+def write_products_json(f, products) -> None:
+    """
+    상품 객체들을 딕셔너리로 바꾸지 않고 json.dump(indent=4)와 같은 형식으로 기록하는 함수
+
+    들여쓰기가 있으면 json.dump는 파이썬으로 구현된 인코더를 사용하므로, 상품이 많을 때는 이 함수가 훨씬 빠릅니다.
+
+    Args:
+        f (file object): 기록할 파일
+        products (iterable): 기록할 상품 객체들 (id, name, price, count 속성)
+    """
+    rows = (PRODUCT_ROW % (p.id, encode_basestring(p.name), p.price, p.count) for p in products)
+    first = next(rows, None)
+    if first is None:
+        f.write('[]')
+        return
+    f.write('[\n')
+    f.write(first)
+    for row in rows:
+        f.write(',\n')
+        f.write(row)
+    f.write('\n]')
+
+
+def write_products_jsonl(f, products) -> None:
+    """
+    상품 객체들을 한 줄에 하나씩 JSON Lines 형식으로 기록하는 함수
+
+    Args:
+        f (file object): 기록할 파일
+        products (iterable): 기록할 상품 객체들 (id, name, price, count 속성)
+    """
+    for p in products:
+        f.write('{"id": %d, "name": %s, "price": %d, "count": %d}\n'
+                % (p.id, encode_basestring(p.name), p.price, p.count))
+
+
+def detect_encoding(file: str, chunk_size: int = 1 << 16) -> str:
+    """
+    상품 파일의 인코딩을 확인하는 함수
+
+    BOM이 있으면 'utf-8-sig', 파일 전체가 UTF-8로 읽히면 'utf-8', 아니면 예전 상품 파일의 인코딩인 'cp949'(EUC-KR 확장)를 반환합니다.
+    파일을 조각 단위로 확인하므로 파일 크기와 관계없이 메모리를 적게 사용합니다.
+
+    Args:
+        file (str): 확인할 파일명
+        chunk_size (int, optional): 한 번에 읽을 바이트 수. Defaults to 65536.
+
+    Returns:
+        str: 파일을 읽을 때 사용할 인코딩
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    with open(file, 'rb') as f:
+        chunk = f.read(chunk_size)
+        if chunk.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+        try:
+            while chunk:
+                decoder.decode(chunk)
+                chunk = f.read(chunk_size)
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            return 'cp949'
+    return 'utf-8'
+
+
+def iter_json_records(file: str, encoding: str = None, chunk_size: int = 1 << 16):
+    """
+    JSON 배열 파일 혹은 JSON Lines 파일에서 객체를 하나씩 읽어 반환하는 제너레이터
+
+    파일 전체를 한 번에 읽지 않고 조각 단위로 읽으며 객체를 하나씩 해석하므로,
+    메모리에는 읽은 조각과 해석 중인 객체 하나만 남습니다.
+
+    Args:
+        file (str): 읽을 파일명
+        encoding (str, optional): 파일 인코딩. Defaults to None (detect_encoding으로 확인).
+        chunk_size (int, optional): 한 번에 읽을 글자 수. Defaults to 65536.
+
+    Yields:
+        dict: 파일에 기록된 객체
+
+    Raises:
+        ValueError: JSON 형식이 잘못된 경우 (json.JSONDecodeError)
+    """
+    decoder = json.JSONDecoder()
+    with open(file, 'r', encoding=encoding or detect_encoding(file)) as f:
+        buffer, pos, eof = '', 0, False
+        started = False   # JSON 배열의 '['를 이미 건너뛰었는지 여부
+        while True:
+            # 공백, 구분자(','), 배열의 시작과 끝('[', ']')을 건너뜀
+            while pos < len(buffer) and (buffer[pos] in ' \t\r\n,]' or (buffer[pos] == '[' and not started)):
+                started = started or buffer[pos] == '['
+                pos += 1
+            if pos == len(buffer):
+                if eof:
+                    return
+                buffer, pos = f.read(chunk_size), 0
+                eof = not buffer
+                continue
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                more = f.read(chunk_size)   # 객체가 조각 경계에 걸친 경우 다음 조각을 이어서 해석
+                eof = not more
+                buffer, pos = buffer[pos:] + more, 0
+                continue
+            if end == len(buffer) and not eof:
+                # 숫자처럼 조각 끝에서 잘려도 해석되는 값이 있으므로 다음 조각까지 확인
+                more = f.read(chunk_size)
+                if more:
+                    buffer, pos = buffer[pos:] + more, 0
+                    continue
+                eof = True
+            started = True
+            yield record
+            pos = end
+
+
+class ProductStorage():
+    def __init__(self, file: str, flush_interval: float = 5.0, flush_count: int = 10, encoding: str = 'utf-8') -> None:
+        """
+        변경된 상품을 추적하여 필요할 때만 상품 파일을 저장하는 클래스
+
+        저장 이후 변경된 상품이 있을 때만(dirty) 저장하며, 저장 시점은 변경 횟수(commits)와 마지막 저장 시각으로 정합니다.
+        저장 시점은 flush를 호출할 때 확인하므로, VendingMachine은 화면을 다시 그릴 때와 백그라운드 autosave 스레드에서 flush를 호출합니다.
+
+        Args:
+            file (str): 상품 정보를 저장할 JSON 파일명
+            flush_interval (float, optional): 변경 사항이 있을 때 저장할 최소 시간 간격(초). Defaults to 5.0.
+            flush_count (int, optional): 시간 간격과 관계없이 저장할 변경 횟수. Defaults to 10.
+            encoding (str, optional): 상품 파일을 저장할 인코딩. 읽을 때는 detect_encoding으로 확인합니다. Defaults to 'utf-8'.
+                확장자가 '.jsonl'인 파일은 JSON Lines 형식으로 저장합니다.
+        """
+        self.file: str = file
+        self.flush_interval: float = flush_interval
+        self.flush_count: int = flush_count
+        self.encoding: str = encoding
+        self.dirty: set = set()              # 저장 이후 변경된 상품들
+        self.commits: int = 0                # 저장 이후 발생한 변경 횟수
+        self.last_flush: float = time.monotonic()   # 마지막으로 저장한 시각
+        self.metrics = None                  # 기록한 바이트 수를 더할 Metrics 객체
+        self.snapshot = None                 # 상품 파일과 함께 갱신할 CatalogSnapshot 객체
+
+    @property
+    def is_dirty(self) -> bool:
+        """
+        저장되지 않은 변경 사항이 있는지 여부를 반환하는 프로퍼티. 저장 이후 변경된 상품이 있으면 True
+        """
+        return bool(self.dirty)
+
+    @property
+    def is_due(self) -> bool:
+        """
+        변경 사항을 지금 저장해야 하는지 여부를 반환하는 프로퍼티
+
+        Returns:
+            bool: 변경 사항이 있고, 저장 간격이 지났거나 변경 횟수가 기준 이상인 경우 True
+        """
+        if not self.is_dirty:
+            return False
+        if self.commits >= self.flush_count:
+            return True
+        return time.monotonic() - self.last_flush >= self.flush_interval
+
+    def mark_dirty(self, product=None) -> None:
+        """
+        상품이 변경되었음을 기록하는 메서드
+
+        Args:
+            product (Product, optional): 변경된 상품. 상품 추가/삭제처럼 목록 전체가 바뀐 경우 None. Defaults to None.
+        """
+        self.dirty.add(product)
+        self.commits += 1
+        if product is None and self.snapshot is not None:
+            self.snapshot.stale = True   # ID 재정렬처럼 목록 전체가 바뀐 경우 스냅샷도 다시 써야 함
+
+    def flush(self, products: list, force: bool = False) -> bool:
+        """
+        변경 사항이 있고 저장 시점이 된 경우 상품 정보를 파일에 저장하는 메서드
+
+        Args:
+            products (list): 저장할 상품 리스트 혹은 이를 반환하는 함수
+            force (bool, optional): 저장 시점과 관계없이 변경 사항을 저장할지 여부. Defaults to False.
+
+        Returns:
+            bool: 파일에 저장했는지 여부
+        """
+        if not (self.is_due or (force and self.is_dirty)):
+            return False
+        if callable(products):
+            products = products()   # 실제로 저장할 때만 상품 리스트를 가져옴
+        self.write(products)
+        return True
+
+    def write(self, products: list) -> None:
+        """
+        상품 정보를 파일에 원자적으로 저장하는 메서드
+
+        Args:
+            products (list): 저장할 상품 객체 리스트
+        """
+        write = write_products_jsonl if self.file.endswith('.jsonl') else write_products_json
+        with atomic_write(self.file, encoding=self.encoding) as f:   # JSON 파일에 제품 정보를 저장합니다.
+            write(f, products)
+        if self.metrics is not None:
+            self.metrics.add_bytes('products', os.path.getsize(self.file))
+        if self.snapshot is not None:
+            if self.snapshot.stale or not self.snapshot.is_open:
+                self.snapshot.write(products)
+                if self.metrics is not None:
+                    self.metrics.add_bytes('catalog_snapshot', os.path.getsize(self.snapshot.file))
+            else:
+                self.snapshot.touch()   # 재고는 이미 반영되어 있으므로 상품 파일보다 최신임만 표시
+        self.mark_clean()
+
+    def mark_clean(self) -> None:
+        """
+        파일과 메모리의 상태가 같아졌음을 기록하는 메서드
+        """
+        self.dirty.clear()
+        self.commits = 0
+        self.last_flush = time.monotonic()
@@ -1,9 +1,14 @@
+import functools
 import unicodedata
 
 
 __all__ = ['TextFormatter']
 
 class TextFormatter:
+    # 색상 이름별 ANSI 색상 번호 (글자색은 30, 배경색은 40을 더함)
+    COLOR_CODES: dict[str, int] = {color: i for i, color in enumerate(
+        ['black', 'red', 'green', 'yellow', 'blue', 'magenta', 'cyan', 'white', None, 'default'])}
+
     @staticmethod
     def textColor(text: str, color: str, bg=False) -> str:
         """
@@ -17,12 +22,10 @@ class TextFormatter:
         Returns:
             str: 변경된 텍스트
         """
-        col_list = ['black', 'red', 'green', 'yellow',
-                    'blue', 'magenta', 'cyan', 'white', None, 'default']
         if color == 'reset':
             return '\033[0m'  # ANSI 코드를 사용하여 텍스트의 색상을 리셋하는 코드
         # ANSI 코드를 사용하여 텍스트의 색상을 변경하는 코드. color와 bg에 따라 적절한 코드를 생성하여 반환함.
-        return f'\033[{col_list.index(color) + (40 if bg else 30)}m' + text + '\033[0m'
+        return f'\033[{TextFormatter.COLOR_CODES[color] + (40 if bg else 30)}m' + text + '\033[0m'
 
     @staticmethod
     def fill_str_with_space(input_s: str, max_size: int = 28, fill_char=" ") -> str:
@@ -37,11 +40,25 @@ class TextFormatter:
         Returns:
             str: 최대 크기로 채워진 문자열
         """
+        l = TextFormatter.display_width(input_s)  # 입력된 문자열의 폭을 계산함
+        return input_s + fill_char * (max_size - l)  # 입력된 문자열을 주어진 최대 크기로 채우기 위해 fill_char를 사용함
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def display_width(input_s: str) -> int:
+        """
+        문자열이 터미널에서 차지하는 폭을 계산하는 함수. 같은 문자열의 결과는 캐시됩니다.
+
+        Args:
+            input_s (str): 입력 문자열
+
+        Returns:
+            int: 문자열의 폭
+        """
         l = 0
-        # 입력된 문자열의 폭을 계산함
         for c in input_s:
             if unicodedata.east_asian_width(c) in ['F', 'W']:
                 l += 2  # 동아시아 폭(Wide, Fullwidth)인 경우 2를 더함
             else:
                 l += 1  # 그 외의 경우 1을 더함
-        return input_s + fill_char * (max_size - l)  # 입력된 문자열을 주어진 최대 크기로 채우기 위해 fill_char를 사용함
+        return l
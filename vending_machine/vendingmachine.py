@@ -1,10 +1,91 @@
+import codecs
+import contextlib
+import functools
+import os
+import sys
+import threading
+import time
+import weakref
+from operator import attrgetter
 from .product import Product
-import datetime
+from .catalog import Catalog, ProductView
+from .change import ChangeMaker, ChangeBox
+from .reporter import IssueReporter
+from .reportstore import ReportStore
+from .monitor import ThresholdMonitor
+from .stats import CatalogStats
+from .snapshot import CatalogSnapshot
+from .storage import ProductStorage, detect_encoding, iter_json_records
+from .journal import Journal, journaled
+from .metrics import Metrics, timed
 
-__all__ = ['VendingMachine', 'VendingMachineUser']
+__all__ = ['VendingMachine', 'VendingMachineUser', 'Session', 'synchronized']
+
+
+def synchronized(method):
+    """
+    자판기의 잠금(lock)을 잡은 상태에서 메서드를 실행하는 데코레이터
+
+    잠금은 재진입 가능하므로 buy 안의 refund처럼 다른 동기화 메서드 안에서 호출되어도 멈추지 않습니다.
+
+    Args:
+        method (function): 동기화할 VendingMachine 메서드
+
+    Returns:
+        function: 잠금이 추가된 메서드
+    """
+    @functools.wraps(method)
+    def wrapper(machine, *args, **kwargs):
+        with machine.lock:
+            return method(machine, *args, **kwargs)
+    return wrapper
+
+
+class _AutoSaver():
+    def __init__(self, interval: float = 1.0) -> None:
+        """
+        열려 있는 자판기들의 chk_everytime을 백그라운드 스레드 하나에서 주기적으로 호출하는 클래스입니다.
+
+        화면을 다시 그리지 않는 동안(손님이 없거나 서버/배치 모드)에도 저장 간격이 지난 상품 변경과 지표가 파일에 저장됩니다.
+        Fleet처럼 자판기가 많아도 스레드는 하나만 사용합니다.
+
+        Args:
+            interval (float, optional): 저장 시점을 확인하는 간격(초). Defaults to 1.0.
+        """
+        self.interval: float = interval
+        self.machines: weakref.WeakSet = weakref.WeakSet()   # 확인할 자판기 (닫거나 버려진 자판기는 제외)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread = None
+
+    def add(self, machine: 'VendingMachine') -> None:
+        with self._lock:
+            self.machines.add(machine)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='AutoSaver', daemon=True)
+                self._thread.start()
+
+    def discard(self, machine: 'VendingMachine') -> None:
+        with self._lock:
+            self.machines.discard(machine)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                machines = list(self.machines)
+            for machine in machines:
+                try:
+                    machine.chk_everytime()
+                except Exception:
+                    pass   # 저장에 실패한 변경 사항은 남아 있으므로 다음 주기에 다시 시도
+
+
+_autosaver = _AutoSaver()
 
 
 class VendingMachineUser():
+    __slots__ = ('money_box', 'credit_money', 'is_credit')
+
     def __init__(self) -> None:
         """
         VendingMachine 사용자 클래스입니다.
@@ -12,7 +93,6 @@ class VendingMachineUser():
         Attributes:
             money_box (dict): 사용자가 보유한 돈의 갯수를 나타내는 딕셔너리. 돈의 종류를 key로, 갯수를 value로 가집니다.
             credit_money (int): 사용자의 신용 금액을 나타내는 변수. 기본값은 10000입니다.
-            selected_product (Product): 사용자가 선택한 상품을 나타내는 변수. 기본값은 None입니다.
             is_credit (bool): 신용 결제 모드 여부를 나타내는 변수. 기본값은 False입니다.
         """
         self.money_box: dict[int:int] = {100: 4, 500: 2, 1000: 4}
@@ -34,6 +114,8 @@ class VendingMachineUser():
         """
         사용자의 총 보유 금액을 계산하여 반환하는 프로퍼티입니다.
 
+        지갑은 화폐 단위 몇 개뿐이므로 CatalogStats처럼 값을 따로 유지하지 않고 호출할 때마다 합산합니다.
+
         Returns:
             int: 사용자의 총 보유 금액
         """
@@ -55,35 +137,305 @@ class VendingMachineUser():
         return f'사용자 잔액 : 1000원 : {self.money_box[1000]}개   500원 : {self.money_box[500]}개   100원 : {self.money_box[100]}개'
 
 
+class Session(VendingMachineUser):
+    __slots__ = ('id', 'inserted_money')
+
+    def __init__(self, session_id: int = 0) -> None:
+        """
+        자판기를 사용하는 손님 한 명의 상태(지갑, 결제 수단, 투입 금액)를 담는 클래스
+
+        자판기 하나가 많은 세션을 동시에 가질 수 있도록 __slots__로 작게 만듭니다.
+
+        Attributes:
+            id (int): 세션 번호. 0은 자판기 앞의 기본 세션입니다.
+            inserted_money (int): 이 세션에서 투입한 금액
+        """
+        super().__init__()
+        self.id: int = session_id
+        self.inserted_money: int = 0
+
+    def reset(self) -> None:
+        """
+        지갑, 결제 수단과 투입 금액을 초기화하는 메서드입니다.
+        """
+        super().reset()
+        self.inserted_money = 0
+
+    @property
+    def to_dict(self) -> dict:
+        """
+        세션의 상태를 JSON으로 저장할 수 있는 딕셔너리로 반환하는 프로퍼티입니다.
+        """
+        return {
+            'id': self.id,
+            'money_box': [[k, v] for k, v in self.money_box.items()],
+            'credit_money': self.credit_money,
+            'is_credit': self.is_credit,
+            'inserted_money': self.inserted_money,
+        }
+
+    def load(self, data: dict) -> 'Session':
+        """
+        to_dict로 만든 딕셔너리의 값으로 세션의 상태를 바꾸는 메서드입니다.
+        """
+        self.money_box = {k: v for k, v in data['money_box']}
+        self.credit_money = data['credit_money']
+        self.is_credit = data['is_credit']
+        self.inserted_money = data['inserted_money']
+        return self
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Session':
+        """
+        to_dict로 만든 딕셔너리로 세션을 만드는 메서드입니다.
+        """
+        return cls(data['id']).load(data)
+
+
 class VendingMachine(BaseException):
-    def __init__(self, file: str) -> None:
+    def __init__(self, file: str, journal_file: str = None, change_denominations: tuple = (500, 100),
+                 metrics_file: str = None, state_dir: str = None, catalog_snapshot: str = None,
+                 report_retention_days: float = 90, autosave: bool = True) -> None:
         """
         자판기 클래스의 생성자
 
         Args:
             file (str, optional): JSON 파일명. Defaults to None.
+            journal_file (str, optional): 상태 변화를 기록할 저널 파일명. 지정하면 시작할 때 저널로 상태를 복구합니다. Defaults to None.
+            change_denominations (tuple, optional): 거스름돈으로 돌려줄 화폐 단위 (예: (1000, 500, 100, 50)). Defaults to (500, 100).
+            metrics_file (str, optional): 동작 지표를 주기적으로 저장할 JSON 파일명. Defaults to None.
+            state_dir (str, optional): 자판기의 파일들을 저장할 디렉터리. 상대 경로의 파일명과 리포트 파일은 이 디렉터리 기준입니다.
+                한 프로세스에서 여러 자판기를 실행할 때 파일이 겹치지 않도록 사용합니다. Defaults to None (현재 디렉터리).
+            catalog_snapshot (str, optional): 상품 목록의 바이너리 스냅샷 파일명. 지정하면 상품 파일보다 최신인 스냅샷에서
+                상품을 불러오고, 재고 변경은 스냅샷에 바로 기록합니다. Defaults to None.
+            report_retention_days (float, optional): 리포트 데이터베이스에 해소된 이슈를 보관할 일 수. 0이면 삭제하지 않습니다. Defaults to 90.
+            autosave (bool, optional): 화면을 다시 그리지 않아도 백그라운드 스레드에서 저장 간격마다 변경 사항을 저장할지 여부.
+                False이면 저장 간격이 지난 변경은 다음 chk_everytime이나 close까지 저널에만 남습니다. Defaults to True.
         """
-        self.products: list[Product] = []               # 자판기에 등록된 상품들을 담을 리스트
+        self.lock = threading.RLock()   # 여러 스레드에서 상태를 바꿀 때 사용하는 잠금
+        self.state_dir: str = state_dir
+        if state_dir is not None:
+            os.makedirs(state_dir, exist_ok=True)
+        file, journal_file, metrics_file, catalog_snapshot = (self.path(name) if name else name for name in
+                                                              (file, journal_file, metrics_file, catalog_snapshot))
+        self.metrics: Metrics = Metrics(dump_file=metrics_file)   # 동작 횟수, 지연 시간, 기록한 바이트 수
+        self.report_file: str = self.path('report.txt')   # 자판기 리포트 파일명
+        self.report_store: ReportStore = ReportStore(self.path('report.db'), retention_days=report_retention_days)   # 이슈를 집계할 수 있도록 저장하는 데이터베이스
+        self.reporter: IssueReporter = IssueReporter(self.report_file, store=self.report_store)   # 리포트를 백그라운드에서 기록하는 객체
+        self.reporter.metrics = self.metrics
+        self.change_maker: ChangeMaker = ChangeMaker(change_denominations)   # 거스름돈 조합 계산기
+        coins = tuple(money for money in sorted({100, 500, *change_denominations}) if money < 1000)
+        self.monitor: ThresholdMonitor = ThresholdMonitor(self.reporter, watched_money=coins)   # 재고, 거스름돈 기준 감시
+        self.catalog: Catalog = Catalog()               # 자판기에 등록된 상품들과 ID, 이름 인덱스
+        self.catalog.listeners.append(self.monitor)
+        self.stats: CatalogStats = CatalogStats(self.catalog)   # 재고 수량, 재고 금액, 품절 상품 수 등 집계
+        self.catalog.listeners.append(self.stats)
         self.change_box: dict[int:int] = {
             100: 10, 500: 10, 1000: 0}   # 거스름돈 보관함
-        self.inserted_money: int = 0          # 사용자가 투입한 금액
-        self.user: VendingMachineUser = VendingMachineUser()   # 자판기 사용자
-        self.report_file: str = 'report.txt'   # 자판기 리포트 파일명
+        self.sessions: dict[int, Session] = {0: Session(0)}   # 세션 번호 -> 세션 (0은 기본 세션)
+        self.session: Session = self.sessions[0]               # 현재 명령을 실행 중인 세션
+        self.next_session: int = 1                             # 다음에 열 세션 번호
         self.products_file = file
-        self.products_by_json()   # JSON 파일을 통해 상품들을 등록하는 메소드 호출
+        self.storage: ProductStorage = ProductStorage(file)   # 변경된 상품만 추적하여 저장하는 저장소
+        self.storage.metrics = self.metrics
+        self.snapshot: CatalogSnapshot = CatalogSnapshot(catalog_snapshot) if catalog_snapshot else None   # 상품 목록 바이너리 스냅샷
+        if self.snapshot is not None:
+            self.storage.snapshot = self.snapshot
+            self.catalog.listeners.append(self.snapshot)
+        self.journal: Journal = Journal(journal_file) if journal_file else None   # 상태 변화 저널
+        if self.journal is not None:
+            self.journal.metrics = self.metrics
+        self.load_products()   # 스냅샷 혹은 JSON 파일을 통해 상품들을 등록하는 메소드 호출
+        if self.journal is not None:
+            self.journal.recover(self)   # 스냅샷과 저널로 이전 상태 복구
+        if autosave:
+            _autosaver.add(self)
+
+    def path(self, name: str) -> str:
+        """
+        파일명을 자판기의 디렉터리(state_dir) 기준 경로로 바꾸는 메서드. 절대 경로는 그대로 반환합니다.
+
+        Args:
+            name (str): 파일명
+
+        Returns:
+            str: 자판기의 파일 경로
+        """
+        return os.path.join(self.state_dir, name) if self.state_dir is not None else name
+
+    @contextlib.contextmanager
+    def transaction(self, rollback: bool = False):
+        """
+        여러 동작을 다른 스레드의 방해 없이 한 번에 실행하는 컨텍스트 매니저
+
+        with 블록이 끝날 때까지 자판기의 잠금을 유지하므로, 블록 안에서 확인한 상태가 다른 스레드에 의해 바뀌지 않습니다.
+        rollback이 True이면 블록에서 예외가 발생했을 때 시작할 때의 상태로 되돌리고, 저널도 되돌린 상태로 정리합니다.
+        상품은 시작할 때의 상품 객체에 값을 되돌려 넣으므로, 블록 밖에서 가지고 있던 상품 참조도 계속 유효합니다.
+
+        Args:
+            rollback (bool, optional): 예외가 발생하면 상태를 되돌릴지 여부. Defaults to False.
+
+        Yields:
+            VendingMachine: 자판기 자신
+
+        Examples:
+            with machine.transaction():
+                if machine.is_sellable(product):
+                    machine.buy(product.id)
+        """
+        with self.lock:
+            saved = (self.state, list(self.catalog)) if rollback else None
+            try:
+                yield self
+            except BaseException:
+                if saved is not None:
+                    self.load_state(*saved)
+                    if self.journal is not None:
+                        self.journal.snapshot(self)   # 되돌린 동작이 재실행되지 않도록 저널 정리
+                raise
+
+    @property
+    def user(self) -> Session:
+        """
+        현재 세션의 사용자(지갑, 결제 수단)를 반환하는 프로퍼티
+        """
+        return self.session
+
+    @property
+    def inserted_money(self) -> int:
+        """
+        현재 세션에서 투입한 금액을 반환하는 프로퍼티
+        """
+        return self.session.inserted_money
+
+    @inserted_money.setter
+    def inserted_money(self, money: int) -> None:
+        self.session.inserted_money = money
+
+    @synchronized
+    @journaled
+    def open_session(self) -> Session:
+        """
+        새 세션을 열어 세션 목록에 추가하는 메서드. 세션 번호는 차례대로 부여되므로 저널을 재실행해도 같은 번호가 됩니다.
+
+        Returns:
+            Session: 새로 연 세션
+        """
+        session = Session(self.next_session)
+        self.next_session += 1
+        self.sessions[session.id] = session
+        return session
+
+    @synchronized
+    @journaled
+    def close_session(self, session_id: int) -> Session:
+        """
+        세션을 닫는 메서드. 투입 금액이 남아 있으면 먼저 환불을 시도하며, 거스름돈이 부족하면 투입 금액은 자판기에 남습니다.
+
+        Args:
+            session_id (int): 닫을 세션 번호
+
+        Returns:
+            Session: 닫힌 세션
+
+        Raises:
+            ValueError: 기본 세션(0)이거나 열려 있지 않은 세션인 경우
+        """
+        if session_id == 0 or session_id not in self.sessions:
+            raise ValueError('Wrong session')
+        with self.use_session(session_id) as session:
+            if session.inserted_money > 0:
+                try:
+                    self.refund(self.cal_refund())
+                except ValueError:
+                    pass
+        return self.sessions.pop(session_id)
+
+    @contextlib.contextmanager
+    def use_session(self, session_id: int):
+        """
+        with 블록 안에서 지정한 세션을 현재 세션으로 사용하는 컨텍스트 매니저
 
+        블록이 끝날 때까지 자판기의 잠금을 유지하므로, 다른 스레드의 명령이 이 세션의 상태로 실행되지 않습니다.
+
+        Args:
+            session_id (int): 사용할 세션 번호
+
+        Yields:
+            Session: 사용할 세션
+
+        Raises:
+            ValueError: 열려 있지 않은 세션인 경우
+        """
+        with self.lock:
+            session = self.sessions.get(session_id)
+            if session is None:
+                raise ValueError('Wrong session')
+            saved, self.session = self.session.id, session
+            try:
+                yield session
+            finally:
+                # 블록 안에서 이전 세션이 닫혔을 수 있으므로 번호로 되돌림
+                self.session = self.sessions.get(saved, self.sessions[0])
+
+    @synchronized
     def chk_everytime(self) -> None:
         """
-        자판기의 상태를 확인하고, 이슈가 발생한 경우 리포트를 작성하는 메서드
+        화면을 다시 그릴 때마다, 그리고 autosave가 켜져 있으면 백그라운드에서 1초마다 호출되어 자판기의 상태를 정리하는 메서드
+
+        재고와 거스름돈 이슈는 값이 바뀔 때 ThresholdMonitor가 바로 기록하므로 여기서 다시 확인하지 않습니다.
         """
+        self.storage.flush(lambda: self.products)   # 변경 사항이 있고 저장 시점이 된 경우에만 저장
+        self.metrics.maybe_dump()   # 지표 파일이 지정된 경우 저장 간격마다 저장
+
+    @synchronized
+    def close(self) -> None:
+        """
+        저장되지 않은 상품 정보와 리포트를 모두 기록하고 파일을 닫는 메서드
+        """
+        _autosaver.discard(self)
         self.save_products()
-        for k, v in self.change_box.items():
-            if k < 1000 and v < 5:
-                self.issue_report(issue_type='No_change', issue_on=k)
+        self.reporter.close()
+        self.report_store.close()
+        if self.snapshot is not None:
+            self.snapshot.close()
+        if self.journal is not None:
+            self.journal.close()
+        if self.metrics.dump_file is not None:
+            self.metrics.dump()
+
+    @property
+    def products(self) -> list[Product]:
+        """
+        자판기에 등록된 상품 리스트를 반환하는 프로퍼티
+        """
+        return self.catalog.products
 
-        for product in self.products:
-            if product.count < 5:
-                self.issue_report(issue_type='Less_product', issue_on=product)
+    @property
+    def change_box(self) -> ChangeBox:
+        """
+        거스름돈 보관함을 반환하는 프로퍼티. 개수가 바뀌면 ThresholdMonitor에 통지됩니다.
+        """
+        return self._change_box
+
+    @change_box.setter
+    def change_box(self, box: dict) -> None:
+        box = ChangeBox(box)
+        for money in self.change_maker.denominations:
+            dict.setdefault(box, money, 0)   # 설정된 화폐 단위의 칸 추가
+        box.observer = self.monitor
+        self._change_box = box
+        for money, count in box.items():   # 새 보관함의 상태로 이슈 확인
+            self.monitor.change_changed(money, None, count)
+
+    def lowest_stock(self) -> Product:
+        """
+        재고가 가장 적은 상품을 반환하는 메서드
+
+        Returns:
+            Product: 재고가 가장 적은 상품. 상품이 없는 경우 None
+        """
+        return self.catalog.lowest_stock()
 
     @property
     def change_box_info(self) -> str:
@@ -99,8 +451,14 @@ class VendingMachine(BaseException):
 
         Returns:
             int: 재고가 있는 상품들 중 가장 높은 가격
+
+        Raises:
+            ValueError: 재고가 있는 상품이 없는 경우
         """
-        return max([i.price for i in self.products if i.count > 0])   # 재고가 있는 상품들 중 가장 높은 가격 반환
+        max_price = self.stats.max_price   # 가격 인덱스에서 바로 읽음
+        if max_price is None:
+            raise ValueError('No product in stock')
+        return max_price
 
     @property
     def to_dict(self) -> list[dict]:
@@ -110,18 +468,42 @@ class VendingMachine(BaseException):
         return [product.to_dict for product in self.products]
 
     @property
-    def products_name(self) -> list[Product]:
+    def products_name(self) -> ProductView:
         """
-        상품들의 이름을 리스트로 반환하는 프로퍼티
+        상품들의 이름을 ID 순으로 보여주는 프로퍼티. 리스트를 새로 만들지 않고 상품 목록의 뷰를 반환합니다.
         """
-        return [i.name for i in self.products]  # 상품들의 이름을 리스트로 반환
+        return self.catalog.view('name')
 
     @property
-    def products_id(self) -> list[int]:
+    def products_id(self) -> ProductView:
         """ 
-        상품들의 ID를 리스트로 반환하는 프로퍼티
+        상품들의 ID를 ID 순으로 보여주는 프로퍼티. 리스트를 새로 만들지 않고 상품 목록의 뷰를 반환합니다.
+        """
+        return self.catalog.view('id')
+
+    def get_product(self, product_id: int) -> Product:
         """
-        return [i.id for i in self.products]
+        상품 ID로 상품을 찾는 메서드
+
+        Args:
+            product_id (int): 찾을 상품의 ID
+
+        Returns:
+            Product: 찾은 상품 객체. 없는 경우 None
+        """
+        return self.catalog.get(product_id)
+
+    def find_products(self, name: str) -> list[Product]:
+        """
+        상품 이름으로 상품들을 찾는 메서드
+
+        Args:
+            name (str): 찾을 상품의 이름
+
+        Returns:
+            list: 이름이 같은 상품 리스트
+        """
+        return self.catalog.find(name)
 
     @property
     def status(self) -> str:
@@ -133,6 +515,65 @@ class VendingMachine(BaseException):
         """
         return f"투입된 금액 : {self.inserted_money}원\n"   # 현재 투입된 금액 반환
 
+    @property
+    def state(self) -> dict:
+        """
+        상품, 거스름돈 보관함, 투입 금액, 사용자 정보를 포함한 자판기의 전체 상태를 딕셔너리로 반환하는 프로퍼티
+
+        Returns:
+            dict: JSON으로 저장할 수 있는 자판기의 상태
+        """
+        with self.lock:
+            return {
+                'products': self.to_dict,
+                'change_box': [[k, v] for k, v in self.change_box.items()],
+                'inserted_money': self.sessions[0].inserted_money,
+                'user': {
+                    'money_box': [[k, v] for k, v in self.sessions[0].money_box.items()],
+                    'credit_money': self.sessions[0].credit_money,
+                    'is_credit': self.sessions[0].is_credit,
+                },
+                'sessions': [session.to_dict for session_id, session in self.sessions.items() if session_id != 0],
+                'next_session': self.next_session,
+            }
+
+    @synchronized
+    def load_state(self, state: dict, products: list[Product] = None) -> None:
+        """
+        state 프로퍼티로 만든 딕셔너리로 자판기의 상태를 되돌리는 메서드
+
+        상품은 새로 만들지 않고 기존 상품 객체에 저장된 값을 되돌려 넣으므로, 자판기 밖에서 가지고 있던
+        상품 참조(CLI에서 선택한 상품, Fleet 등)가 카탈로그와 어긋나지 않습니다.
+
+        Args:
+            state (dict): 자판기의 상태
+            products (list, optional): state['products']와 같은 순서의 상품 객체 리스트 (transaction을 시작할 때의 카탈로그).
+                Defaults to None (같은 ID의 현재 상품 객체를 사용하고, 없으면 새로 만듦).
+        """
+        records = state['products']
+        if products is None:
+            products = [self.catalog.get(record['id']) for record in records]
+        self.catalog.clear()   # 카탈로그에서 빠진 상품은 값을 바꿔도 통지하지 않음
+        restored = []
+        for product, record in zip(products, records):
+            if product is None:
+                product = Product(ID=record['id'], name=record['name'], price=record['price'], count=record['count'])
+            else:
+                product.id, product.name, product.price, product.count = \
+                    record['id'], record['name'], record['price'], record['count']
+            restored.append(product)
+        self.catalog.bulk_load(restored)
+        self.storage.mark_dirty()   # 복구한 상품 정보를 상품 파일에도 반영
+        self.change_box = {k: v for k, v in state['change_box']}
+        entries = [dict(state['user'], id=0, inserted_money=state['inserted_money']), *state.get('sessions', [])]
+        sessions, self.sessions = self.sessions, {}
+        for data in entries:   # 세션도 같은 번호의 기존 객체가 있으면 값만 되돌림
+            session = sessions.get(data['id'])
+            self.sessions[data['id']] = session.load(data) if session is not None else Session.from_dict(data)
+        self.session = self.sessions.get(self.session.id, self.sessions[0])
+        self.next_session = state.get('next_session', max(self.sessions) + 1)
+
+    @synchronized
     def report(self) -> str:
         """
         자판기 리포트 파일의 내용을 문자열로 반환하는 메서드
@@ -142,35 +583,67 @@ class VendingMachine(BaseException):
         """
         output = ''
         self.save_products()
-        for k, v in self.change_box.items():
-            if k < 1000 and v < 7:
-                output += f'거스름돈{k}원 7개 미만입니다.\n'
-        for product in self.products:
-            if product.count < 7:
-                output += f'상품 {product.name}의 재고7개 미만입니다.\n'
+        limit = self.monitor.warning_threshold
+        # 경고 기준 미만인 항목은 ThresholdMonitor가 값이 바뀔 때마다 관리하므로 전체를 확인하지 않음
+        for k in sorted(self.monitor.warn_change):
+            output += f'거스름돈{k}원 {limit}개 미만입니다.\n'
+        for product in sorted(self.monitor.warn_products, key=attrgetter('id')):
+            output += f'상품 {product.name}의 재고{limit}개 미만입니다.\n'
         if output != '':
             output = '경고\n' + output
 
         return output
 
+    def report_summary(self, days: int = 7) -> str:
+        """
+        최근 기간의 품절 시간과 거스름돈 부족 현황을 집계하여 문자열로 반환하는 메서드
+
+        Args:
+            days (int, optional): 집계할 최근 일 수. Defaults to 7.
+
+        Returns:
+            str: 집계 결과 문자열
+        """
+        self.reporter.flush()   # 기록 대기 중인 이슈까지 반영
+        return self.report_store.summary(days=days)
+
+    @synchronized
+    @journaled
     def reset(self) -> None:
         """
-        자판기를 초기화하는 메서드
+        자판기를 초기화하는 메서드. 상품과 거스름돈을 초기화하고, 기본 세션만 남기고 모든 세션을 닫습니다.
 
         Returns:
             None
         """
-        self.products: list[Product] = []   # 상품 리스트 초기화
+        self.catalog.clear()   # 상품 리스트 초기화
         self.change_box: dict[int:int] = {
             100: 100, 500: 100, 1000: 0}   # 거스름돈 보관함 초기화
-        self.inserted_money: int = 0   # 투입된 금액 초기화
-        self.user.reset()   # 사용자 정보 초기화
+        self.sessions = {0: self.sessions[0]}   # 열려 있던 세션 정리
+        self.session = self.sessions[0]
+        self.reset_session()   # 기본 세션의 사용자 정보 초기화
+        return None
+
+    @synchronized
+    @journaled
+    def reset_session(self) -> None:
+        """
+        현재 세션의 지갑, 결제 수단과 투입 금액만 초기화하는 메서드. 자판기의 상품과 거스름돈은 그대로 둡니다.
+
+        Returns:
+            None
+        """
+        self.session.reset()
         return None
 
+    @timed
+    @synchronized
     def issue_report(self, issue_type: str = None, issue_on=None) -> None:
         """
         자판기 리포트를 작성하는 메서드
 
+        같은 이슈가 이미 발생 중이면 기록하지 않으며, 실제 파일 기록은 IssueReporter의 백그라운드 스레드가 수행합니다.
+
         Args:
             issue_type (str, optional): 리포트 이슈 타입. Defaults to None.
             issue_on (Product or int, optional): 리포트 이슈가 발생한 상품 혹은 금액. Defaults to None.
@@ -182,39 +655,30 @@ class VendingMachine(BaseException):
             AssertionError
 
         """
-        time = datetime.datetime.now()   # 현재 시간을 받아옴
-        time_str = time.strftime('%Y/%m/%d-%H:%M:%S')   # 시간을 문자열로 변환
-        # 리포트 파일을 열어서 이슈 타입에 따라 메시지 작성
-        with open(self.report_file, 'a', encoding='utf-8') as f:
-            if issue_type == 'No_product':  # 상품이 품절되었을 때
-                # issue_on이 Product 클래스의 인스턴스인지 확인
-                assert type(issue_on) == Product
-                # 리포트 파일에 메시지 작성
-                f.write(
-                    f'[{time_str}] {issue_on.id}. {issue_on.name} 상품의 재고가 없습니다.\n')
-            elif issue_type == 'Less_product':  # 상품이 품절되었을 때
-                # issue_on이 Product 클래스의 인스턴스인지 확인
-                assert type(issue_on) == Product
-                # 리포트 파일에 메시지 작성
-                f.write(
-                    f'[{time_str}] {issue_on.id}. {issue_on.name} 상품의 재고가 부족합니다.\n')
-            elif issue_type == 'No_change':  # 거스름돈이 부족할 때
-                # issue_on이 100, 500, 1000 중 하나인지 확인
-                assert str(issue_on) in ['100', '500', '1000'], 'Wrong_change'
-                # 리포트 파일에 메시지 작성
-                f.write(f'[{time_str}] {issue_on}원이 부족합니다.\n')
+        if issue_type in ['No_product', 'Less_product']:  # 상품이 품절되었거나 재고가 부족할 때
+            # issue_on이 Product 클래스의 인스턴스인지 확인
+            assert type(issue_on) == Product
+        elif issue_type == 'No_change':  # 거스름돈이 부족할 때
+            # issue_on이 거스름돈 보관함의 화폐 단위 중 하나인지 확인
+            assert str(issue_on) in [str(k) for k in self.change_box], 'Wrong_change'
+        else:
+            return None
+        self.reporter.report(issue_type, issue_on)   # 새로 발생한 이슈만 기록 대기열에 추가
         return None
 
     def sort(self) -> list[Product]:
         """
-        상품 리스트를 가격 기준으로 정렬하는 메서드
+        ID 순으로 정렬된 상품 리스트를 반환하는 메서드
+
+        상품 리스트는 추가될 때마다 이진 탐색으로 제자리에 삽입되므로 다시 정렬하지 않습니다.
 
         Returns:
             list: 정렬된 상품 리스트
         """
-        self.products.sort(key=int)   # 상품 리스트를 가격 기준으로 정렬
         return self.products   # 정렬된 상품 리스트 반환
 
+    @synchronized
+    @journaled
     def add_product(self, name: str, price: int = None, count: int = 0, ID: int = None, product_type: str = None) -> list[Product]:
         """
         제품(Product)을 추가하는 메서드
@@ -230,47 +694,93 @@ class VendingMachine(BaseException):
             list: 정렬된 상품 리스트
         """
         if type(name) is Product:
-            self.products.append(name)   # 상품 객체가 인자로 전달되면 상품 리스트에 추가
+            product = name   # 상품 객체가 인자로 전달되면 그대로 사용
         else:
             if not ID:
-                # ID가 주어지지 않으면 현재 상품 개수에 1을 더한 값으로 설정
-                ID = len(self.products) + 1
-            self.products.append(Product(ID=ID, name=name, price=price,
-                                 count=count, product_type=product_type))  # 상품 리스트에 상품 객체 추가
+                # ID가 주어지지 않으면 등록된 상품 ID 중 가장 큰 값에 1을 더한 값으로 설정
+                ID = self.catalog.next_id
+            product = Product(ID=ID, name=name, price=price,
+                              count=count, product_type=product_type)
+        self.catalog.add(product)  # 상품 리스트와 인덱스에 상품 객체 추가
+        self.storage.mark_dirty(product)
 
         return self.sort()   # 상품 리스트를 정렬하여 반환
 
-    def products_by_json(self) -> list[str]:
+    @synchronized
+    def load_products(self) -> ProductView:
+        """
+        상품 파일보다 최신인 바이너리 스냅샷이 있으면 스냅샷에서, 아니면 JSON 파일에서 상품을 불러오는 메서드
+
+        JSON 파일에서 불러온 경우에는 다음 시작을 위해 스냅샷을 새로 만듭니다.
+
+        Returns:
+            ProductView: 추가된 제품들의 이름(name)을 담은 뷰
+        """
+        if self.snapshot is not None and self.snapshot.is_fresh(self.products_file):
+            try:
+                return self.products_by_snapshot()
+            except ValueError:
+                self.catalog.clear()   # 손상된 스냅샷은 무시하고 JSON 파일에서 불러옴
+        names = self.products_by_json()
+        if self.snapshot is not None:
+            self.snapshot.write(self.products)
+        return names
+
+    @synchronized
+    def products_by_snapshot(self) -> ProductView:
+        """
+        바이너리 스냅샷을 mmap으로 열어 제품을 추가하는 메서드
+
+        Returns:
+            ProductView: 추가된 제품들의 이름(name)을 담은 뷰
+
+        Raises:
+            ValueError: 스냅샷 형식이 잘못된 경우
+        """
+        self.snapshot.open()
+        self.catalog.bulk_load(self.snapshot.products())
+        if self.snapshot.pending:
+            self.storage.mark_dirty()   # 상품 파일에 저장되기 전에 종료되었으므로 스냅샷의 재고를 상품 파일에도 저장
+        else:
+            self.storage.mark_clean()
+        self.snapshot.stale = False   # 불러온 상품은 이미 스냅샷에 있음
+        return self.products_name
+
+    @synchronized
+    def products_by_json(self) -> ProductView:
         """
         JSON 파일에서 제품 정보를 로드하여 제품을 추가하는 메서드
 
+        파일을 조각 단위로 읽어 제품 객체를 바로 만들므로, 파일 전체의 문자열이나 딕셔너리 리스트를 메모리에 두지 않습니다.
+        JSON 배열과 JSON Lines 형식을 모두 읽을 수 있으며, 인코딩은 UTF-8과 예전 형식인 CP949(EUC-KR) 중에서 확인합니다.
+
         Returns:
-            List[str]: 추가된 제품들의 이름(name)을 담은 리스트
+            ProductView: 추가된 제품들의 이름(name)을 담은 뷰
         """
-        import json
+        encoding = detect_encoding(self.products_file)
 
-        # JSON 파일을 열어 데이터를 로드합니다.
-        with open(self.products_file, 'r', encoding='EUC-KR') as f:
-            json_data = json.load(f)
+        # "id", "name", "price", "count" 값을 추출하여 제품 객체를 만든 뒤 한 번에 추가합니다.
+        # 같은 이름은 여러 자판기에서 하나의 문자열을 공유하도록 intern 합니다.
+        self.catalog.bulk_load([Product(ID=int(i["id"]), name=sys.intern(i["name"]), price=int(i["price"]),
+                                        count=int(i["count"])) for i in iter_json_records(self.products_file, encoding)])
 
-        # json_data를 순회하면서 제품(Product) 객체를 추가합니다.
-        for i in json_data:
-            # "id", "name", "price", "count" 값을 추출하여 제품 객체를 추가합니다.
-            self.add_product(ID=int(i["id"]), name=i["name"], price=int(
-                i["price"]), count=int(i["count"]))
+        self.storage.mark_clean()   # 파일에서 읽어온 상태는 다시 저장할 필요가 없음
+        if codecs.lookup(encoding) != codecs.lookup(self.storage.encoding):
+            self.storage.mark_dirty()   # 다른 인코딩의 파일은 다음 저장 때 저장 인코딩으로 변환
 
         # 추가된 제품의 이름(name)들을 리스트로 반환합니다.
         return self.products_name
     
+    @timed
+    @synchronized
     def save_products(self) -> None:
         '''
-        제품 정보를 JSON 파일에 저장하는 메서드
+        저장되지 않은 제품 정보를 JSON 파일에 즉시 저장하는 메서드
         '''
-        import json
-        
-        with open(self.products_file,'w') as f:
-            json.dump(self.to_dict, f,ensure_ascii=False, indent=4) # JSON 파일에 제품 정보를 저장합니다.
+        self.storage.flush(lambda: self.products, force=True)
 
+    @synchronized
+    @journaled
     def delete_product(self, product: Product = None, id: int = None) -> list[Product]:
         """
         VendingMachine 클래스의 제품 삭제 메소드.
@@ -283,24 +793,24 @@ class VendingMachine(BaseException):
             list: 제품이 삭제된 후의 제품 목록 (self.products)을 반환함.
 
         Raises:
-            ValueError: product와 id 값이 모두 None인 경우 예외를 발생시킴.
+            ValueError: product와 id 값이 모두 None인 경우, product가 자판기에 등록된 상품 객체가 아닌 경우 예외를 발생시킴.
         """
         if id is None and product is None:
             # product와 id 값이 모두 None인 경우 예외 발생
             raise ValueError('Values are empty')
 
-        for i in self.products:
-            # self.products 리스트에 있는 객체들이 Product 클래스의 인스턴스인지 확인
-            assert type(i) is Product
-            if i == product:
-                self.products.remove(i)  # product 객체와 일치하는 제품을 삭제
-                break
-            elif i.id == id:
-                self.products.remove(i)  # id 값과 일치하는 제품을 삭제
-                break
+        if product is None:
+            product = self.catalog.get(id)   # id 값과 일치하는 제품을 인덱스에서 찾음
+        else:
+            self._check_registered(product)
+        if product is not None:
+            self.catalog.remove(product)  # 일치하는 제품을 삭제
+            self.storage.mark_dirty()
 
         return self.products
 
+    @synchronized
+    @journaled
     def edit_product(self, product: Product, name: str = None, price: int = None, count: int = None) -> Product:
         """
         VendingMachine 클래스의 제품 수정 메소드.
@@ -315,18 +825,204 @@ class VendingMachine(BaseException):
             Product: 수정된 Product 객체를 반환함.
 
         Raises:
-            ValueError: product가 Product 클래스의 인스턴스가 아닌 경우 예외를 발생시킴.
+            ValueError: product가 자판기에 등록된 상품 객체가 아니거나 재고가 음수인 경우 예외를 발생시킴.
         """
         assert type(product) is Product  # product가 Product 클래스의 인스턴스인지 확인
+        self._check_registered(product)
+        if count is not None and count < 0:
+            raise ValueError('Negative count')   # 재고는 음수가 될 수 없음
         property_list = {'name': name, 'price': price, 'count': count}
         
-        # property_list의 값이 None이 아닌 경우에만 Product 객체의 속성을 업데이트
+        # property_list의 값이 None이 아니고 현재 값과 다른 경우에만 Product 객체의 속성을 업데이트
         for key, value in property_list.items():
-            if value is not None:
-                setattr(product, key, value)
+            if value is not None and getattr(product, key) != value:
+                setattr(product, key, value)   # 상품 인덱스는 Catalog가 자동으로 갱신
+                self.storage.mark_dirty(product)
 
         return product
 
+    def _check_registered(self, product: Product) -> None:
+        """
+        상품 객체가 지금 카탈로그에 등록된 객체인지 확인하는 메서드입니다. 삭제되었거나 다른 자판기의 상품이면 ValueError를 발생시킵니다.
+        """
+        if self.catalog.get(product.id) is not product:
+            raise ValueError('Wrong product')
+
+    def _products_of(self, product_ids) -> list[Product]:
+        """
+        상품 ID들에 해당하는 상품 리스트를 반환하는 메서드입니다. 없는 ID가 있으면 아무것도 바꾸기 전에 ValueError를 발생시킵니다.
+        """
+        products = [self.catalog.get(product_id) for product_id in product_ids]
+        if None in products:
+            raise ValueError('Wrong product id')
+        return products
+
+    @synchronized
+    @journaled
+    def restock_many(self, counts: dict[int, int] = None, level: int = None) -> dict[int, int]:
+        """
+        여러 상품의 재고를 한 번에 바꾸는 메서드
+
+        모든 값을 먼저 확인한 뒤 적용하므로 잘못된 값이 하나라도 있으면 아무 상품도 바뀌지 않으며,
+        상품 파일은 마지막에 한 번만 저장합니다.
+
+        Args:
+            counts (dict, optional): 상품 ID를 key로, 새 재고를 value로 가지는 딕셔너리. Defaults to None.
+            level (int, optional): counts에 없는 상품 중 재고가 level 미만인 상품을 level까지 채웁니다. Defaults to None.
+
+        Returns:
+            dict: 재고가 바뀐 상품 ID를 key로, 바뀐 재고를 value로 가지는 딕셔너리
+
+        Raises:
+            ValueError: 없는 상품 ID이거나 재고가 음수인 경우
+        """
+        counts = dict(counts or {})
+        products = self._products_of(counts)
+        if any(count < 0 for count in counts.values()) or (level is not None and level < 0):
+            raise ValueError('Negative count')
+        targets = list(zip(products, counts.values()))
+        if level is not None:
+            targets += [(product, level) for product in self.products if product.id not in counts and product.count < level]
+        changed = {}
+        for product, count in targets:
+            if product.count != count:
+                product.count = count   # 재고 인덱스는 Catalog가 바뀐 상품만 갱신
+                self.storage.mark_dirty(product)
+                changed[product.id] = count
+        if changed:
+            self.save_products()
+        return changed
+
+    @synchronized
+    @journaled
+    def reprice_many(self, prices: dict[int, int] = None, percent: float = None, delta: int = None,
+                     round_to: int = 100, product_ids: list[int] = None) -> dict[int, int]:
+        """
+        여러 상품의 가격을 한 번에 바꾸는 메서드
+
+        prices로 상품별 가격을 직접 지정하거나, percent(비율)와 delta(금액) 규칙으로 product_ids 상품들(기본값은 모든 상품)의
+        가격을 바꿉니다. 규칙으로 계산한 가격은 round_to 단위로 반올림합니다.
+
+        Args:
+            prices (dict, optional): 상품 ID를 key로, 새 가격을 value로 가지는 딕셔너리. Defaults to None.
+            percent (float, optional): 가격을 바꿀 비율(%). 예: 10이면 10% 인상. Defaults to None.
+            delta (int, optional): 가격에 더할 금액. Defaults to None.
+            round_to (int, optional): 규칙으로 계산한 가격의 반올림 단위. Defaults to 100.
+            product_ids (list, optional): 규칙을 적용할 상품 ID 리스트. Defaults to None (prices에 없는 모든 상품).
+
+        Returns:
+            dict: 가격이 바뀐 상품 ID를 key로, 바뀐 가격을 value로 가지는 딕셔너리
+
+        Raises:
+            ValueError: 없는 상품 ID이거나 가격이 0 이하가 되는 경우
+        """
+        prices = dict(prices or {})
+        targets = list(zip(self._products_of(prices), prices.values()))
+        if percent is not None or delta is not None:
+            if round_to <= 0:
+                raise ValueError('Wrong round')
+            ruled = self._products_of(product_ids) if product_ids is not None else \
+                [product for product in self.products if product.id not in prices]
+            for product in ruled:
+                price = product.price * (100 + (percent or 0)) / 100 + (delta or 0)
+                targets.append((product, int(price / round_to + 0.5) * round_to))
+        if any(price <= 0 for _, price in targets):
+            raise ValueError('Wrong price')
+        changed = {}
+        for product, price in targets:
+            if product.price != price:
+                product.price = price   # 가격 인덱스는 Catalog가 바뀐 상품만 갱신
+                self.storage.mark_dirty(product)
+                changed[product.id] = price
+        if changed:
+            self.save_products()
+        return changed
+
+    @synchronized
+    @journaled
+    def apply_planogram(self, planogram: list[dict]) -> dict[str, list[int]]:
+        """
+        새 상품 배치(플래노그램)와 현재 상품 목록의 차이만 적용하는 메서드
+
+        플래노그램에 없는 상품은 삭제하고, 새 ID는 추가하며, 이름이나 가격, 재고가 다른 상품만 수정합니다.
+        재고(count)를 지정하지 않은 기존 상품은 현재 재고를 유지하고, 새 상품은 0개로 추가합니다.
+        모든 항목을 먼저 확인한 뒤 적용하며, 새 상품은 한 번에 추가하고 상품 파일은 한 번만 저장합니다.
+
+        Args:
+            planogram (list): {'id', 'name', 'price', 'count'(선택)} 딕셔너리 리스트 (products.json과 같은 형식)
+
+        Returns:
+            dict: {'added': 추가된 ID 리스트, 'removed': 삭제된 ID 리스트, 'changed': 수정된 ID 리스트}
+
+        Raises:
+            ValueError: ID가 중복되었거나, 가격이 0 이하이거나, 재고가 음수인 경우
+        """
+        slots = {}
+        for item in planogram:
+            product_id, price, count = int(item['id']), int(item['price']), item.get('count')
+            if product_id in slots:
+                raise ValueError('Duplicate product id')
+            if price <= 0:
+                raise ValueError('Wrong price')
+            if count is not None and int(count) < 0:
+                raise ValueError('Negative count')
+            slots[product_id] = (sys.intern(str(item['name'])), price, None if count is None else int(count))
+
+        removed = [product for product in self.products if product.id not in slots]
+        for product in removed:
+            self.catalog.remove(product)
+        changed, added = [], []
+        for product_id, (name, price, count) in slots.items():
+            product = self.catalog.get(product_id)
+            if product is None:
+                added.append(Product(ID=product_id, name=name, price=price, count=count or 0))
+                continue
+            values = {'name': name, 'price': price, 'count': product.count if count is None else count}
+            if any(getattr(product, key) != value for key, value in values.items()):
+                for key, value in values.items():
+                    setattr(product, key, value)
+                changed.append(product_id)
+        if added:
+            self.catalog.bulk_load(added)   # 새 상품은 한 번에 추가하여 인덱스를 한 번만 정렬
+        if removed or changed or added:
+            self.storage.mark_dirty()
+            self.save_products()
+        return {'added': sorted(product.id for product in added),
+                'removed': [product.id for product in removed], 'changed': sorted(changed)}
+
+    @synchronized
+    @journaled
+    def resort_product(self) -> list[Product]:
+        """
+        상품 ID를 현재 순서대로 1부터 다시 부여하는 메서드
+
+        Returns:
+            list: ID가 재정렬된 상품 리스트
+        """
+        for i, product in enumerate(self.products, start=1):
+            product.id = i
+        self.catalog.reindex()
+        self.storage.mark_dirty()
+        return self.products
+
+    @synchronized
+    @journaled
+    def set_pay_method(self, is_credit: bool) -> bool:
+        """
+        사용자의 결제 수단을 변경하는 메서드
+
+        Args:
+            is_credit (bool): 카드 결제 여부
+
+        Returns:
+            bool: 변경된 카드 결제 여부
+        """
+        self.user.is_credit = is_credit
+        return self.user.is_credit
+
+    @timed
+    @synchronized
+    @journaled
     def insert_money(self, money: int) -> int:
         """
         투입한 돈을 자판기에 추가하는 메서드입니다.
@@ -341,7 +1037,7 @@ class VendingMachine(BaseException):
             ValueError: 투입한 돈이 100, 500, 1000원 중 하나가 아닌 경우 예외 발생
         """
         if money in self.change_box:
-            if self.user.money_box[money] < 1:
+            if self.user.money_box.get(money, 0) < 1:
                 raise ValueError('Not enough money')  # 투입한 돈의 개수가 부족한 경우 예외 발생
             self.user.money_box[money] -= 1  # 투입한 돈의 개수를 1 감소시킴
             self.change_box[money] += 1  # 자판기의 잔돈 상자에 투입한 돈의 개수를 1 증가시킴
@@ -351,6 +1047,9 @@ class VendingMachine(BaseException):
             raise ValueError('Wrong money')
         return self.inserted_money  # 현재까지 투입된 총 금액 반환
 
+    @timed
+    @synchronized
+    @journaled
     def refund(self, refund_dict: dict = {1000: 0, 500: 0, 100: 0}) -> int:
         """
         사용자에게 환불을 처리하는 메소드
@@ -364,12 +1063,14 @@ class VendingMachine(BaseException):
         refund = 0
         for k, v in refund_dict.items():
             self.change_box[k] -= v   # 거스름돈 보관함에서 환불할 금액을 차감
-            self.user.money_box[k] += v   # 사용자의 돈 보관함에 환불할 금액을 추가
+            self.user.money_box[k] = self.user.money_box.get(k, 0) + v   # 사용자의 돈 보관함에 환불할 금액을 추가
             refund += k * v   # 총 환불 금액에 추가
             self.inserted_money -= k * v   # 투입된 금액에서 환불할 금액을 차감
         assert self.inserted_money == 0, 'Wrong refund'   # 투입된 금액이 0이 아닌 경우 예외 발생
         return refund_dict, refund   # 총 환불 금액 반환
 
+    @timed
+    @synchronized
     def cal_refund(self, product: Product = Product(ID=0, name='None', price=0, count=0)) -> dict[int, int]:
         """
         사용자에게 반환할 잔돈을 계산하고, 반환할 잔돈을 나타내는 딕셔너리를 반환하는 메서드입니다.
@@ -378,40 +1079,16 @@ class VendingMachine(BaseException):
             product (Product, optional): 반환할 제품 객체. 기본값은 None으로, None인 경우 자판기에 있는 None_product를 사용합니다.
 
         Returns:
-            Dict[int, int]: 반환할 잔돈을 나타내는 딕셔너리. 키는 화폐 단위, 값은 개수로 나타내며, 잔돈이 없는 경우 빈 딕셔너리가 반환됩니다.
+            Dict[int, int]: 반환할 잔돈을 나타내는 딕셔너리. 키는 화폐 단위, 값은 개수로 나타내며, 잔돈이 없는 경우 모든 개수가 0입니다.
 
         Raises:
             ValueError: 자판기에 있는 잔돈이 부족한 경우 발생합니다.
         """
 
-        # 거스름돈 계산에 사용할 변수들 초기화
-        change_box = self.change_box.copy()  # 잔돈 보관함의 현재 상태를 복사하여 사용
-        refund_dict = {500: 0, 100: 0}  # 거스름돈을 계산할 때 필요한 변수들
-        # refund_dict의 값을 합하여 초기화
-        sum_dict = sum([k * v for k, v in refund_dict.items()])
-
-        # 예상 잔돈 계산
-        expected_balance = self.inserted_money - product.price - sum_dict
-
-        # 입력된 돈이 0이 아니고, 예상 잔돈이 0보다 큰 동안 반복
-        while self.inserted_money != 0 and expected_balance > 0:
-            insufficient_change = 0  # 거스름돈 발생 여부를 확인하기 위한 변수
-            for i in refund_dict:
-                # 예상 잔돈이 i보다 크거나 같고, 해당 단위의 잔돈이 보관함에 남아있는 경우
-                if self.inserted_money - product.price - sum_dict >= i:
-                    if change_box[i] > 0:
-                        change_box[i] -= 1
-                        refund_dict[i] += 1
-                        sum_dict += i
-                        expected_balance = self.inserted_money - product.price - sum_dict
-                    else:
-                        insufficient_change = i
-            if insufficient_change:  # 거스름돈이 부족한 경우
-                for i in refund_dict:  # 환불할 잔돈을 자판기의 잔돈 보관함에 다시 넣음
-                    change_box[i] += refund_dict[i]
-                    refund_dict[i] = 0
-                raise ValueError(str(insufficient_change))  # 거스름돈이 부족한 단위를 반환
-        return refund_dict  # 환불할 잔돈을 나타내는 딕셔너리 반환
+        if self.inserted_money == 0:
+            return self.change_maker.plan(0, self.change_box)
+        # 거스름돈 표에서 최소 개수의 동전 조합을 찾음. 만들 수 없으면 부족한 화폐 단위로 ValueError 발생
+        return self.change_maker.plan(self.inserted_money - product.price, self.change_box)
 
     def money_check(self,money:int, count:int = None) -> bool:
         """
@@ -425,13 +1102,15 @@ class VendingMachine(BaseException):
             bool: 거스름돈을 추가하거나 반환할 수 있는지 여부
         
         Raises:
-            AssertionError: money가 100, 500, 1000 중 하나가 아닌 경우 예외 발생
+            AssertionError: money가 거스름돈 보관함의 화폐 단위가 아닌 경우 예외 발생
         """
-        assert money in [1000, 500, 100, None], 'Wrong money'
+        assert money in self.change_box or money is None, 'Wrong money'
         if money != None and count != None:
             assert count > 0, 'Wrong count'
         return True
 
+    @synchronized
+    @journaled
     def add_change(self, money: int, count: int) -> None:
         """
         거스름돈 보관함에 돈을 추가하는 메서드
@@ -447,6 +1126,8 @@ class VendingMachine(BaseException):
         self.change_box[money] += count
         return count
     
+    @synchronized
+    @journaled
     def get_change(self, money: int, count: int)-> None:
         """
         거스름돈 보관함에서 돈을 반환하는 메서드
@@ -465,6 +1146,37 @@ class VendingMachine(BaseException):
 
         return change_count
 
+    @synchronized
+    @journaled
+    def refill_change(self, counts: dict[int, int], fill: bool = True) -> dict[int, int]:
+        """
+        여러 화폐 단위의 거스름돈을 한 번에 보충하는 메서드
+
+        Args:
+            counts (dict): 화폐 단위를 key로, 개수를 value로 가지는 딕셔너리
+            fill (bool, optional): True이면 각 화폐 단위를 지정한 개수까지 채우고, False이면 지정한 개수만큼 더합니다. Defaults to True.
+
+        Returns:
+            dict: 화폐 단위별로 추가한 개수
+
+        Raises:
+            ValueError: 거스름돈 보관함에 없는 화폐 단위이거나 개수가 음수인 경우
+        """
+        if any(money not in self.change_box for money in counts):
+            raise ValueError('Wrong money')
+        if any(count < 0 for count in counts.values()):
+            raise ValueError('Wrong count')
+        added = {}
+        for money, count in counts.items():
+            missing = max(count - self.change_box[money], 0) if fill else count
+            if missing:
+                self.change_box[money] += missing
+                added[money] = missing
+        return added
+
+    @timed
+    @synchronized
+    @journaled
     def buy(self, product_id: int) -> tuple[str, dict[int, int]]:
         """
         상품을 구매하는 메소드
@@ -479,20 +1191,21 @@ class VendingMachine(BaseException):
             ValueError: 구매가 불가능한 경우 발생
         """
 
-        if product_id in self.products_id:   # 상품 ID가 존재하는 경우
-            # 상품 ID로부터 상품 객체를 가져옴
-            product: Product = self.products[product_id - 1]
-        else:
+        product: Product = self.catalog.get(product_id)   # 상품 ID로부터 상품 객체를 가져옴
+        if product is None:
             raise ValueError('구매 불가능한 상품 ID')  # 상품 ID가 존재하지 않는 경우 예외 발생
 
         if self.is_sellable(product):   # 상품이 판매 가능한 상태인지 확인
             output = product.name   # 구매한 상품의 이름을 저장
             if self.user.is_credit:   # 사용자가 신용카드를 사용하는 경우
                 self.user.credit_money -= product.price
+                product.count -= 1   # 상품 수량 차감
+                self.storage.mark_dirty(product)
                 return product.name, None   # 구매한 상품의 이름 반환
             else:   # 현금으로 결제하는 경우
                 refund_dict = self.cal_refund(product)   # 환불할 거스름돈 계산
                 product.count -= 1   # 상품 수량 차감
+                self.storage.mark_dirty(product)
                 self.inserted_money -= product.price   # 투입된 금액에서 상품 가격 차감
                 refund_dict, _ = self.refund(refund_dict)   # 환불
                 output += f' {self.inserted_money}원을 반환합니다.'   # 반환할 금액을 출력
@@ -500,6 +1213,38 @@ class VendingMachine(BaseException):
         else:
             raise ValueError('구매 불가')  # 구매 불가능한 경우 예외 처리
 
+    @synchronized
+    def sellable_products(self) -> list[Product]:
+        """
+        현재 구매할 수 있는 상품들을 반환하는 메서드
+
+        가격 인덱스에서 투입 금액(카드 모드에서는 카드 잔액) 이하인 상품만 이진 탐색으로 찾고,
+        거스름돈 계산은 상품마다가 아니라 서로 다른 가격마다 한 번씩만 수행합니다.
+
+        Returns:
+            list: ID 순으로 정렬된 구매 가능한 상품 리스트
+        """
+        budget = self.user.credit_money if self.user.is_credit else self.inserted_money
+        candidates = self.catalog.in_stock_up_to(budget)   # 재고가 있고 살 수 있는 가격의 상품들
+        if self.user.is_credit:
+            return sorted((product for _, _, product in candidates), key=attrgetter('id'))
+
+        change_ok: dict[int, bool] = {}   # 가격별 거스름돈 지급 가능 여부
+        sellable = []
+        for price, _, product in candidates:
+            if price not in change_ok:
+                try:
+                    self.cal_refund(product)
+                    change_ok[price] = True
+                except ValueError as e:  # 잔돈이 부족한 경우
+                    self.issue_report(issue_type="No_change", issue_on=str(e))
+                    change_ok[price] = False
+            if change_ok[price]:
+                sellable.append(product)
+        return sorted(sellable, key=attrgetter('id'))
+
+    @timed
+    @synchronized
     def is_sellable(self, product: Product) -> bool:
         """
         상품을 구매할 수 있는지 확인하는 메서드